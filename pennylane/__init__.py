@@ -72,6 +72,7 @@ Summary
     device
     expval
     grad
+    value_and_grad
     jacobian
     ~autograd.numpy
     ops
@@ -97,6 +98,7 @@ from pkg_resources import iter_entry_points
 from autograd import numpy
 from autograd import grad as _grad
 from autograd import jacobian as _jacobian
+from autograd import value_and_grad as _value_and_grad
 
 from semantic_version import Version, Spec
 
@@ -151,14 +153,23 @@ def device(name, *args, **kwargs):
     This function is used to load a particular quantum device,
     which can then be used to construct QNodes.
 
-    PennyLane comes with support for the following two devices:
+    PennyLane comes with support for the following five devices:
 
     * :mod:`'default.qubit' <pennylane.plugins.default_qubit>`: a simple pure
       state simulator of qubit-based quantum circuit architectures.
 
+    * :mod:`'default.autograd' <pennylane.plugins.default_qubit_autograd>`: a pure
+      state qubit simulator written in autograd, which QNodes differentiate by backpropagation.
+
     * :mod:`'default.gaussian' <pennylane.plugins.default_gaussian>`: a simple simulator
       of Gaussian states and operations on continuous-variable circuit architectures.
 
+    * :mod:`'default.clifford' <pennylane.plugins.default_clifford>`: a stabilizer
+      simulator of Clifford qubit circuits, which runs in polynomial time.
+
+    * :mod:`'default.mps' <pennylane.plugins.default_mps>`: a matrix product state
+      simulator of qubit circuits with bounded entanglement.
+
     In addition, additional devices are supported through plugins — see
     :ref:`plugins` for more details.
 
@@ -237,6 +248,28 @@ def grad(func, argnum):
     return _grad(func, argnum)
 
 
+def value_and_grad(func, argnum):
+    """Returns a function (as a callable) that computes both the value and the gradient
+    of functions accessible within PennyLane.
+
+    This is a wrapper around the :mod:`autograd.value_and_grad` function. The value is
+    taken from the same traced evaluation as the gradient, so each QNode in ``func`` is
+    executed once for the value, rather than once by ``func`` and once by :func:`grad`.
+
+    Args:
+        func (function): a Python function or QNode that contains
+            a combination of quantum and classical nodes
+        argnum (int or list(int)): which argument(s) to take the gradient
+            with respect to
+
+    Returns:
+        function: the function that returns a tuple containing the value of the input
+        function and its gradient with respect to the arguments in argnum
+    """
+    # pylint: disable=no-value-for-parameter
+    return _value_and_grad(func, argnum)
+
+
 def jacobian(func, argnum):
     """Returns the Jacobian (as a callable function) of vector-valued
     functions accessible within PennyLane.
@@ -41,6 +41,9 @@ user interface:
     capabilities
     supported
     execute
+    execute_program
+    batch_execute
+    batch_size
     reset
 
 Abstract methods and attributes
@@ -77,6 +80,7 @@ to ensure correct operation and internal consistency.
 
 .. autosummary::
     check_validity
+    _execute_operations
 
 .. currentmodule:: pennylane._device
 
@@ -91,6 +95,9 @@ import logging
 
 import autograd.numpy as np
 
+from .program import Program
+from .variable import Variable
+
 logging.getLogger()
 
 
@@ -199,13 +206,103 @@ class Device(abc.ABC):
             array[float]: expectation value(s)
         """
         self.check_validity(queue, expectation)
+        operations = ((op.name, op.wires, op.parameters) for op in queue)
+        return self._execute_operations(queue, operations, expectation)
+
+    def execute_program(self, program, expectation):
+        """Execute a precompiled program of quantum operations on the device and then measure the given expectation values.
+
+        Unlike :meth:`execute`, the operations are not checked against the device on every call.
+        The caller must have passed the queue of the program to :meth:`check_validity` before.
+        If a plugin overrides :meth:`execute`, the program is executed by its :meth:`execute` instead.
+
+        Args:
+            program (~.program.Program): operations to execute on the device
+            expectation (Iterable[~.operation.Expectation]): expectations to evaluate and return
+
+        Returns:
+            array[float]: expectation value(s)
+        """
+        if type(self).execute is not Device.execute:
+            # the plugin executes operation queues in its own way
+            return self.execute(program.queue, expectation)
+
+        self.check_validity([], expectation)
+        return self._execute_operations(program.queue, program.operations(), expectation)
+
+    def batch_execute(self, circuits, parameters=None):
+        """Execute several circuits on the device, and measure the expectation values of each.
+
+        Every circuit is executed starting from the reset device. This default implementation
+        executes the circuits one after another. Plugins may override it to execute the circuits
+        together, e.g. by vectorizing over circuits that only differ in their parameter values,
+        or by submitting them to a hardware queue as one job.
+
+        Args:
+            circuits (Sequence[tuple[Sequence[~.operation.Operation] or ~.program.Program, Sequence[~.operation.Expectation]]]):
+                operations and expectations of each circuit. Operation queues are executed with
+                :meth:`execute`, precompiled programs with :meth:`execute_program`.
+            parameters (Sequence[array[float]], None): if given, the free parameter values of each
+                circuit, stored in :attr:`.Variable.free_param_values` while it is executed, and
+                restored afterwards. Otherwise all circuits use the current values.
+
+        Returns:
+            list[array[float]]: expectation value(s) of each circuit
+        """
+        if parameters is not None and len(parameters) != len(circuits):
+            raise ValueError("{} parameter vectors given for {} circuits.".format(len(parameters), len(circuits)))
+
+        results = []
+        previous = Variable.free_param_values
+        try:
+            for i, (queue, expectation) in enumerate(circuits):
+                if parameters is not None:
+                    Variable.free_param_values = parameters[i]
+                self.reset()
+                if isinstance(queue, Program):
+                    results.append(self.execute_program(queue, expectation))
+                else:
+                    results.append(self.execute(queue, expectation))
+        finally:
+            # the parameter values of the caller are restored
+            Variable.free_param_values = previous
+        return results
+
+    def batch_size(self, program, expectation):
+        """Number of circuits that :meth:`batch_execute` executes together.
+
+        This default implementation executes the circuits one after another.
+
+        Args:
+            program (~.program.Program): operations shared by the circuits, which only
+                differ in the values of the free parameters
+            expectation (Sequence[~.operation.Expectation]): expectations of the circuits
+
+        Returns:
+            int: maximum number of such circuits executed together, 1 if they are executed one by one
+        """
+        # pylint: disable=unused-argument,no-self-use
+        return 1
+
+    def _execute_operations(self, queue, operations, expectation):
+        """Apply the operations and measure the expectations, see :meth:`execute`.
+
+        Args:
+            queue (Sequence[~.operation.Operation]): operations to execute on the device
+            operations (Iterable[tuple[str, list[int], list]]): name, wires and parameter values of each
+                operation in ``queue``, computed as they are applied
+            expectation (Iterable[~.operation.Expectation]): expectations to evaluate and return
+
+        Returns:
+            array[float]: expectation value(s)
+        """
         self._op_queue = queue
         self._expval_queue = expectation
 
         with self.execution_context():
             self.pre_apply()
-            for operation in queue:
-                self.apply(operation.name, operation.wires, operation.parameters)
+            for name, wires, par in operations:
+                self.apply(name, wires, par)
             self.post_apply()
 
             self.pre_expval()
@@ -291,7 +388,7 @@ class Device(abc.ABC):
         Returns:
             bool: True iff it is supported
         """
-        return name in self.operations.union(self.expectations)
+        return name in self.operations or name in self.expectations
 
     def check_validity(self, queue, expectations):
         """Checks whether the operations and expectations in queue are all supported by the device.
@@ -117,7 +117,7 @@ from .qnode import QNode
 log.getLogger()
 
 
-def qnode(device, interface='numpy'):
+def qnode(device, interface='numpy', cache_size=0):
     """QNode decorator.
 
     Args:
@@ -134,12 +134,15 @@ def qnode(device, interface='numpy'):
 
             * ``interface='tfe'``: The QNode accepts and returns eager execution
               TensorFlow ``tfe.Variable`` objects.
+
+        cache_size (int): maximum number of outputs and Jacobians remembered by the QNode,
+            0 (the default) disables the cache, see :meth:`.QNode._cache_lookup`
     """
     @lru_cache()
     def qfunc_decorator(func):
         """The actual decorator"""
 
-        qnode = QNode(func, device)
+        qnode = QNode(func, device, cache_size=cache_size)
 
         if interface == 'torch':
             return qnode.to_torch()
@@ -152,8 +155,10 @@ def qnode(device, interface='numpy'):
             """Wrapper function"""
             return qnode(*args, **kwargs)
 
-        # bind the jacobian method to the wrapped function
+        # bind the jacobian, batch evaluation and cache methods to the wrapped function
         wrapper.jacobian = qnode.jacobian
+        wrapper.evaluate_batch = qnode.evaluate_batch
+        wrapper.clear_cache = qnode.clear_cache
 
         # bind the qnode attributes to the wrapped function
         wrapper.__dict__.update(qnode.__dict__)
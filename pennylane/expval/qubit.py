@@ -37,11 +37,14 @@ quantum operations supported by PennyLane, as well as their conventions.
     PauliZ
     Hadamard
     Hermitian
+    Tensor
     Identity
 
 :html:`<h3>Code details</h3>`
 """
 
+import numpy as np
+
 from pennylane.operation import Expectation
 
 
@@ -150,17 +153,57 @@ class Hermitian(Expectation):
     .. math::
         \braket{A} = \braketT{\psi}{\cdots \otimes I\otimes A\otimes I\cdots}{\psi}
 
-    where :math:`A` acts on the requested wire.
+    where :math:`A` acts on the requested wires.
+
+    **Details:**
+
+    * Number of wires: Any (a :math:`2^k\times 2^k` matrix acts on :math:`k` wires)
+    * Number of parameters: 1
 
     Args:
         A (array): square hermitian matrix.
-        wires (Sequence[int] or int): the wire the operation acts on
+        wires (Sequence[int] or int): the wire(s) the operation acts on
     """
-    num_wires = 1
+    num_wires = 0
     num_params = 1
     par_domain = 'A'
     grad_method = 'F'
 
+
+class Tensor(Expectation):
+    r"""pennylane.expval.Tensor(obs, wires)
+    Expectation value of a tensor product of single-qubit observables.
+
+    Given a sequence of single-qubit observables :math:`A_1, \dots, A_k`, acting on
+    the wires :math:`w_1, \dots, w_k` respectively, this expectation command returns the value
+
+    .. math::
+        \braket{A_1\otimes \cdots\otimes A_k} = \braketT{\psi}{A_1^{(w_1)}\cdots A_k^{(w_k)}}{\psi}
+
+    For example, the correlator :math:`\braket{\sigma_z^{(0)}\sigma_z^{(2)}}` is
+    returned by ``qml.expval.Tensor(['PauliZ', 'PauliZ'], wires=[0, 2])``.
+
+    **Details:**
+
+    * Number of wires: Any (one per factor)
+    * Number of parameters: 1
+
+    Args:
+        obs (Sequence[str]): names of the single-qubit observables in the product,
+            chosen from ``'PauliX'``, ``'PauliY'``, ``'PauliZ'``, ``'Hadamard'`` and ``'Identity'``
+        wires (Sequence[int]): the wires the observables act on, one per factor
+    """
+    num_wires = 0
+    num_params = 1
+    par_domain = 'A'
+    grad_method = None
+
+    def __init__(self, *params, wires=None, do_queue=True):
+        # accept a plain list of names as the array parameter
+        params = [np.array(p) if isinstance(p, (list, tuple)) else p for p in params]
+        super().__init__(*params, wires=wires, do_queue=do_queue)
+
+
 # As both the qubit and the CV case need an Identity Expectation,
 # and these need to reside in the same name space but have to have
 # different types, this Identity class is not imported into expval
@@ -190,6 +233,6 @@ class Identity(Expectation):
     grad_method = None
 
 
-all_ops = [PauliX, PauliY, PauliZ, Hadamard, Hermitian]
+all_ops = [PauliX, PauliY, PauliZ, Hadamard, Hermitian, Tensor]
 
 __all__ = [cls.__name__ for cls in all_ops]
@@ -114,6 +114,7 @@ from collections.abc import Sequence
 import logging as log
 
 import autograd.numpy as np
+from autograd.tracer import Box, getval
 
 from .qnode import QNode, QuantumFunctionError
 from .utils import _flatten, _unflatten
@@ -334,6 +335,11 @@ class Operation(abc.ABC):
         Returns:
             Number, array, Variable: p
         """
+        if isinstance(p, Box):
+            # a value traced by autograd, see :meth:`.QNode.evaluate_backprop`
+            self.check_domain(getval(p), flattened)
+            return p
+
         if isinstance(p, Variable):
             if self.par_domain == 'A':
                 raise TypeError('{}: Array parameter expected, got a Variable, which can only represent real scalars.'.format(self.name))
@@ -348,6 +354,10 @@ class Operation(abc.ABC):
                 if not isinstance(p, np.ndarray):
                     raise TypeError('{}: Array parameter expected, got {}.'.format(self.name, type(p)))
         elif self.par_domain in ('R', 'N'):
+            if flattened and self.par_domain == 'R' and isinstance(p, np.ndarray) and p.ndim == 1 and np.isrealobj(p):
+                # a batch of values, see :meth:`.QNode.evaluate_batch`
+                return p
+
             if not isinstance(p, numbers.Real):
                 raise TypeError('{}: Real scalar parameter expected, got {}.'.format(self.name, type(p)))
 
@@ -66,6 +66,31 @@ class GradientDescentOptimizer(object):
 
         return x_out
 
+    def step_and_cost(self, objective_fn, x, grad_fn=None):
+        """Update x with one step of the optimizer and return the corresponding objective
+        function value prior to the step.
+
+        The objective function value is taken from the same evaluation that computes the
+        gradient, rather than from a separate call of ``objective_fn``.
+
+        Args:
+            objective_fn (function): the objective function for optimization
+            x (array): NumPy array containing the current values of the variables to be updated
+            grad_fn (function): Optional gradient function of the
+                objective function with respect to the variables ``x``.
+                If ``None``, the gradient function is computed automatically.
+
+        Returns:
+            tuple: the new variable values :math:`x^{(t+1)}` and the objective
+            function value :math:`f(x^{(t)})`
+        """
+
+        g, forward = self.compute_grad_and_cost(objective_fn, x, grad_fn=grad_fn)
+
+        x_out = self.apply_grad(g, x)
+
+        return x_out, forward
+
     @staticmethod
     def compute_grad(objective_fn, x, grad_fn=None):
         r"""Compute gradient of the objective_fn at the point x.
@@ -87,6 +112,31 @@ class GradientDescentOptimizer(object):
             g = autograd.grad(objective_fn)(x)  # pylint: disable=no-value-for-parameter
         return g
 
+    @staticmethod
+    def compute_grad_and_cost(objective_fn, x, grad_fn=None):
+        r"""Compute gradient of the objective_fn at the point x, together with
+        the value of the objective_fn at x.
+
+        Args:
+            objective_fn (function): the objective function for optimization
+            x (array): NumPy array containing the current values of the variables to be updated
+            grad_fn (function): Optional gradient function of the
+                objective function with respect to the variables ``x``.
+                If ``None``, the gradient function is computed automatically,
+                and the value is obtained from the same evaluation.
+
+        Returns:
+            tuple: NumPy array containing the gradient :math:`\nabla f(x^{(t)})`,
+            and the objective function value :math:`f(x^{(t)})`
+        """
+        if grad_fn is not None:
+            g = grad_fn(x)  # just call the supplied grad function
+            forward = objective_fn(x)
+        else:
+            # default is autograd
+            forward, g = autograd.value_and_grad(objective_fn)(x)  # pylint: disable=no-value-for-parameter
+        return g, forward
+
     def apply_grad(self, grad, x):
         r"""Update the variables x to take a single optimization step. Flattens and unflattens
         the inputs to maintain nested iterables as the parameters of the optimization.
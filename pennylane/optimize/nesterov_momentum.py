@@ -64,3 +64,28 @@ class NesterovMomentumOptimizer(MomentumOptimizer):
             # default is autograd
             g = autograd.grad(objective_fn)(shifted_x) # pylint: disable=no-value-for-parameter
         return g
+
+    def compute_grad_and_cost(self, objective_fn, x, grad_fn=None):
+        r"""Compute gradient of the objective_fn at the shifted point
+        :math:`(x - m\times\text{accumulation})`, together with the value
+        of the objective_fn at x.
+
+        On the first step the shifted point is x itself, and both are obtained
+        from the same evaluation. Afterwards, the objective function is
+        evaluated separately at x.
+
+        Args:
+            objective_fn (function): the objective function for optimization
+            x (array): NumPy array containing the current values of the variables to be updated
+            grad_fn (function): Optional gradient function of the
+                objective function with respect to the variables ``x``.
+                If ``None``, the gradient function is computed automatically.
+
+        Returns:
+            tuple: NumPy array containing the gradient :math:`\nabla f(x^{(t)} - m a^{(t)})`,
+            and the objective function value :math:`f(x^{(t)})`
+        """
+        if self.accumulation is None:
+            return super().compute_grad_and_cost(objective_fn, x, grad_fn=grad_fn)
+
+        return self.compute_grad(objective_fn, x, grad_fn=grad_fn), objective_fn(x)
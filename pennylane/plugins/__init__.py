@@ -13,4 +13,7 @@
 # limitations under the License.
 """Top level PennyLane module"""
 from .default_qubit import DefaultQubit
+from .default_qubit_autograd import DefaultQubitAutograd
 from .default_gaussian import DefaultGaussian
+from .default_clifford import DefaultClifford
+from .default_mps import DefaultMPS
@@ -0,0 +1,282 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+r"""
+Default Clifford plugin
+=======================
+
+**Module name:** :mod:`pennylane.plugins.default_clifford`
+
+**Short name:** ``"default.clifford"``
+
+.. currentmodule:: pennylane.plugins.default_clifford
+
+A stabilizer simulator for Clifford circuits, following
+`Aaronson and Gottesman, Phys. Rev. A 70, 052328 (2004) <https://arxiv.org/abs/quant-ph/0406196>`_.
+
+Instead of the :math:`2^n` amplitudes of the state, the device stores the stabilizer
+tableau of :math:`n` destabilizer and :math:`n` stabilizer Pauli operators,
+using :math:`\mathcal{O}(n^2)` bits. Every gate updates the tableau in :math:`\mathcal{O}(n)`
+time, and every expectation value of a Pauli observable costs :math:`\mathcal{O}(n^2)`,
+so circuits on hundreds of qubits are simulated instantly.
+
+The supported gates are the Clifford gates of :mod:`pennylane.ops.qubit`, namely ``PauliX``,
+``PauliY``, ``PauliZ``, ``Hadamard``, ``CNOT``, ``CZ`` and ``SWAP``, together with
+``PhaseShift``, ``RX``, ``RY``, ``RZ`` and ``Rot`` for angles that are multiples of :math:`\pi/2`.
+For instance the phase gate :math:`S` is ``PhaseShift(np.pi/2)``. Since the parameter-shift rule
+shifts these angles by :math:`\pm\pi/2`, circuits remain Clifford while they are differentiated.
+The observables are tensor products of Pauli operators.
+
+Auxillary functions
+-------------------
+
+.. autosummary::
+    clifford_power
+
+Classes
+-------
+
+.. autosummary::
+    DefaultClifford
+
+Code details
+^^^^^^^^^^^^
+"""
+import numpy as np
+
+from pennylane import Device
+
+# tolerance for numerical errors
+tolerance = 1e-10
+
+
+def clifford_power(angle):
+    r"""Number of quarter turns in a Clifford rotation angle.
+
+    Args:
+        angle (float): rotation angle, must be a multiple of :math:`\pi/2`
+
+    Returns:
+        int: :math:`k \in \{0, 1, 2, 3\}` such that the angle equals :math:`k\pi/2` modulo :math:`2\pi`
+    """
+    k = angle / (np.pi/2)
+    if not np.isscalar(k) or abs(k - np.round(k)) > tolerance:
+        raise ValueError("The default.clifford plugin only supports rotation angles "
+                         "that are multiples of pi/2, got {}.".format(angle))
+    return int(np.round(k)) % 4
+
+
+class DefaultClifford(Device):
+    """Stabilizer simulator device for Clifford circuits.
+
+    Args:
+        wires (int): the number of modes to initialize the device in
+        shots (int): How many times the circuit should be evaluated (or sampled) to estimate
+            the expectation values. A value of 0 yields the exact result.
+    """
+    name = 'Default Clifford PennyLane plugin'
+    short_name = 'default.clifford'
+    pennylane_requires = '0.3'
+    version = '0.3.0'
+    author = 'Xanadu Inc.'
+    _capabilities = {}
+
+    _operations = {'BasisState', 'PauliX', 'PauliY', 'PauliZ', 'Hadamard', 'CNOT', 'CZ', 'SWAP',
+                   'PhaseShift', 'RX', 'RY', 'RZ', 'Rot'}
+
+    _expectations = {'PauliX', 'PauliY', 'PauliZ', 'Identity', 'Tensor'}
+
+    #: dict[str->(int, int)]: x and z bits of the single-qubit Pauli operators in the tableau
+    _pauli_bits = {
+        'Identity': (0, 0),
+        'PauliX': (1, 0),
+        'PauliY': (1, 1),
+        'PauliZ': (0, 1)
+    }
+
+    def __init__(self, wires, *, shots=0):
+        super().__init__(wires, shots)
+        #: array[bool]: x bits of the destabilizers (rows ``0..n-1``) and stabilizers (rows ``n..2n-1``)
+        self._x = None
+        #: array[bool]: z bits of the destabilizers and stabilizers
+        self._z = None
+        #: array[bool]: sign bits of the destabilizers and stabilizers
+        self._r = None
+        self.reset()
+
+    def apply(self, operation, wires, par):
+        if operation == 'BasisState':
+            n = len(par[0])
+            if n > self.num_wires or not set(par[0]).issubset({0, 1}):
+                raise ValueError("BasisState parameter must be an array of 0 or 1 integers of length at most {}.".format(self.num_wires))
+            if wires is not None and wires != [] and list(wires) != list(range(self.num_wires)):
+                raise ValueError("The default.clifford plugin can apply BasisState only to all of the {} wires.".format(self.num_wires))
+            self.reset()
+            for w, b in enumerate(par[0]):
+                if b:
+                    self._pauli_x(w)
+            return
+
+        if operation == 'PauliX':
+            self._pauli_x(wires[0])
+        elif operation == 'PauliY':
+            self._r ^= self._x[:, wires[0]] ^ self._z[:, wires[0]]
+        elif operation == 'PauliZ':
+            self._r ^= self._x[:, wires[0]]
+        elif operation == 'Hadamard':
+            self._hadamard(wires[0])
+        elif operation == 'CNOT':
+            self._cnot(*wires)
+        elif operation == 'CZ':
+            self._hadamard(wires[1])
+            self._cnot(*wires)
+            self._hadamard(wires[1])
+        elif operation == 'SWAP':
+            for bits in (self._x, self._z):
+                bits[:, wires] = bits[:, wires[::-1]]
+        elif operation in ('PhaseShift', 'RZ'):
+            # equal to S^k up to a global phase
+            self._phase(wires[0], clifford_power(par[0]))
+        elif operation == 'RX':
+            self._rx(wires[0], clifford_power(par[0]))
+        elif operation == 'RY':
+            self._ry(wires[0], clifford_power(par[0]))
+        elif operation == 'Rot':
+            # Rot(a, b, c) = RZ(c) RY(b) RZ(a)
+            k = [clifford_power(p) for p in par]
+            self._phase(wires[0], k[0])
+            self._ry(wires[0], k[1])
+            self._phase(wires[0], k[2])
+
+    def _pauli_x(self, a):
+        """Apply a Pauli X gate, which flips the sign of the rows with a Z or Y on wire a."""
+        self._r ^= self._z[:, a]
+
+    def _hadamard(self, a):
+        """Apply a Hadamard gate to wire a."""
+        self._r ^= self._x[:, a] & self._z[:, a]
+        self._x[:, a], self._z[:, a] = self._z[:, a].copy(), self._x[:, a].copy()
+
+    def _phase(self, a, k=1):
+        """Apply the phase gate S to wire a, k times."""
+        for _ in range(k):
+            self._r ^= self._x[:, a] & self._z[:, a]
+            self._z[:, a] ^= self._x[:, a]
+
+    def _cnot(self, a, b):
+        """Apply a CNOT gate with control a and target b."""
+        self._r ^= self._x[:, a] & self._z[:, b] & ~(self._x[:, b] ^ self._z[:, a])
+        self._x[:, b] ^= self._x[:, a]
+        self._z[:, a] ^= self._z[:, b]
+
+    def _rx(self, a, k):
+        """Apply RX(k pi/2) = H S^k H, up to a global phase."""
+        if k:
+            self._hadamard(a)
+            self._phase(a, k)
+            self._hadamard(a)
+
+    def _ry(self, a, k):
+        """Apply RY(k pi/2) = S RX(k pi/2) S^3, up to a global phase."""
+        if k:
+            self._phase(a, 3)
+            self._rx(a, k)
+            self._phase(a, 1)
+
+    def expval(self, expectation, wires, par):
+        if expectation == 'Tensor':
+            if len(par[0]) != len(wires):
+                raise ValueError("Tensor: the number of observables must be equal to the number of wires.")
+            names = list(map(str, par[0]))
+        else:
+            names = [expectation]
+
+        px = np.zeros(self.num_wires, dtype=bool)
+        pz = np.zeros(self.num_wires, dtype=bool)
+        for name, w in zip(names, wires):
+            if name not in self._pauli_bits:
+                raise ValueError("The default.clifford plugin only supports tensor products of "
+                                 "Pauli observables, got {}.".format(name))
+            px[w], pz[w] = self._pauli_bits[name]
+
+        ev = self.pauli_expectation(px, pz)
+
+        if self.shots > 0 and ev == 0:
+            # the outcomes +1 and -1 are equally likely
+            ev = 2 * np.random.binomial(self.shots, 0.5) / self.shots - 1
+        return ev
+
+    def pauli_expectation(self, px, pz):
+        r"""Exact expectation value of a Pauli operator in the current stabilizer state.
+
+        The expectation value is zero unless the operator :math:`P` commutes with all the
+        stabilizers. It then equals :math:`\pm 1`, and the sign is found by multiplying
+        the stabilizers whose destabilizers anticommute with :math:`P`, which gives :math:`\pm P`.
+
+        Args:
+          px (array[bool]): x bits of the Pauli operator, one per wire
+          pz (array[bool]): z bits of the Pauli operator, one per wire
+
+        Returns:
+          float: expectation value, one of :math:`-1`, :math:`0` and :math:`1`
+        """
+        n = self.num_wires
+        # symplectic inner product of each tableau row with P
+        anticommutes = np.logical_xor.reduce((self._x & pz) ^ (self._z & px), axis=1)
+        if np.any(anticommutes[n:]):
+            return 0.
+
+        x = np.zeros(n, dtype=bool)
+        z = np.zeros(n, dtype=bool)
+        phase = 0
+        for i in np.flatnonzero(anticommutes[:n]):
+            x, z, phase = self._rowsum(x, z, phase, n + i)
+        return -1. if phase else 1.
+
+    def _rowsum(self, x, z, r, i):
+        """Left multiply a Pauli operator by the tableau row i.
+
+        Args:
+          x, z (array[bool]): x and z bits of the Pauli operator
+          r (int): sign bit of the Pauli operator
+          i (int): index of the tableau row
+
+        Returns:
+          tuple[array[bool], array[bool], int]: x and z bits and sign bit of the product
+        """
+        x1, z1 = self._x[i].astype(int), self._z[i].astype(int)
+        x2, z2 = x.astype(int), z.astype(int)
+        # exponent of i picked up by each single-qubit product
+        g = np.where(x1 & z1, z2 - x2, 0) \
+            + np.where(x1 & (1 - z1), z2 * (2*x2 - 1), 0) \
+            + np.where((1 - x1) & z1, x2 * (1 - 2*z2), 0)
+        total = (2 * r + 2 * int(self._r[i]) + int(np.sum(g))) % 4
+        return x ^ self._x[i], z ^ self._z[i], total // 2
+
+    def reset(self):
+        """Reset the device"""
+        # |00..0> is stabilized by the Z_i, with destabilizers X_i
+        n = self.num_wires
+        self._x = np.zeros((2*n, n), dtype=bool)
+        self._z = np.zeros((2*n, n), dtype=bool)
+        self._r = np.zeros(2*n, dtype=bool)
+        self._x[np.arange(n), np.arange(n)] = True
+        self._z[n + np.arange(n), np.arange(n)] = True
+
+    @property
+    def operations(self):
+        return set(self._operations)
+
+    @property
+    def expectations(self):
+        return set(self._expectations)
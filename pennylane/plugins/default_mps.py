@@ -0,0 +1,398 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+r"""
+Default MPS plugin
+==================
+
+**Module name:** :mod:`pennylane.plugins.default_mps`
+
+**Short name:** ``"default.mps"``
+
+.. currentmodule:: pennylane.plugins.default_mps
+
+A matrix product state (MPS) simulator of qubit circuits.
+
+The state of :math:`n` qubits is stored as a chain of :math:`n` tensors of shape
+:math:`(\chi_l, 2, \chi_r)`, where the bond dimensions :math:`\chi` grow with the
+entanglement between the two halves of the chain, but never exceed :attr:`~.DefaultMPS.bond_dim`.
+Circuits with bounded entanglement, such as shallow circuits of nearest-neighbour gates,
+therefore cost :math:`\mathcal{O}(n\chi^3)` rather than :math:`\mathcal{O}(2^n)`,
+and can be simulated on many more qubits than with :mod:`default.qubit <pennylane.plugins.default_qubit>`.
+
+The chain is kept in mixed canonical form. A gate on :math:`k` wires moves the
+orthogonality center to its first wire, brings the other wires next to it with SWAP
+gates, contracts the :math:`k` sites with the gate, and splits the result again with
+singular value decompositions. Singular values below :attr:`~.DefaultMPS.cutoff` times the
+largest one, and all but the :attr:`~.DefaultMPS.bond_dim` largest, are discarded.
+
+The device supports the same operations and expectations as :mod:`default.qubit <pennylane.plugins.default_qubit>`.
+
+Classes
+-------
+
+.. autosummary::
+    DefaultMPS
+
+Code details
+^^^^^^^^^^^^
+"""
+import numpy as np
+from scipy.linalg import eigh
+
+from pennylane import Device
+
+from .default_qubit import (X, Y, Z, H, CNOT, SWAP, CZ, Rphi, Rotx, Roty, Rotz, Rot3,
+                            unitary, hermitian, identity, tensor, tensor_factors)
+
+
+class DefaultMPS(Device):
+    r"""Matrix product state simulator device for PennyLane.
+
+    Args:
+        wires (int): the number of modes to initialize the device in
+        shots (int): How many times the circuit should be evaluated (or sampled) to estimate
+            the expectation values. A value of 0 yields the exact result.
+        bond_dim (int): maximum bond dimension :math:`\chi` between neighbouring sites
+        cutoff (float): singular values smaller than ``cutoff`` times the largest singular
+            value of a bond are discarded
+    """
+    name = 'Default MPS PennyLane plugin'
+    short_name = 'default.mps'
+    pennylane_requires = '0.3'
+    version = '0.3.0'
+    author = 'Xanadu Inc.'
+    _capabilities = {}
+
+    # Note: BasisState and QubitStateVector don't
+    # map to any particular function, as they modify
+    # the internal device state directly.
+    _operation_map = {
+        'BasisState': None,
+        'QubitStateVector': None,
+        'QubitUnitary': unitary,
+        'PauliX': X,
+        'PauliY': Y,
+        'PauliZ': Z,
+        'Hadamard': H,
+        'CNOT': CNOT,
+        'SWAP': SWAP,
+        'CZ': CZ,
+        'PhaseShift': Rphi,
+        'RX': Rotx,
+        'RY': Roty,
+        'RZ': Rotz,
+        'Rot': Rot3
+    }
+
+    _expectation_map = {
+        'PauliX': X,
+        'PauliY': Y,
+        'PauliZ': Z,
+        'Hadamard': H,
+        'Hermitian': hermitian,
+        'Tensor': tensor,
+        'Identity': identity
+    }
+
+    def __init__(self, wires, *, shots=0, bond_dim=64, cutoff=1e-10):
+        super().__init__(wires, shots)
+        self.bond_dim = bond_dim
+        self.cutoff = cutoff
+
+        #: list[array]: site tensors of shape ``(chi_l, 2, chi_r)``, one per wire
+        self._tensors = None
+        #: int: orthogonality center, the sites to its left are left-canonical
+        #: and the sites to its right are right-canonical
+        self._center = 0
+        self.reset()
+
+    @property
+    def bond_dims(self):
+        """Current bond dimensions of the chain.
+
+        Returns:
+            list[int]: dimension of the bond between each pair of neighbouring sites
+        """
+        return [A.shape[2] for A in self._tensors[:-1]]
+
+    def apply(self, operation, wires, par):
+        if operation == 'QubitStateVector':
+            state = np.asarray(par[0], dtype=np.complex128)
+            if state.ndim != 1 or state.shape[0] != 2**self.num_wires:
+                raise ValueError('State vector must be of length 2**wires.')
+            if wires is not None and wires != [] and list(wires) != list(range(self.num_wires)):
+                raise ValueError("The default.mps plugin can apply QubitStateVector only to all of the {} wires.".format(self.num_wires))
+            theta = np.reshape(state, (1,) + (2,) * self.num_wires + (1,))
+            self._tensors = self._split(theta)
+            self._center = self.num_wires - 1
+            return
+        elif operation == 'BasisState':
+            n = len(par[0])
+            if n > self.num_wires or not set(par[0]).issubset({0, 1}):
+                raise ValueError("BasisState parameter must be an array of 0 or 1 integers of length at most {}.".format(self.num_wires))
+            if wires is not None and wires != [] and list(wires) != list(range(self.num_wires)):
+                raise ValueError("The default.mps plugin can apply BasisState only to all of the {} wires.".format(self.num_wires))
+            bits = list(par[0]) + [0] * (self.num_wires - n)
+            self._tensors = [np.reshape(np.eye(2, dtype=np.complex128)[b], (1, 2, 1)) for b in bits]
+            self._center = 0
+            return
+
+        A = self._get_operator_matrix(operation, par)
+        if A.shape != (2**len(wires), 2**len(wires)):
+            raise ValueError('{0}x{0} matrix required.'.format(2**len(wires)))
+        self._apply_gate(A, list(wires))
+
+    def expval(self, expectation, wires, par):
+        if expectation == 'Tensor':
+            if len(par[0]) != len(wires):
+                raise ValueError("Tensor: the number of observables must be equal to the number of wires.")
+            factors = {}
+            for name, w in zip(map(str, par[0]), wires):
+                if name not in tensor_factors:
+                    raise ValueError("Tensor factor {} is not a supported single-qubit observable.".format(name))
+                factors[w] = tensor_factors[name]
+
+            ev = self.ev_product(factors)
+            if self.shots > 0:
+                # all the factors have eigenvalues +-1, and so has their product
+                p = np.clip((1 + ev) / 2, 0, 1)
+                ev = 2 * np.random.binomial(self.shots, p) / self.shots - 1
+            return ev
+
+        A = self._get_operator_matrix(expectation, par)
+        if A.shape != (2**len(wires), 2**len(wires)):
+            raise ValueError('{0}x{0} matrix required.'.format(2**len(wires)))
+        rho = self.reduced_density_matrix(wires)
+
+        if self.shots > 0:
+            # sample the eigenvalues of A from the reduced state of the wires
+            a, V = eigh(A)
+            p = np.clip(np.real(np.einsum('ij,jk,ki->i', V.conj().T, rho, V)), 0, None)
+            counts = np.random.multinomial(self.shots, p / np.sum(p))
+            return counts @ a / self.shots
+
+        return np.real(np.trace(A @ rho))
+
+    def _get_operator_matrix(self, operation, par):
+        """Get the operator matrix for a given operation or expectation.
+
+        Args:
+          operation    (str): name of the operation/expectation
+          par (tuple[float]): parameter values
+        Returns:
+          array: matrix representation
+        """
+        A = {**self._operation_map, **self._expectation_map}[operation]
+        if not callable(A):
+            return A
+        return np.asarray(A(*par))
+
+    def ev_product(self, factors):
+        r"""Expectation value of a product of single-qubit observables.
+
+        With the orthogonality center on the first of the wires, the sites outside of the
+        wires contract to identities, and only the transfer matrices of the sites in between
+        are needed.
+
+        Args:
+          factors (dict[int->array]): :math:`2\times 2` Hermitian matrix for each wire
+
+        Returns:
+          float: expectation value :math:`\expect{A_1\otimes\cdots\otimes A_k}`
+        """
+        if not factors:
+            return 1.
+
+        first, last = min(factors), max(factors)
+        self._move_center(first)
+        E = np.eye(self._tensors[first].shape[0])
+        for site in range(first, last + 1):
+            A = self._tensors[site]
+            OA = np.einsum('ij,ajb->aib', factors[site], A) if site in factors else A
+            E = np.einsum('ac,aib,cid->bd', E, A.conj(), OA)
+        return np.real(np.trace(E))
+
+    def reduced_density_matrix(self, wires):
+        r"""Reduced density matrix of the current state on the given subsystems.
+
+        On a copy of the chain, the wires are moved next to each other, in the given order,
+        and the orthogonality center is moved onto the first of them. The reduced density
+        matrix then follows from the merged tensor of these sites alone.
+
+        Args:
+          wires (Sequence[int]): target subsystems (order matters!)
+
+        Returns:
+          array: :math:`2^k\times 2^k` reduced density matrix
+        """
+        tensors, center = list(self._tensors), self._center
+        try:
+            start, _ = self._gather(wires)
+            self._move_center(start)
+            theta = self._merge(start, len(wires))
+        finally:
+            # the gathering swaps only act on the copy
+            self._tensors, self._center = tensors, center
+
+        psi = np.reshape(np.moveaxis(theta, -1, 1), (theta.shape[0] * theta.shape[-1], -1))
+        return psi.T @ psi.conj()
+
+    def _apply_gate(self, U, wires):
+        r"""Apply a gate to the chain.
+
+        Args:
+          U (array): :math:`2^k\times 2^k` matrix
+          wires (Sequence[int]): target subsystems (order matters!)
+        """
+        k = len(wires)
+        if k == 1:
+            # no bonds change
+            A = self._tensors[wires[0]]
+            self._tensors[wires[0]] = np.einsum('ij,ajb->aib', U, A)
+            return
+
+        start, swaps = self._gather(wires)
+        self._move_center(start)
+        theta = self._merge(start, k)
+
+        # contract the input indices of the gate with the physical axes of the sites
+        U = np.reshape(U, [2] * 2 * k)
+        theta = np.tensordot(U, theta, axes=(list(range(k, 2 * k)), list(range(1, k + 1))))
+        theta = np.moveaxis(theta, k, 0)
+
+        self._tensors[start:start + k] = self._split(theta)
+        self._center = start + k - 1
+
+        # move the wires back to their sites
+        for site in reversed(swaps):
+            self._swap(site)
+
+    def _gather(self, wires):
+        """Move the sites of the given wires next to each other, in the given order,
+        by swapping neighbouring sites.
+
+        Args:
+          wires (Sequence[int]): subsystems to gather
+
+        Returns:
+          tuple[int, list[int]]: first site of the gathered wires, and the swapped
+          pairs of sites ``(s, s+1)``, given by ``s``, in the order they were applied
+        """
+        position = list(range(self.num_wires))  # wire held by each site
+        start = min(wires)
+        swaps = []
+        for j, w in enumerate(wires):
+            site = position.index(w)
+            target = start + j
+            step = -1 if site > target else 1
+            while site != target:
+                s = min(site, site + step)
+                self._swap(s)
+                position[s], position[s + 1] = position[s + 1], position[s]
+                swaps.append(s)
+                site += step
+        return start, swaps
+
+    def _swap(self, site):
+        """Swap the qubits of two neighbouring sites.
+
+        Args:
+          site (int): the sites ``site`` and ``site+1`` are swapped
+        """
+        self._move_center(site)
+        theta = self._merge(site, 2)
+        theta = np.swapaxes(theta, 1, 2)
+        self._tensors[site:site + 2] = self._split(theta)
+        self._center = site + 1
+
+    def _merge(self, start, k):
+        """Contract k neighbouring sites into a single tensor.
+
+        Args:
+          start (int): first site
+          k (int): number of sites
+
+        Returns:
+          array: tensor of shape ``(chi_l, 2, ..., 2, chi_r)``
+        """
+        theta = self._tensors[start]
+        for A in self._tensors[start + 1:start + k]:
+            theta = np.tensordot(theta, A, axes=([-1], [0]))
+        return theta
+
+    def _split(self, theta):
+        """Split a tensor into a chain of sites with truncated singular value decompositions.
+
+        The sites are left-canonical, except for the last one, which carries the norm.
+
+        Args:
+          theta (array): tensor of shape ``(chi_l, 2, ..., 2, chi_r)``
+
+        Returns:
+          list[array]: site tensors
+        """
+        sites = []
+        k = theta.ndim - 2
+        for _ in range(k - 1):
+            chi_l = theta.shape[0]
+            rest = theta.shape[2:]
+            u, s, vh = np.linalg.svd(np.reshape(theta, (chi_l * 2, -1)), full_matrices=False)
+
+            # truncate the bond and renormalize
+            keep = max(1, min(self.bond_dim, int(np.sum(s > self.cutoff * s[0]))))
+            norm = np.linalg.norm(s)
+            u, s, vh = u[:, :keep], s[:keep], vh[:keep]
+            s *= norm / np.linalg.norm(s)
+
+            sites.append(np.reshape(u, (chi_l, 2, keep)))
+            theta = np.reshape(s[:, None] * vh, (keep,) + rest)
+        sites.append(theta)
+        return sites
+
+    def _move_center(self, site):
+        """Move the orthogonality center of the chain with QR decompositions.
+
+        Args:
+          site (int): new orthogonality center
+        """
+        while self._center < site:
+            c = self._center
+            A = self._tensors[c]
+            q, r = np.linalg.qr(np.reshape(A, (-1, A.shape[2])))
+            self._tensors[c] = np.reshape(q, A.shape[:2] + (q.shape[1],))
+            self._tensors[c + 1] = np.tensordot(r, self._tensors[c + 1], axes=([1], [0]))
+            self._center += 1
+
+        while self._center > site:
+            c = self._center
+            A = self._tensors[c]
+            q, r = np.linalg.qr(np.reshape(A, (A.shape[0], -1)).T)
+            self._tensors[c] = np.reshape(q.T, (q.shape[1],) + A.shape[1:])
+            self._tensors[c - 1] = np.tensordot(self._tensors[c - 1], r.T, axes=([2], [0]))
+            self._center -= 1
+
+    def reset(self):
+        """Reset the device"""
+        # init the state to the product state |00..0>
+        self._tensors = [np.reshape(np.array([1, 0], dtype=np.complex128), (1, 2, 1))
+                         for _ in range(self.num_wires)]
+        self._center = 0
+
+    @property
+    def operations(self):
+        return set(self._operation_map.keys())
+
+    @property
+    def expectations(self):
+        return set(self._expectation_map.keys())
@@ -37,8 +37,11 @@ Auxillary functions
 
 .. autosummary::
     spectral_decomposition_qubit
+    batched_matrix
     unitary
     hermitian
+    identity
+    tensor
 
 Gates and operations
 --------------------
@@ -57,6 +60,18 @@ Gates and operations
     SWAP
     CZ
 
+Gate kernels
+------------
+
+.. autosummary::
+    apply_x
+    apply_y
+    apply_z
+    apply_h
+    apply_cnot
+    apply_swap
+    apply_cz
+
 Expectations
 ------------
 
@@ -75,11 +90,20 @@ Code details
 ^^^^^^^^^^^^
 """
 import logging as log
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import itertools
+import os
+import tempfile
+import weakref
 
 import numpy as np
-from scipy.linalg import expm, eigh
+from scipy.linalg import eigh
 
 from pennylane import Device
+from pennylane.program import Program
+from pennylane.utils import _flatten
+from pennylane.variable import Variable
 
 log.getLogger()
 
@@ -109,6 +133,24 @@ def spectral_decomposition_qubit(A):
     return d, P
 
 
+def batched_matrix(rows):
+    r"""Assembles a matrix whose entries may carry a batch dimension.
+
+    Args:
+        rows (Sequence[Sequence[complex, array]]): matrix entries. Array-valued
+            entries of shape ``(B,)`` hold one value per batch sample.
+
+    Returns:
+        array: matrix of shape ``(m, n)``, or ``(B, m, n)`` if any entry is batched
+    """
+    entries = [e for row in rows for e in row]
+    if all(np.ndim(e) == 0 for e in entries):
+        return np.array(rows)
+
+    entries = np.broadcast_arrays(*entries)
+    return np.reshape(np.stack(entries, axis=-1), entries[0].shape + (len(rows), len(rows[0])))
+
+
 #========================================================
 #  fixed gates
 #========================================================
@@ -134,55 +176,165 @@ def Rphi(phi):
     r"""One-qubit phase shift.
 
     Args:
-        phi (float): phase shift angle
+        phi (float, array[float]): phase shift angle
     Returns:
         array: unitary 2x2 phase shift matrix
     """
-    return np.array([[1, 0], [0, np.exp(1j*phi)]])
+    return batched_matrix([[1, 0], [0, np.exp(1j*phi)]])
 
 
 def Rotx(theta):
     r"""One-qubit rotation about the x axis.
 
     Args:
-        theta (float): rotation angle
+        theta (float, array[float]): rotation angle
     Returns:
         array: unitary 2x2 rotation matrix :math:`e^{-i \sigma_x \theta/2}`
     """
-    return expm(-1j * theta/2 * X)
+    c = np.cos(theta/2)
+    js = 1j*np.sin(theta/2)
+    return batched_matrix([[c, -js], [-js, c]])
 
 
 def Roty(theta):
     r"""One-qubit rotation about the y axis.
 
     Args:
-        theta (float): rotation angle
+        theta (float, array[float]): rotation angle
     Returns:
         array: unitary 2x2 rotation matrix :math:`e^{-i \sigma_y \theta/2}`
     """
-    return expm(-1j * theta/2 * Y)
+    c = np.cos(theta/2)
+    s = np.sin(theta/2)
+    return batched_matrix([[c, -s], [s, c]])
 
 
 def Rotz(theta):
     r"""One-qubit rotation about the z axis.
 
     Args:
-        theta (float): rotation angle
+        theta (float, array[float]): rotation angle
     Returns:
         array: unitary 2x2 rotation matrix :math:`e^{-i \sigma_z \theta/2}`
     """
-    return expm(-1j * theta/2 * Z)
+    p = np.exp(-0.5j*theta)
+    return batched_matrix([[p, 0], [0, p.conjugate()]])
 
 
 def Rot3(a, b, c):
     r"""Arbitrary one-qubit rotation using three Euler angles.
 
     Args:
-        a,b,c (float): rotation angles
+        a,b,c (float, array[float]): rotation angles
     Returns:
         array: unitary 2x2 rotation matrix ``rz(c) @ ry(b) @ rz(a)``
     """
-    return Rotz(c) @ (Roty(b) @ Rotz(a))
+    cb = np.cos(b/2)
+    sb = np.sin(b/2)
+    p = np.exp(-0.5j*(a+c))
+    m = np.exp(-0.5j*(a-c))
+    return batched_matrix([[p*cb, -m.conjugate()*sb], [m*sb, p.conjugate()*cb]])
+
+
+#========================================================
+#  gate kernels
+#========================================================
+# The following gates only permute the amplitudes of the state, or flip
+# their signs/phases. Rather than contracting a matrix with the state,
+# they act in place on the state tensor (one axis per wire).
+
+def _slice(state, wires, values):
+    """Index selecting the subtensor with the given wires fixed to the given values."""
+    idx = [slice(None)] * state.ndim
+    for w, v in zip(wires, values):
+        idx[w] = v
+    return tuple(idx)
+
+
+def _swap_slices(state, idx0, idx1):
+    """Swap two non-overlapping subtensors of the state in place."""
+    temp = state[idx0].copy()
+    state[idx0] = state[idx1]
+    state[idx1] = temp
+
+
+def apply_x(state, wires):
+    r"""Apply the Pauli-X gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): target subsystem
+    """
+    _swap_slices(state, _slice(state, wires, [0]), _slice(state, wires, [1]))
+
+
+def apply_y(state, wires):
+    r"""Apply the Pauli-Y gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): target subsystem
+    """
+    idx0 = _slice(state, wires, [0])
+    idx1 = _slice(state, wires, [1])
+    _swap_slices(state, idx0, idx1)
+    state[idx0] *= -1j
+    state[idx1] *= 1j
+
+
+def apply_z(state, wires):
+    r"""Apply the Pauli-Z gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): target subsystem
+    """
+    state[_slice(state, wires, [1])] *= -1
+
+
+def apply_h(state, wires):
+    r"""Apply the Hadamard gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): target subsystem
+    """
+    idx0 = _slice(state, wires, [0])
+    idx1 = _slice(state, wires, [1])
+    temp = state[idx0].copy()
+    state[idx0] += state[idx1]
+    state[idx1] = temp - state[idx1]
+    state *= 1/np.sqrt(2)
+
+
+def apply_cnot(state, wires):
+    r"""Apply the CNOT gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): control and target subsystems
+    """
+    _swap_slices(state, _slice(state, wires, [1, 0]), _slice(state, wires, [1, 1]))
+
+
+def apply_swap(state, wires):
+    r"""Apply the SWAP gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): the two subsystems to swap
+    """
+    _swap_slices(state, _slice(state, wires, [0, 1]), _slice(state, wires, [1, 0]))
+
+
+def apply_cz(state, wires):
+    r"""Apply the CZ gate in place.
+
+    Args:
+        state (array[complex]): state tensor with one axis per wire
+        wires (Sequence[int]): control and target subsystems
+    """
+    state[_slice(state, wires, [1, 1])] *= -1
 
 
 #========================================================
@@ -236,11 +388,57 @@ def identity(*_):
     """
     return np.identity(2)
 
+
+#: dict[str->array]: single-qubit observables that may appear as factors of a :func:`tensor` expectation
+tensor_factors = {
+    'PauliX': X,
+    'PauliY': Y,
+    'PauliZ': Z,
+    'Hadamard': H,
+    'Identity': I
+}
+
+
+def tensor(*args):
+    r"""Tensor product of single-qubit observables.
+
+    Args:
+        args (array[str]): names of the single-qubit observables, one per wire
+
+    Returns:
+        array: :math:`2^k\times 2^k` Hermitian matrix
+    """
+    A = np.identity(1)
+    for name in map(str, args[0]):
+        if name not in tensor_factors:
+            raise ValueError("Tensor factor {} is not a supported single-qubit observable.".format(name))
+        A = np.kron(A, tensor_factors[name])
+    return A
+
+
 #========================================================
 #  device
 #========================================================
 
 
+_pooled_devices = weakref.WeakSet()  #: WeakSet[DefaultQubit]: devices that have started their worker threads
+
+
+def _drop_pools():
+    """Forget the worker threads of all devices in a forked child process.
+
+    The threads of a :class:`~concurrent.futures.ThreadPoolExecutor` do not survive a fork,
+    so the child creates new pools on first use instead of waiting on them forever.
+    """
+    for dev in list(_pooled_devices):
+        dev._pool = None  # pylint: disable=protected-access
+    _pooled_devices.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_drop_pools)
+
+
 class DefaultQubit(Device):
     """Default qubit device for PennyLane.
 
@@ -248,12 +446,36 @@ class DefaultQubit(Device):
         wires (int): the number of modes to initialize the device in
         shots (int): How many times the circuit should be evaluated (or sampled) to estimate
             the expectation values. A value of 0 yields the exact result.
+        gate_fusion (bool): If True, consecutive single-qubit gates acting on the same wire
+            are multiplied into a single :math:`2\times 2` matrix during :meth:`~.execute`,
+            so that the state is only updated once per run of gates.
+        dtype (str, numpy.dtype): complex data type of the state vector and of all gate and
+            observable matrices. ``'complex64'`` halves the memory used by the state, at
+            a precision of about :math:`10^{-6}`. Defaults to ``'complex128'``.
+        threads (int): number of worker threads used to apply gates. If larger than one,
+            the state tensor is split into independent chunks along axes the gate does not
+            act on, and the chunks are updated in parallel.
+        memmap_dir (str, None): if given, the state vector is kept out of core, in a temporary
+            memory-mapped file in this directory. Gates and expectations then stream over the
+            state in blocks of at most :math:`2^{20}` amplitudes. Batched states are always
+            kept in memory.
+        checkpoint_memory (float): memory budget in MiB for the intermediate states cached
+            within :meth:`checkpoints`, which lets circuits that only differ in their later
+            operations resume from a cached state.
+        batch_memory (float): memory budget in MiB for the batched states of circuits that
+            :meth:`batch_execute` simulates together, e.g. the shifted circuits of a gradient.
+            If less than two states fit, the circuits are executed one after another.
+
+    Gate parameters may be arrays of shape ``(B,)``, holding one value per sample of a
+    batch (see :meth:`.QNode.evaluate_batch`). The state then carries a leading batch axis,
+    and has shape ``(B, 2**wires)``, and every expectation value has shape ``(B,)``.
     """
     name = 'Default qubit PennyLane plugin'
     short_name = 'default.qubit'
     pennylane_requires = '0.3'
     version = '0.3.0'
     author = 'Xanadu Inc.'
+    _capabilities = {'batched': True, 'checkpoints': True, 'adjoint': True, 'constant_blocks': True}
 
     # Note: BasisState and QubitStateVector don't
     # map to any particular function, as they modify
@@ -276,28 +498,531 @@ class DefaultQubit(Device):
         'Rot': Rot3
     }
 
+    # Gates that are pure permutations or sign flips of the amplitudes
+    # are applied by these in-place kernels rather than by a matrix.
+    _kernel_map = {
+        'PauliX': apply_x,
+        'PauliY': apply_y,
+        'PauliZ': apply_z,
+        'Hadamard': apply_h,
+        'CNOT': apply_cnot,
+        'SWAP': apply_swap,
+        'CZ': apply_cz
+    }
+
     _expectation_map = {
         'PauliX': X,
         'PauliY': Y,
         'PauliZ': Z,
         'Hadamard': H,
         'Hermitian': hermitian,
+        'Tensor': tensor,
         'Identity': identity
     }
 
-    def __init__(self, wires, *, shots=0):
+    # Generators of the differentiable gates, given as (c, G) such that
+    # the derivative of the gate U(theta) is c G U(theta).
+    _generator_map = {
+        'RX': (-0.5j, X),
+        'RY': (-0.5j, Y),
+        'RZ': (-0.5j, Z),
+        'PhaseShift': (1j, np.diag([0, 1]))
+    }
+
+    #: int: gates are only applied in parallel on registers with at least this many wires,
+    #: smaller states do not amortize the cost of dispatching to the thread pool
+    _parallel_min_wires = 14
+    #: int: out-of-core states are processed in blocks of at most ``2**_block_wires`` amplitudes
+    _block_wires = 20
+    #: int: constant blocks are fused into unitaries acting on at most this many wires
+    _constant_block_wires = 4
+    #: int: maximum number of constant blocks whose unitaries are cached
+    _constant_block_cache_size = 256
+
+    def __init__(self, wires, *, shots=0, gate_fusion=True, dtype='complex128', threads=1, memmap_dir=None,
+                 checkpoint_memory=256, batch_memory=256):
         super().__init__(wires, shots)
         self.eng = None
         self._state = None
 
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != 'c':
+            raise ValueError("The default.qubit plugin requires a complex dtype, got {}.".format(self.dtype))
+        #: float: tolerance for numerical errors at the precision of :attr:`dtype`
+        self.tolerance = max(tolerance, 10*np.finfo(self.dtype).eps)
+
+        self.threads = threads
+        self.memmap_dir = memmap_dir
+
+        self.checkpoint_memory = checkpoint_memory
+        self.batch_memory = batch_memory
+        #: dict[int->array]: states before the operation with the given index, or None outside :meth:`checkpoints`
+        self._checkpoints = None
+        #: list[(str, list[int], list)]: operations of the run that recorded the checkpoints
+        self._checkpoint_ops = None
+        #: list[int]: operation indices at which checkpoints may be recorded
+        self._checkpoint_positions = None
+        #: int: index of the next operation passed to :meth:`apply`
+        self._op_index = 0
+        #: int: operations with a smaller index are already contained in the state
+        self._resume = 0
+        #: list[(int, int)]: runs of operations without free parameters, or None outside :meth:`constant_blocks`
+        self._constant_blocks = None
+        #: dict[tuple[Operation]->list[(int, int, array, list[int])]]: fused segments of each constant block
+        self._block_cache = {}
+        #: dict[int->(int, array, list[int])]: fused segments of the current circuit, by index of their first operation
+        self._fused = None
+        #: int: operations with a smaller index are contained in the last fused segment
+        self._fused_until = 0
+        #: ThreadPoolExecutor: worker threads for chunked gate application, created on first use
+        self._pool = None
+
+        self.gate_fusion = gate_fusion
+        #: dict[int->list[(str, list)]]: single-qubit gates per wire that are yet to be applied,
+        #: or None if gates are applied immediately
+        self._pending = None
+        #: dict[tuple[int]->array]: reduced density matrices of the final state, or None if not cached
+        self._rho_cache = None
+        #: dict[(str, tuple[int])->float]: expectation estimates from shared samples, or None if not drawn
+        self._samples = None
+
     def pre_apply(self):
         self.reset()
+        self._op_index = 0
+        self._resume = 0
+
+        if self._checkpoints is not None and self._op_queue is not None:
+            self._restore_checkpoint()
+
+        self._fused = None
+        self._fused_until = 0
+        if self._constant_blocks is not None and self._op_queue is not None:
+            self._fused = self._fuse_constant_blocks()
+
+        if self.gate_fusion:
+            # defer single-qubit gates until post_apply, or until
+            # a multi-qubit operation acts on the same wire
+            self._pending = {}
+
+    def post_apply(self):
+        if self._pending is not None:
+            self._flush()
+            self._pending = None
+
+    def pre_expval(self):
+        # the state is fixed from now on, reduced density matrices can be
+        # computed once per measured wire and shared by all expectations
+        self._rho_cache = {}
+
+        if self.shots > 0 and self._expval_queue is not None:
+            # observables on disjoint wires are estimated from one shared set of samples
+            measured = [w for e in self._expval_queue for w in e.wires]
+            if len(set(measured)) == len(measured):
+                observables = [(e.name, e.wires, e.parameters) for e in self._expval_queue]
+                self._samples = dict(zip([(e[0], tuple(e[1])) for e in observables], self.sample(observables)))
+
+    def post_expval(self):
+        self._rho_cache = None
+        self._samples = None
 
     def apply(self, operation, wires, par):
+        index = self._op_index
+        self._op_index += 1
+        if index < self._resume:
+            # already applied to the restored checkpoint
+            return
+
+        if self._checkpoint_positions is not None and index in self._checkpoint_positions:
+            # save the state before this operation
+            if self._pending is not None:
+                self._flush()
+            self._checkpoints[index] = self._state.copy()
+
+        if self._fused and index in self._fused:
+            # apply the precomputed unitary of a constant segment, and skip its other operations
+            self._fused_until, U, fused_wires = self._fused[index]
+            if self._pending is not None:
+                self._flush(fused_wires)
+            self._apply_matrix(U, fused_wires)
+            return
+        if index < self._fused_until:
+            return
+
+        if self._pending is not None:
+            if len(wires) == 1 and operation not in ('BasisState', 'QubitStateVector'):
+                self._pending.setdefault(wires[0], []).append((operation, par))
+                return
+
+            if operation in ('BasisState', 'QubitStateVector'):
+                self._flush()
+            else:
+                self._flush(wires)
+
+        self._apply_operation(operation, wires, par)
+
+    def batch_execute(self, circuits, parameters=None):
+        """Execute several circuits on the device, and measure the expectation values of each.
+
+        Circuits that execute the same program with the same expectations, and only differ in
+        the values of free parameters that are all real scalars, are simulated together in one
+        sweep through a batched state with one sample per circuit, as many at a time as the
+        :attr:`batch_memory` budget allows. Batched runs neither record nor resume from
+        :meth:`checkpoints`. The other circuits are executed one after another.
+
+        See :meth:`.Device.batch_execute` for the arguments.
+
+        Returns:
+            list[array[float]]: expectation value(s) of each circuit
+        """
+        size = self._batch_states()
+        if parameters is None or size < 2:
+            return super().batch_execute(circuits, parameters)
+        if len(parameters) != len(circuits):
+            raise ValueError("{} parameter vectors given for {} circuits.".format(len(parameters), len(circuits)))
+
+        results = [None] * len(circuits)
+        groups = {}
+        for i, (queue, expectation) in enumerate(circuits):
+            if self.batch_size(queue, expectation) > 1:
+                groups.setdefault((id(queue), tuple(map(id, expectation))), []).append(i)
+            else:
+                results[i] = super().batch_execute([circuits[i]], [parameters[i]])[0]
+
+        batches = [idx[j:j+size] for idx in groups.values() for j in range(0, len(idx), size)]
+        previous = Variable.free_param_values
+        try:
+            for idx in batches:
+                program, expectation = circuits[idx[0]]
+                if len(idx) == 1:
+                    results[idx[0]] = super().batch_execute([circuits[idx[0]]], [parameters[idx[0]]])[0]
+                    continue
+
+                # one column of free parameter values per circuit
+                Variable.free_param_values = np.stack([np.asarray(parameters[i]) for i in idx], axis=-1)
+                self.reset()
+                stash = self._checkpoints, self._checkpoint_positions
+                self._checkpoints, self._checkpoint_positions = None, None
+                try:
+                    res = self.execute_program(program, expectation)
+                finally:
+                    self._checkpoints, self._checkpoint_positions = stash
+
+                # expectations that do not depend on the free parameters are not batched
+                res = np.broadcast_to(np.reshape(res, (len(expectation), -1)), (len(expectation), len(idx)))
+                for j, i in enumerate(idx):
+                    results[i] = res[:, j].copy()
+        finally:
+            Variable.free_param_values = previous
+        return results
+
+    def batch_size(self, program, expectation):
+        """Number of circuits that :meth:`batch_execute` simulates together.
+
+        See :meth:`.Device.batch_size` for the arguments.
+
+        Returns:
+            int: number of batched states that fit in the :attr:`batch_memory` budget,
+            or 1 if the circuits cannot be batched
+        """
+        if not self._batchable(program, expectation):
+            return 1
+        return max(self._batch_states(), 1)
+
+    def _batch_states(self):
+        """Number of states that fit in the :attr:`batch_memory` budget.
+
+        Returns:
+            int: number of states
+        """
+        return int(self.batch_memory * 2**20 // (2**self.num_wires * self.dtype.itemsize))
+
+    @staticmethod
+    def _batchable(queue, expectation):
+        """Whether circuits can be simulated together in a batched state.
+
+        Args:
+            queue (Sequence[~.operation.Operation] or ~.program.Program): operations of the circuits
+            expectation (Sequence[~.operation.Expectation]): expectations of the circuits
+
+        Returns:
+            bool: True iff the operations are a program in which only real scalar gate
+            parameters depend on the free positional parameters
+        """
+        if not isinstance(queue, Program) or queue.free_wires:
+            return False
+        # pylint: disable=protected-access
+        if any(isinstance(w, Variable) for e in expectation for w in e._wires) or \
+                any(isinstance(p, Variable) and p.name is None for e in expectation for p in _flatten(e.params)):
+            return False
+        return all(queue.queue[k].par_domain == 'R' for k, _ in queue.slots)
+
+    @contextlib.contextmanager
+    def checkpoints(self, positions):
+        """Context in which intermediate states of the executed circuits are cached.
+
+        The first circuit executed in the context records the state before the operations
+        with the given indices, as far as the :attr:`checkpoint_memory` budget allows.
+        Every later circuit compares its operations with the recorded ones, and resumes
+        from the last checkpoint before the first operation that differs.
+        This speeds up gradient recipes, which execute the same circuit with one
+        parameter shifted at a time.
+
+        Args:
+            positions (Sequence[int]): indices of the operations that may differ in
+                later circuits, e.g. the operations depending on free parameters
+        """
+        self._checkpoints = {}
+        self._checkpoint_ops = None
+        self._checkpoint_positions = sorted(set(positions))
+        try:
+            yield
+        finally:
+            self._checkpoints = None
+            self._checkpoint_ops = None
+            self._checkpoint_positions = None
+
+    @contextlib.contextmanager
+    def constant_blocks(self, blocks):
+        """Context in which runs of operations without free parameters are precomputed.
+
+        Within the context, each run of the executed circuit is split into segments acting on
+        at most :attr:`_constant_block_wires` wires. The unitary of each segment is computed
+        on first use and cached, so that later executions of the same circuit apply every
+        segment as a single matrix.
+
+        Args:
+            blocks (Sequence[(int, int)]): runs ``queue[start:stop]`` of operations that do
+                not depend on any parameters, see :attr:`.QNode.constant_blocks`
+        """
+        self._constant_blocks = blocks
+        try:
+            yield
+        finally:
+            self._constant_blocks = None
+
+    def _fuse_constant_blocks(self):
+        """Look up or compute the fused segments of the constant blocks of the current circuit.
+
+        Returns:
+            dict[int->(int, array, list[int])]: for the first operation of each segment, the index
+            of the operation after the segment, the unitary and the wires it acts on
+        """
+        fused = {}
+        for start, stop in self._constant_blocks:
+            # the operations of a constructed circuit are fixed, so they identify the block
+            ops = tuple(self._op_queue[start:stop])
+            if ops not in self._block_cache:
+                if len(self._block_cache) >= self._constant_block_cache_size:
+                    self._block_cache.clear()
+                self._block_cache[ops] = self._fuse_block(ops)
+
+            for a, b, U, wires in self._block_cache[ops]:
+                fused[start + a] = (start + b, U, wires)
+        return fused
+
+    def _fuse_block(self, ops):
+        """Split a run of constant operations into segments acting on a few wires, and
+        multiply the operations of each segment into a single unitary.
+
+        Args:
+            ops (Sequence[~.operation.Operation]): operations without free parameters
+
+        Returns:
+            list[(int, int, array, list[int])]: start and stop index of each segment
+            of two or more operations in ``ops``, its unitary and the wires it acts on
+        """
+        segments = []
+        k = 0
+        while k < len(ops):
+            wires = []
+            j = k
+            while j < len(ops) and self._operation_map.get(ops[j].name) is not None:
+                support = wires + [w for w in ops[j].wires if w not in wires]
+                if len(support) > self._constant_block_wires:
+                    break
+                wires = support
+                j += 1
+
+            if j - k >= 2:
+                segments.append((k, j, self._segment_unitary(ops[k:j], wires), wires))
+                k = j
+            else:
+                k += 1
+        return segments
+
+    def _segment_unitary(self, ops, wires):
+        """Unitary of a sequence of operations on a few wires.
+
+        Args:
+            ops (Sequence[~.operation.Operation]): operations, in the order they are applied
+            wires (Sequence[int]): wires of the unitary, containing the wires of every operation
+
+        Returns:
+            array: :math:`2^k\times 2^k` unitary, with the wires ordered as in ``wires``
+        """
+        m = len(wires)
+        U = np.reshape(np.eye(2**m, dtype=self.dtype), [2] * m + [2**m])
+        for op in ops:
+            k = len(op.wires)
+            A = np.reshape(self._get_operator_matrix(op.name, op.parameters), [2] * 2 * k)
+            axes = [wires.index(w) for w in op.wires]
+            U = np.moveaxis(np.tensordot(A, U, axes=(list(range(k, 2 * k)), axes)), list(range(k)), axes)
+        return np.reshape(U, (2**m, 2**m))
+
+    def _restore_checkpoint(self):
+        """Record the operations of the first circuit in :meth:`checkpoints`, or restore
+        the last checkpoint that is still valid for the current circuit."""
+        ops = [(op.name, op.wires, op.parameters) for op in self._op_queue]
+
+        if self._checkpoint_ops is None:
+            # first circuit: choose where to record checkpoints within the memory budget
+            self._checkpoint_ops = ops
+            num = int(self.checkpoint_memory * 2**20 // self._state.nbytes)
+            positions = [k for k in self._checkpoint_positions if 0 < k < len(ops)]
+            if isinstance(self._state, np.memmap) or num <= 0:
+                positions = []
+            elif num < len(positions):
+                # spread the checkpoints evenly over the circuit
+                positions = [positions[k] for k in np.unique(np.linspace(0, len(positions)-1, num).astype(int))]
+            self._checkpoint_positions = set(positions)
+            return
+
+        self._checkpoint_positions = None
+
+        # index of the first operation that differs from the recorded circuit
+        first = 0
+        for new, old in zip(ops, self._checkpoint_ops):
+            if new[0] != old[0] or list(new[1]) != list(old[1]) or len(new[2]) != len(old[2]) \
+                    or not all(np.array_equal(a, b) for a, b in zip(new[2], old[2])):
+                break
+            first += 1
+
+        valid = [k for k in self._checkpoints if k <= first]
+        if valid:
+            self._resume = max(valid)
+            self._state = self._checkpoints[self._resume].copy()
+
+    def adjoint_jacobian(self, queue, expectation, positions):
+        r"""Jacobian of the exact expectation values using the adjoint method.
+
+        After a single forward pass, the final state :math:`\ket{\psi}` and the states
+        :math:`\ket{\lambda_j} = O_j\ket{\psi}` are propagated backwards through the circuit by
+        applying the inverse of each gate. The derivative with respect to a gate parameter
+        is then :math:`2\,\mathrm{Re}\bra{\lambda_j}cG\ket{\psi}`, where :math:`cG` is the generator
+        of the gate, and all partial derivatives are obtained in one backward sweep.
+        The cost is about that of three circuit evaluations per expectation value,
+        independent of the number of parameters.
+
+        Args:
+            queue (Sequence[~.operation.Operation]): operations of the circuit
+            expectation (Sequence[~.operation.Expectation]): measured expectations
+            positions (Sequence[(int, int)]): index of the operation in ``queue`` and index of
+                the parameter within the operation, for each requested partial derivative
+
+        Returns:
+            array[float]: Jacobian of shape ``(len(expectation), len(positions))``
+        """
+        if self.shots > 0:
+            raise ValueError("The adjoint method requires exact expectation values, i.e., shots=0.")
+        self.check_validity(queue, expectation)
+
+        columns = {}
+        for col, (o_idx, p_idx) in enumerate(positions):
+            op = queue[o_idx]
+            if op.name not in self._generator_map and op.name != 'Rot':
+                raise ValueError("The adjoint method does not support the operation {}.".format(op.name))
+            columns.setdefault((o_idx, p_idx), []).append(col)
+
+        # forward pass
+        self._op_queue = queue
+        self.pre_apply()
+        for operation in queue:
+            self.apply(operation.name, operation.wires, operation.parameters)
+        self.post_apply()
+        self._op_queue = None
+        psi = np.array(self._state)
+
+        if psi.ndim > 1:
+            raise ValueError("The adjoint method does not support batched parameters.")
+
+        lams = []
+        for e in expectation:
+            if e.name == 'Tensor':
+                if len(e.parameters[0]) != len(e.wires):
+                    raise ValueError("Tensor: the number of observables must be equal to the number of wires.")
+                lam = psi
+                for name, w in zip(map(str, e.parameters[0]), e.wires):
+                    lam = self.mat_vec_product(tensor_factors[name].astype(self.dtype), lam, [w])
+            else:
+                lam = self.mat_vec_product(self._get_operator_matrix(e.name, e.parameters), psi, e.wires)
+            lams.append(lam)
+
+        # backward sweep
+        jac = np.zeros((len(expectation), len(positions)))
+        for o_idx in reversed(range(len(queue))):
+            op = queue[o_idx]
+            if op.name in ('BasisState', 'QubitStateVector'):
+                # earlier operations do not affect the state
+                break
+
+            par = op.parameters
+            if op.name == 'Rot':
+                # Rot(a, b, c) = RZ(c) RY(b) RZ(a)
+                factors = [(0, 'RZ', [par[0]]), (1, 'RY', [par[1]]), (2, 'RZ', [par[2]])]
+            else:
+                factors = [(0, op.name, par)]
+
+            for p_idx, name, p in reversed(factors):
+                if (o_idx, p_idx) in columns:
+                    c, G = self._generator_map[name]
+                    mu = c * self.mat_vec_product(np.asarray(G, dtype=self.dtype), psi, op.wires)
+                    for j, lam in enumerate(lams):
+                        jac[j, columns[(o_idx, p_idx)]] = 2 * np.real(np.vdot(lam, mu))
+
+                U = self._get_operator_matrix(name, p).conj().T
+                psi = self.mat_vec_product(U, psi, op.wires)
+                lams = [self.mat_vec_product(U, lam, op.wires) for lam in lams]
+
+        return jac
+
+    def _flush(self, wires=None):
+        """Apply the pending single-qubit gates.
+
+        Each run of two or more gates on a wire is multiplied into a single
+        :math:`2\times 2` matrix, which is then applied to the state in one sweep.
+
+        Args:
+            wires (Sequence[int], None): wires whose pending gates should be applied.
+                None means all of the wires.
+        """
+        if wires is None:
+            wires = list(self._pending)
+
+        for w in wires:
+            ops = self._pending.pop(w, [])
+
+            if len(ops) == 1:
+                # nothing to fuse, keep using the specialized kernels
+                self._apply_operation(ops[0][0], [w], ops[0][1])
+            elif ops:
+                U = self._get_operator_matrix(*ops[0])
+                for operation, par in ops[1:]:
+                    U = self._get_operator_matrix(operation, par) @ U
+                self._apply_matrix(U, [w])
+
+    def _apply_operation(self, operation, wires, par):
+        """Apply a quantum operation to the state immediately.
+
+        Args:
+            operation (str): name of the operation
+            wires (Sequence[int]): subsystems the operation is applied on
+            par (tuple): parameters for the operation
+        """
         if operation == 'QubitStateVector':
-            state = np.asarray(par[0], dtype=np.float64)
+            state = np.array(par[0], dtype=self.dtype)
             if state.ndim == 1 and state.shape[0] == 2**self.num_wires:
-                self._state = state
+                self._state = self._allocate()
+                self._state[:] = state
             else:
                 raise ValueError('State vector must be of length 2**wires.')
             return
@@ -311,37 +1036,146 @@ class DefaultQubit(Device):
 
             num = int(np.sum(np.array(par[0])*2**np.arange(n-1, -1, -1)))
 
-            self._state = np.zeros_like(self._state)
+            self._state = self._allocate()
             self._state[num] = 1.
             return
 
+        if operation in self._kernel_map:
+            # the kernels act in place on a complex state tensor
+            state, batch = self._as_tensor(self._state.astype(self.dtype, copy=False))
+            kernel = self._kernel_map[operation]
+            chunks = self._chunks(batch, wires)
+            if chunks is None:
+                kernel(state, [w + batch for w in wires])
+            else:
+                self._map(lambda c: kernel(state[c[0]], c[1]), chunks)
+            self._state = np.reshape(state, self._state.shape)
+            return
+
+        # apply unitary operations on any number of wires
         A = self._get_operator_matrix(operation, par)
+        self._apply_matrix(A, wires)
 
-        # apply unitary operations
-        if len(wires) == 1:
-            U = self.expand_one(A, wires)
-        elif len(wires) == 2:
-            U = self.expand_two(A, wires)
-        else:
-            raise ValueError('This plugin supports only one- and two-qubit gates.')
+    def _apply_matrix(self, A, wires):
+        """Apply a matrix to the state, in place if the state is out of core.
 
-        self._state = U @ self._state
+        Args:
+            A (array): :math:`2^k\times 2^k` matrix, or a batch of them
+            wires (Sequence[int]): subsystems the matrix is applied on
+        """
+        out = self._state if isinstance(self._state, np.memmap) and A.ndim == 2 else None
+        self._state = self.mat_vec_product(A, self._state, wires, out=out)
 
     def expval(self, expectation, wires, par):
-        # measurement/expectation value <psi|A|psi>
+        if expectation == 'Tensor' and len(par[0]) != len(wires):
+            raise ValueError("Tensor: the number of observables must be equal to the number of wires.")
+
+        if self.shots == 0 and expectation == 'Tensor':
+            # contract each factor with its own wire, without forming the product matrix
+            factors = [(tensor_factors[name].astype(self.dtype), w)
+                       for name, w in zip(map(str, par[0]), wires) if name != 'Identity']
+            if not factors:
+                return np.ones(self._state.shape[:-1])
+            A, w = zip(*factors)
+            return self.ev_tensor(A, w)
+
+        if self.shots > 0:
+            # estimate the ev
+            if self._samples is not None and (expectation, tuple(wires)) in self._samples:
+                return self._samples[(expectation, tuple(wires))]
+            return self.sample([(expectation, wires, par)])[0]
+
+        # exact expectation value <psi|A|psi>
         A = self._get_operator_matrix(expectation, par)
-        if self.shots == 0:
-            # exact expectation value
-            ev = self.ev(A, wires)
+        return self.ev(A, wires)
+
+    def sample(self, observables):
+        """Estimates expectation values from one shared set of measurement samples.
+
+        The state is rotated into the eigenbasis of each observable, and all
+        :attr:`shots` outcomes of the measured wires are drawn at once from a single
+        multinomial distribution. Every estimate uses the same samples, so
+        the shot noise of different observables is correlated as it would be on hardware.
+
+        Args:
+          observables (Sequence[(str, Sequence[int], list)]): name, wires and parameters
+            of each observable. The observables must act on disjoint wires.
+
+        Returns:
+          list[float, array[float]]: estimated expectation values, with a leading batch
+          axis if the state is batched
+        """
+        psi = self._state
+        out = None
+        if isinstance(psi, np.memmap):
+            # rotate a copy of the state file in place
+            psi = out = self._allocate()
+            psi[:] = self._state
+
+        measured = []
+        eigvals = []
+        for expectation, wires, par in observables:
+            a, rotations = self._diagonalize(expectation, wires, par)
+            for V, w in rotations:
+                psi = self.mat_vec_product(V, psi, w, out=out)
+            measured.extend(wires)
+            eigvals.append(a)
+
+        # marginal probabilities of the measured wires in the rotated basis
+        m = len(measured)
+        psi, batch = self._as_tensor(psi)
+        prob = 0
+        for idx, targets in self._blocks(batch, measured):
+            p = np.moveaxis(np.abs(psi[idx])**2, targets, range(batch, batch+m))
+            prob = prob + np.sum(np.reshape(p, p.shape[:batch] + (2**m, -1)), axis=-1)
+        prob = prob / np.sum(prob, axis=-1, keepdims=True)
+        if batch:
+            counts = np.array([np.random.multinomial(self.shots, p) for p in prob])
         else:
-            # estimate the ev
-            # sample Bernoulli distribution n_eval times / binomial distribution once
-            a, P = spectral_decomposition_qubit(A)
-            p0 = self.ev(P[0], wires)  # probability of measuring a[0]
-            n0 = np.random.binomial(self.shots, p0)
-            ev = (n0*a[0] +(self.shots-n0)*a[1]) / self.shots
+            counts = np.random.multinomial(self.shots, prob)
+        counts = np.reshape(counts, prob.shape[:batch] + (2,) * m)
+
+        # each observable only sees the outcomes of its own wires
+        res = []
+        start = 0
+        for a in eigvals:
+            k = int(np.log2(len(a)))
+            other = tuple(batch+i for i in range(m) if not start <= i < start+k)
+            n = np.sum(counts, axis=other)
+            n = np.reshape(n, n.shape[:batch] + (-1,))
+            res.append(n @ a / self.shots)
+            start += k
+        return res
+
+    def _diagonalize(self, expectation, wires, par):
+        """Eigenvalues of an observable and the rotations into its eigenbasis.
+
+        Tensor products are diagonalized factor by factor.
+
+        Args:
+          expectation (str): name of the observable
+          wires (Sequence[int]): subsystems the observable acts on
+          par (list): parameters of the observable
 
-        return ev
+        Returns:
+          tuple[array, list[(array, list[int])]]: eigenvalues, indexed by the computational
+          basis states of ``wires`` after the rotation, and the unitaries (with their target wires)
+          that map the eigenbasis onto the computational basis
+        """
+        if expectation == 'Tensor':
+            blocks = [(tensor_factors[name], [w]) for name, w in zip(map(str, par[0]), wires)]
+        else:
+            blocks = [(self._get_operator_matrix(expectation, par), list(wires))]
+
+        a = np.ones(1)
+        rotations = []
+        for A, w in blocks:
+            if A.shape != (2**len(w), 2**len(w)):
+                raise ValueError('{0}x{0} matrix required.'.format(2**len(w)))
+            ev, V = eigh(A)
+            a = np.kron(a, ev)
+            rotations.append((V.conj().T.astype(self.dtype), w))
+        return a, rotations
 
     def _get_operator_matrix(self, operation, par):
         """Get the operator matrix for a given operation or expectation.
@@ -350,37 +1184,285 @@ class DefaultQubit(Device):
           operation    (str): name of the operation/expectation
           par (tuple[float]): parameter values
         Returns:
-          array: matrix representation.
+          array: matrix representation, of type :attr:`dtype`
         """
         A = {**self._operation_map, **self._expectation_map}[operation]
-        if not callable(A):
+        if A is None:
+            # state preparations have no matrix representation
             return A
-        return A(*par)
+        if callable(A):
+            A = A(*par)
+        return np.asarray(A, dtype=self.dtype)
 
     def ev(self, A, wires):
-        r"""Evaluates a one-qubit expectation in the current state.
+        r"""Evaluates an expectation in the current state.
 
         Args:
-          A (array): :math:`2\times 2` Hermitian matrix corresponding to the expectation
-          wires (Sequence[int]): target subsystem
+          A (array): :math:`2^k\times 2^k` Hermitian matrix corresponding to the expectation
+          wires (Sequence[int]): target subsystems (order matters!)
 
         Returns:
-          float: expectation value :math:`\expect{A} = \bra{\psi}A\ket{\psi}`
+          float, array[float]: expectation value :math:`\expect{A} = \bra{\psi}A\ket{\psi}`,
+          one per sample if the state is batched
         """
-        if A.shape != (2, 2):
-            raise ValueError('2x2 matrix required.')
+        num_wires = len(wires)
+        if A.shape != (2**num_wires, 2**num_wires):
+            raise ValueError('{0}x{0} matrix required.'.format(2**num_wires))
 
-        A = self.expand_one(A, wires)
-        expectation = np.vdot(self._state, A @ self._state)
+        # <psi|A|psi> = Tr(A rho), where rho is the reduced state of the target wires
+        rho = self.reduced_density_matrix(wires)
+        expectation = np.sum(A * np.swapaxes(rho, -1, -2), axis=(-2, -1))
 
-        if np.abs(expectation.imag) > tolerance:
+        if np.any(np.abs(expectation.imag) > self.tolerance):
             log.warning('Nonvanishing imaginary part % in expectation value.', expectation.imag)
         return expectation.real
 
+    def ev_tensor(self, factors, wires):
+        r"""Evaluates the expectation of a tensor product of one-qubit observables.
+
+        Each factor is contracted with the axis of its own wire, so the cost is
+        :math:`\mathcal{O}(k 2^n)` for :math:`k` factors.
+
+        Args:
+          factors (Sequence[array]): :math:`2\times 2` Hermitian matrices, one per wire
+          wires (Sequence[int]): target subsystems, one per factor
+
+        Returns:
+          float, array[float]: expectation value :math:`\expect{A_1\otimes\cdots\otimes A_k}`,
+          one per sample if the state is batched
+        """
+        state, batch = self._as_tensor(self._state)
+        expectation = 0
+        for idx, targets in self._blocks(batch, wires):
+            psi = state[idx]
+            phi = psi
+            for A, t in zip(factors, targets):
+                phi = np.moveaxis(np.tensordot(A, phi, axes=([1], [t])), 0, t)
+            expectation = expectation + np.sum(psi.conj() * phi, axis=tuple(range(batch, psi.ndim)))
+
+        if np.any(np.abs(expectation.imag) > self.tolerance):
+            log.warning('Nonvanishing imaginary part % in expectation value.', expectation.imag)
+        return expectation.real
+
+    def reduced_density_matrix(self, wires):
+        r"""Reduced density matrix of the current state on the given subsystems.
+
+        The state tensor is reshaped into a :math:`2^k\times 2^{n-k}` matrix :math:`\Psi`,
+        with the rows indexed by the target wires, and :math:`\rho = \Psi\Psi^\dagger`.
+        Between :meth:`pre_expval` and :meth:`post_expval` the result is cached,
+        so that all expectations on the same wires share a single contraction.
+
+        Args:
+          wires (Sequence[int]): target subsystems (order matters!)
+
+        Returns:
+          array: :math:`2^k\times 2^k` reduced density matrix, with a leading batch
+          axis if the state is batched
+        """
+        key = tuple(wires)
+        if self._rho_cache is not None and key in self._rho_cache:
+            return self._rho_cache[key]
+
+        num_wires = len(wires)
+        state, batch = self._as_tensor(self._state)
+        rho = 0
+        for idx, targets in self._blocks(batch, wires):
+            psi = np.moveaxis(state[idx], targets, list(range(batch, batch+num_wires)))
+            psi = np.reshape(psi, psi.shape[:batch] + (2**num_wires, -1))
+            rho = rho + psi @ np.swapaxes(psi.conj(), -1, -2)
+
+        if self._rho_cache is not None:
+            self._rho_cache[key] = rho
+        return rho
+
+    def mat_vec_product(self, mat, vec, wires, out=None):
+        r"""Apply multiplication of a matrix to subsystems of the quantum state.
+
+        Instead of expanding ``mat`` into a :math:`2^n\times 2^n` operator, the state
+        vector is viewed as a rank-:math:`n` tensor with one axis per wire, and
+        the matrix is contracted with the target axes only. Applying a :math:`k`-qubit
+        matrix therefore costs :math:`\mathcal{O}(2^{n+k})` rather than :math:`\mathcal{O}(4^n)`.
+
+        Either argument may carry a leading batch axis of size :math:`B`, in which case
+        the :math:`B` products are computed in a single broadcast matrix multiplication.
+
+        Args:
+          mat (array): :math:`2^k\times 2^k` matrix to multiply, or a batch of shape
+            :math:`(B, 2^k, 2^k)`
+          vec (array): state vector of length :math:`2^n`, or a batch of shape :math:`(B, 2^n)`
+          wires (Sequence[int]): target subsystems (order matters!)
+          out (array, None): array to store the output in, may be ``vec`` itself
+
+        Returns:
+          array: output vector after applying ``mat`` to ``vec`` on the specified subsystems
+        """
+        num_wires = len(wires)
+        if mat.shape[-2:] != (2**num_wires, 2**num_wires):
+            raise ValueError('{0}x{0} matrix required.'.format(2**num_wires))
+
+        chunks = self._chunks(vec.ndim - 1, wires) if mat.ndim == 2 else None
+        if chunks is None and out is not None:
+            out[...] = self.mat_vec_product(mat, vec, wires)
+            return out
+
+        if chunks is not None:
+            # contract the matrix with each chunk of the state in parallel
+            if out is None:
+                out = np.empty(vec.shape, dtype=np.result_type(mat, vec))
+            vec, _ = self._as_tensor(vec)
+            res, _ = self._as_tensor(out)
+            mat = np.reshape(mat, [2] * num_wires * 2)
+            axes = list(range(num_wires, 2 * num_wires))
+
+            def contract(chunk):
+                """apply the matrix to one chunk"""
+                idx, targets = chunk
+                tdot = np.tensordot(mat, vec[idx], axes=(axes, targets))
+                res[idx] = np.moveaxis(tdot, list(range(num_wires)), targets)
+
+            self._map(contract, chunks)
+            return out
+
+        if mat.ndim > 2 or vec.ndim > 1:
+            # move the target axes last, and multiply each sample by its own matrix
+            vec, batch = self._as_tensor(vec)
+            targets = list(range(vec.ndim - num_wires, vec.ndim))
+            vec = np.moveaxis(vec, [w + batch for w in wires], targets)
+            shape = vec.shape[batch:]
+            vec = np.reshape(vec, vec.shape[:batch] + (-1, 2**num_wires))
+            res = vec @ np.swapaxes(mat, -1, -2)
+
+            res = np.reshape(res, res.shape[:-2] + shape)
+            batch = res.ndim - self.num_wires
+            res = np.moveaxis(res, list(range(res.ndim - num_wires, res.ndim)), [w + batch for w in wires])
+            return np.reshape(res, res.shape[:batch] + (2**self.num_wires,))
+
+        mat = np.reshape(mat, [2] * num_wires * 2)
+        vec = np.reshape(vec, [2] * self.num_wires)
+
+        # contract the input indices of the matrix with the target axes of the state
+        axes = (list(range(num_wires, 2 * num_wires)), list(wires))
+        tdot = np.tensordot(mat, vec, axes=axes)
+
+        # tensordot places the output indices of the matrix first, move them back to the targets
+        tdot = np.moveaxis(tdot, list(range(num_wires)), list(wires))
+        return np.reshape(tdot, [2**self.num_wires])
+
+    def _chunks(self, batch, wires):
+        """Split the state tensor into chunks that a gate updates independently.
+
+        The leading wires the gate does not act on are fixed to each of their
+        values in turn, giving at least :attr:`threads` chunks where possible.
+        Out-of-core states are further split into blocks that fit in memory.
+
+        Args:
+          batch (int): number of batch axes of the state tensor
+          wires (Sequence[int]): subsystems the gate acts on
+
+        Returns:
+          list[(tuple, list[int])], None: index of each chunk into the state tensor and
+          the target axes within the chunk, or None if the gate is applied serially
+        """
+        num_split = 0
+        if self.threads > 1 and self.num_wires >= self._parallel_min_wires:
+            num_split = int(np.ceil(np.log2(self.threads)))
+        if isinstance(self._state, np.memmap):
+            # only read blocks of the state file that fit in memory
+            num_split = max(num_split, self.num_wires - self._block_wires)
+
+        free = [w for w in range(self.num_wires) if w not in wires]
+        split = free[:num_split]
+        if not split:
+            return None
+
+        targets = [batch + w - sum(1 for s in split if s < w) for w in wires]
+        chunks = []
+        for values in itertools.product([0, 1], repeat=len(split)):
+            idx = [slice(None)] * (batch + self.num_wires)
+            for w, v in zip(split, values):
+                idx[batch + w] = v
+            chunks.append((tuple(idx), targets))
+        return chunks
+
+    def _blocks(self, batch, wires):
+        """Chunks of the state tensor that contain all axes of the given wires.
+
+        Reductions over the state (expectations, marginal probabilities) are
+        accumulated over these blocks, so that out-of-core states are never read
+        into memory at once.
+
+        Args:
+          batch (int): number of batch axes of the state tensor
+          wires (Sequence[int]): subsystems that must be kept in every block
+
+        Returns:
+          list[(tuple, list[int])]: index of each block into the state tensor and
+          the axes of ``wires`` within the block
+        """
+        chunks = None
+        if isinstance(self._state, np.memmap):
+            chunks = self._chunks(batch, wires)
+        # otherwise the whole state is a single block
+        return chunks or [((slice(None),) * (batch + self.num_wires), [w + batch for w in wires])]
+
+    def _map(self, fn, chunks):
+        """Call a function on every chunk using the worker threads.
+
+        Args:
+          fn (callable): function of a single chunk
+          chunks (list): chunks returned by :meth:`_chunks`
+        """
+        if self.threads <= 1:
+            for c in chunks:
+                fn(c)
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads)
+            _pooled_devices.add(self)
+        # consume the iterator so that exceptions raised by the workers propagate
+        list(self._pool.map(fn, chunks))
+
+    def __getstate__(self):
+        """State for copying and pickling the device, e.g. for the workers of :meth:`.QNode.jacobian`.
+
+        The thread pool is not copied, the copy creates its own on first use.
+        Forked child processes likewise drop the pool, see :func:`_drop_pools`.
+        """
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
+
+    def _allocate(self):
+        """Allocate a zero state vector.
+
+        Returns:
+          array: state vector of length :math:`2^n`, backed by a temporary file
+          in :attr:`memmap_dir` if it is set
+        """
+        if self.memmap_dir is None:
+            return np.zeros(2**self.num_wires, dtype=self.dtype)
+
+        # the new file is sparse, so it reads as zeros without being written
+        temp = tempfile.TemporaryFile(dir=self.memmap_dir)
+        return np.memmap(temp, dtype=self.dtype, mode='w+', shape=(2**self.num_wires,))
+
+    def _as_tensor(self, vec):
+        """View a state vector as a tensor with one axis per wire.
+
+        Args:
+          vec (array): state vector of length :math:`2^n`, or a batch of shape :math:`(B, 2^n)`
+
+        Returns:
+          tuple[array, int]: tensor of shape ``(2,)*n`` or ``(B,)+(2,)*n``, and the number of batch axes
+        """
+        return np.reshape(vec, vec.shape[:-1] + (2,) * self.num_wires), vec.ndim - 1
+
     def reset(self):
         """Reset the device"""
+        self._pending = None
         # init the state vector to |00..0>
-        self._state = np.zeros(2**self.num_wires, dtype=complex)
+        self._state = self._allocate()
         self._state[0] = 1
 
     def expand_one(self, U, wires):
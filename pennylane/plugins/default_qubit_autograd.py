@@ -0,0 +1,270 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+r"""
+Autograd qubit plugin
+=====================
+
+**Module name:** :mod:`pennylane.plugins.default_qubit_autograd`
+
+**Short name:** ``"default.autograd"``
+
+.. currentmodule:: pennylane.plugins.default_qubit_autograd
+
+A pure state qubit simulator written entirely in :mod:`autograd.numpy`.
+
+Unlike :mod:`default.qubit <pennylane.plugins.default_qubit>`, this device never
+modifies the state in place, so autograd can trace the state evolution from the gate
+parameters to the expectation values. Since it has the ``'backprop'`` capability,
+QNodes running on it are differentiated by backpropagation through the simulation,
+in a single reverse pass, instead of by evaluating shifted circuits with
+:meth:`.QNode.jacobian`. Only exact expectation values are supported.
+
+Gates and operations
+--------------------
+
+.. autosummary::
+    Rphi
+    Rotx
+    Roty
+    Rotz
+    Rot3
+
+Classes
+-------
+
+.. autosummary::
+    DefaultQubitAutograd
+
+Code details
+^^^^^^^^^^^^
+"""
+import autograd.numpy as np
+
+from pennylane import Device
+
+from .default_qubit import I, X, Y, Z, H, CNOT, SWAP, CZ, unitary, hermitian, identity, tensor_factors
+
+
+#========================================================
+#  parametrized gates
+#========================================================
+
+def Rphi(phi):
+    r"""One-qubit phase shift.
+
+    Args:
+        phi (float): phase shift angle
+
+    Returns:
+        array: unitary 2x2 phase shift matrix
+    """
+    return np.array([[1, 0], [0, np.exp(1j*phi)]])
+
+
+def Rotx(theta):
+    r"""One-qubit rotation about the x axis.
+
+    Args:
+        theta (float): rotation angle
+
+    Returns:
+        array: unitary 2x2 rotation matrix :math:`e^{-i \sigma_x \theta/2}`
+    """
+    return np.cos(theta/2) * I - 1j * np.sin(theta/2) * X
+
+
+def Roty(theta):
+    r"""One-qubit rotation about the y axis.
+
+    Args:
+        theta (float): rotation angle
+
+    Returns:
+        array: unitary 2x2 rotation matrix :math:`e^{-i \sigma_y \theta/2}`
+    """
+    return np.cos(theta/2) * I - 1j * np.sin(theta/2) * Y
+
+
+def Rotz(theta):
+    r"""One-qubit rotation about the z axis.
+
+    Args:
+        theta (float): rotation angle
+
+    Returns:
+        array: unitary 2x2 rotation matrix :math:`e^{-i \sigma_z \theta/2}`
+    """
+    return np.cos(theta/2) * I - 1j * np.sin(theta/2) * Z
+
+
+def Rot3(a, b, c):
+    r"""Arbitrary one-qubit rotation using three Euler angles.
+
+    Args:
+        a,b,c (float): rotation angles
+
+    Returns:
+        array: unitary 2x2 rotation matrix ``rz(c) @ ry(b) @ rz(a)``
+    """
+    return Rotz(c) @ Roty(b) @ Rotz(a)
+
+
+#========================================================
+#  device
+#========================================================
+
+
+class DefaultQubitAutograd(Device):
+    """Qubit simulator for PennyLane that can be differentiated by autograd.
+
+    Args:
+        wires (int): the number of modes to initialize the device in
+        shots (int): must be 0, the device only returns exact expectation values
+    """
+    name = 'Default qubit autograd PennyLane plugin'
+    short_name = 'default.autograd'
+    pennylane_requires = '0.3'
+    version = '0.3.0'
+    author = 'Xanadu Inc.'
+    _capabilities = {'backprop': True}
+
+    # Note: BasisState and QubitStateVector don't
+    # map to any particular function, as they modify
+    # the internal device state directly.
+    _operation_map = {
+        'BasisState': None,
+        'QubitStateVector': None,
+        'QubitUnitary': unitary,
+        'PauliX': X,
+        'PauliY': Y,
+        'PauliZ': Z,
+        'Hadamard': H,
+        'CNOT': CNOT,
+        'SWAP': SWAP,
+        'CZ': CZ,
+        'PhaseShift': Rphi,
+        'RX': Rotx,
+        'RY': Roty,
+        'RZ': Rotz,
+        'Rot': Rot3
+    }
+
+    _expectation_map = {
+        'PauliX': X,
+        'PauliY': Y,
+        'PauliZ': Z,
+        'Hadamard': H,
+        'Hermitian': hermitian,
+        'Tensor': None,
+        'Identity': identity
+    }
+
+    def __init__(self, wires, *, shots=0):
+        if shots != 0:
+            raise ValueError("The default.autograd plugin only computes exact expectation values, "
+                             "shots must be 0.")
+        super().__init__(wires, shots)
+        #: array: state tensor with one axis per wire
+        self._state = None
+
+    def apply(self, operation, wires, par):
+        if operation == 'QubitStateVector':
+            state = np.array(par[0], dtype=np.complex128)
+            if state.ndim != 1 or state.shape[0] != 2**self.num_wires:
+                raise ValueError('State vector must be of length 2**wires.')
+            self._state = np.reshape(state, [2] * self.num_wires)
+            return
+        elif operation == 'BasisState':
+            n = len(par[0])
+            if n > self.num_wires or not set(par[0]).issubset({0, 1}):
+                raise ValueError("BasisState parameter must be an array of 0 or 1 integers of length at most {}.".format(self.num_wires))
+            if wires is not None and wires != [] and list(wires) != list(range(self.num_wires)):
+                raise ValueError("The default.autograd plugin can apply BasisState only to all of the {} wires.".format(self.num_wires))
+
+            state = np.zeros([2] * self.num_wires, dtype=np.complex128)
+            state[tuple(par[0]) + (0,) * (self.num_wires - n)] = 1.
+            self._state = state
+            return
+
+        A = self._get_operator_matrix(operation, par)
+        self._state = self.mat_vec_product(A, self._state, wires)
+
+    def expval(self, expectation, wires, par):
+        if expectation == 'Tensor':
+            if len(par[0]) != len(wires):
+                raise ValueError("Tensor: the number of observables must be equal to the number of wires.")
+            for name in map(str, par[0]):
+                if name not in tensor_factors:
+                    raise ValueError("Tensor factor {} is not a supported single-qubit observable.".format(name))
+            factors = [(tensor_factors[name], [w]) for name, w in zip(map(str, par[0]), wires)]
+        else:
+            factors = [(self._get_operator_matrix(expectation, par), wires)]
+
+        # <psi|A|psi>, applying each factor to its own wires
+        phi = self._state
+        for A, w in factors:
+            phi = self.mat_vec_product(A, phi, w)
+        return np.real(np.sum(np.conj(self._state) * phi))
+
+    def _get_operator_matrix(self, operation, par):
+        """Get the operator matrix for a given operation or expectation.
+
+        Args:
+          operation    (str): name of the operation/expectation
+          par (tuple[float]): parameter values
+        Returns:
+          array: matrix representation
+        """
+        A = {**self._operation_map, **self._expectation_map}[operation]
+        if not callable(A):
+            return A
+        return A(*par)
+
+    def mat_vec_product(self, mat, state, wires):
+        r"""Apply multiplication of a matrix to subsystems of the quantum state.
+
+        The matrix is contracted with the target axes of the state tensor,
+        and a new state tensor is returned.
+
+        Args:
+          mat (array): :math:`2^k\times 2^k` matrix to multiply
+          state (array): state tensor with one axis per wire
+          wires (Sequence[int]): target subsystems (order matters!)
+
+        Returns:
+          array: output state tensor after applying ``mat`` on the specified subsystems
+        """
+        num_wires = len(wires)
+        if np.shape(mat) != (2**num_wires, 2**num_wires):
+            raise ValueError('{0}x{0} matrix required.'.format(2**num_wires))
+
+        mat = np.reshape(mat, [2] * num_wires * 2)
+        axes = (list(range(num_wires, 2 * num_wires)), list(wires))
+        tdot = np.tensordot(mat, state, axes=axes)
+        return np.moveaxis(tdot, list(range(num_wires)), list(wires))
+
+    def reset(self):
+        """Reset the device"""
+        # init the state vector to |00..0>
+        state = np.zeros([2] * self.num_wires, dtype=np.complex128)
+        state[(0,) * self.num_wires] = 1
+        self._state = state
+
+    @property
+    def operations(self):
+        return set(self._operation_map.keys())
+
+    @property
+    def expectations(self):
+        return set(self._expectation_map.keys())
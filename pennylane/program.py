@@ -0,0 +1,254 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Precompiled circuits
+====================
+
+**Module name:** :mod:`pennylane.program`
+
+.. currentmodule:: pennylane.program
+
+This module contains the :class:`Program` class, a flat representation of the
+operation queue of a :class:`~.QNode` that devices can execute with little
+per-operation overhead.
+
+Executing the queue of :class:`~.Operation` instances directly repeats a lot of
+work on every evaluation: the parameters of every operation are flattened, resolved,
+checked and unflattened again, its wires are checked, and the device checks that it
+supports the operation. Most of this work does not depend on the parameter values,
+so after :meth:`~.QNode.construct` the queue is lowered into a :class:`Program` once:
+
+* Every operation name is replaced by an integer op code, an index into :attr:`Program.names`.
+
+* Fixed wires are checked once, and stored as lists of integers.
+
+* The parameters of operations that do not depend on any :class:`~.Variable` are
+  checked once and stored. For the other operations, the positions of the Variables
+  in their flattened parameters are recorded.
+
+* The free parameters of all the operations are resolved together through a gather/scale
+  map: the index of each Variable into the flattened positional or keyword argument values,
+  and its multiplier. On each evaluation, one NumPy fancy-index-and-multiply per argument
+  kind replaces the lookup of :attr:`.Variable.val` for every parameter.
+
+Devices execute programs with :meth:`.Device.execute_program`.
+
+.. raw:: html
+
+    <h3>Code details</h3>
+"""
+import numbers
+
+import autograd.numpy as np
+from autograd.tracer import getval
+
+from .utils import _flatten, _unflatten
+from .variable import Variable
+
+
+class Program:
+    """Precompiled operation queue of a quantum circuit.
+
+    The operations are compiled when the program is created. If the parameters of an
+    operation are modified afterwards, :meth:`update` must be called to recompile it.
+
+    Args:
+        queue (Sequence[~.operation.Operation]): operations of the circuit, in the order they are applied
+    """
+    def __init__(self, queue):
+        self.queue = list(queue)  #: list[Operation]: compiled operations
+
+        codes = {}
+        #: array[int]: op code of each operation
+        self.opcodes = np.array([codes.setdefault(op.name, len(codes)) for op in self.queue], dtype=int)
+        #: list[str]: distinct operation names, indexed by op code
+        self.names = list(codes)
+
+        n = len(self.queue)
+        #: list[list[int], None]: wires of each operation, or None if they depend on free parameters
+        self.wires = [None] * n
+        #: list[list[int]]: positions of the Variables in the flattened parameters of each operation
+        self.gather = [None] * n
+        #: list[list]: flattened parameters of each operation
+        self._flat = [None] * n
+        #: list[list, None]: parameter values of each operation, or None if they depend on free parameters
+        self._fixed = [None] * n
+        #: list[bool]: whether the parameters of each operation are nested, and must be unflattened
+        self._nested = [False] * n
+
+        #: list[(int, int)]: operation index and flattened parameter position of each Variable
+        self.slots = []
+        #: array[int]: index of each Variable into the values of its argument
+        self.index = None
+        #: array[float]: multiplier of each Variable
+        self.scale = None
+        #: bool: whether some multipliers differ from one
+        self._scaled = False
+        #: list[int]: position of the first Variable of each operation in :attr:`slots`
+        self._offsets = None
+        #: list[str, None]: keyword argument name of each Variable, or None for positional arguments
+        self._names = None
+        #: tuple[array[int], dict[str->array[int]], array[int]]: slots of the positional
+        #: Variables, slots of the keyword Variables by name, and the permutation that restores
+        #: the order of the slots after the positional and keyword values are concatenated
+        self._groups = None
+        #: list[int]: slots of Variables of operations with natural number parameters
+        self._natural = None
+
+        for k in range(n):
+            self._compile_operation(k)
+        self._build_map()
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def free_wires(self):
+        """Whether the wires of some operations depend on free parameters.
+
+        Returns:
+            bool: True iff the wires of some operations are only known at execution
+        """
+        return any(w is None for w in self.wires)
+
+    def update(self, k):
+        """Recompile an operation, e.g. after its parameters have been replaced.
+
+        Args:
+            k (int): index of the operation in :attr:`queue`
+        """
+        num = len(self.gather[k])
+        self._compile_operation(k)
+        if len(self.gather[k]) != num:
+            self._build_map()
+            return
+
+        # the slots are unchanged, only the Variables may differ
+        names = list(self._names)
+        for j, i in enumerate(self.gather[k], self._offsets[k]):
+            var = self._flat[k][i]
+            self.index[j] = var.idx
+            self.scale[j] = var.mult
+            self._names[j] = var.name
+        self._scaled = bool(np.any(self.scale != 1))
+        if self._names != names:
+            self._group_slots()
+
+    def _compile_operation(self, k):
+        """Compile the wires and parameters of an operation.
+
+        Args:
+            k (int): index of the operation in :attr:`queue`
+        """
+        op = self.queue[k]
+        self.wires[k] = None if any(isinstance(w, Variable) for w in op._wires) else op.wires  # pylint: disable=protected-access
+
+        flat = list(_flatten(op.params))
+        self._flat[k] = flat
+        self._nested[k] = any(not isinstance(p, (numbers.Number, Variable)) for p in op.params)
+        self.gather[k] = [i for i, p in enumerate(flat) if isinstance(p, Variable)]
+        self._fixed[k] = None if self.gather[k] else op.parameters
+
+    def _build_map(self):
+        """Build the gather/scale map of the Variables of all the operations."""
+        self.slots = []
+        self._offsets = []
+        for k, positions in enumerate(self.gather):
+            self._offsets.append(len(self.slots))
+            self.slots.extend((k, i) for i in positions)
+
+        variables = [self._flat[k][i] for k, i in self.slots]
+        self.index = np.array([v.idx for v in variables], dtype=int)
+        self.scale = np.array([v.mult for v in variables], dtype=float)
+        self._names = [v.name for v in variables]
+        self._scaled = bool(np.any(self.scale != 1))
+        self._natural = [j for j, (k, _) in enumerate(self.slots) if self.queue[k].par_domain == 'N']
+        self._group_slots()
+
+    def _group_slots(self):
+        """Group the slots of the gather map by the argument their Variables refer to."""
+        positional = np.array([j for j, name in enumerate(self._names) if name is None], dtype=int)
+        keyword = {}
+        for j, name in enumerate(self._names):
+            if name is not None:
+                keyword.setdefault(name, []).append(j)
+        keyword = {name: np.array(slots, dtype=int) for name, slots in keyword.items()}
+
+        order = np.concatenate([positional] + list(keyword.values()))
+        self._groups = positional, keyword, np.argsort(order)
+
+    def values(self):
+        """Current values of the Variables of all the operations.
+
+        The values are gathered from the argument values currently stored in the
+        :class:`~.Variable` class, and multiplied by the multipliers of the Variables,
+        as in :attr:`.Variable.val`, but for all the Variables at once.
+
+        Returns:
+            array: value of each Variable in :attr:`slots`, with any batch axes of the
+            argument values trailing
+        """
+        positional, keyword, perm = self._groups
+        if not keyword:
+            vals = Variable.free_param_values[self.index]
+        else:
+            pieces = [Variable.free_param_values[self.index[positional]]] if len(positional) else []
+            for name, slots in keyword.items():
+                kw = Variable.kwarg_values[name]
+                if np.ndim(kw) == 0:
+                    kw = np.reshape(kw, (1,))
+                pieces.append(kw[self.index[slots]])
+
+            batch = [np.shape(p)[1] for p in pieces if np.ndim(p) > 1]
+            if batch:
+                # arguments without a batch axis are the same for all samples of the batch
+                pieces = [p if np.ndim(p) > 1 else np.repeat(np.reshape(p, (-1, 1)), batch[0], axis=1) for p in pieces]
+            vals = np.concatenate(pieces)[perm]
+
+        if self._scaled:
+            vals = vals * np.reshape(self.scale, (-1,) + (1,) * (np.ndim(vals) - 1))
+        return vals
+
+    def operations(self):
+        """Current names, wires and parameter values of the operations.
+
+        The Variables are resolved by :meth:`values`, and checked as in :attr:`.Operation.parameters`.
+
+        Yields:
+            tuple[str, list[int], list]: name, wires and parameters of each operation
+        """
+        vals = self.values() if self.slots else []
+        if np.iscomplexobj(getval(vals)):
+            # raises the same error as the Operation
+            for j, (k, _) in enumerate(self.slots):
+                self.queue[k].check_domain(vals[j], True)
+        for j in self._natural:
+            self.queue[self.slots[j][0]].check_domain(vals[j], True)
+        vals = list(vals)
+
+        names = self.names
+        for k, op in enumerate(self.queue):
+            wires = self.wires[k]
+            if wires is None:
+                wires = op.wires
+
+            par = self._fixed[k]
+            if par is None:
+                par = list(self._flat[k])
+                for j, i in enumerate(self.gather[k], self._offsets[k]):
+                    par[i] = vals[j]
+                if self._nested[k]:
+                    par = _unflatten(par, op.params)[0]
+
+            yield names[self.opcodes[k]], wires, par
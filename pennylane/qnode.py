@@ -113,27 +113,53 @@ QNode methods
    __call__
    evaluate
    evaluate_obs
+   evaluate_batch
+   evaluate_backprop
    jacobian
+   clear_cache
 
 QNode internal methods
 ----------------------
 
 .. autosummary::
    construct
+   _cache_key
+   _cache_lookup
+   _cache_store
+   _compile
+   _build_dag
+   _light_cone
+   _cone_program
+   _update_programs
+   _check_wires
+   _execute
+   _execute_batch
+   _evaluate_cone
    _best_method
+   _store_kwargs
    _append_op
    _op_successors
-   _pd_finite_diff
+   _pd_shifted
+   _pd_batched
+   _pd_parallel
    _pd_analytic
+   _adjoint_supported
+   _pd_adjoint
 
 .. currentmodule:: pennylane.qnode
 
 Code details
 ~~~~~~~~~~~~
 """
-from collections.abc import Sequence
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import contextlib
 import inspect
 import copy
+import itertools
+import multiprocessing
+import os
 
 import logging as log
 
@@ -142,9 +168,11 @@ import numbers
 import autograd.numpy as np
 import autograd.extend as ae
 import autograd.builtins
+from autograd.tracer import getval
 
 import pennylane.operation
 
+from .program import Program
 from .variable  import Variable
 from .utils import _flatten, unflatten
 
@@ -193,6 +221,56 @@ def _get_default_args(func):
     }
 
 
+def _constant_blocks(queue):
+    """Maximal runs of operations that do not depend on any free or keyword parameters.
+
+    Args:
+        queue (Sequence[~.operation.Operation]): operations of a circuit
+
+    Returns:
+        list[(int, int)]: runs ``queue[start:stop]`` of two or more operations
+    """
+    blocks = []
+    start = 0
+    for k, op in enumerate(list(queue) + [None]):
+        if op is not None and not any(isinstance(p, Variable) for p in list(_flatten(op.params)) + list(op._wires)):  # pylint: disable=protected-access
+            continue
+        if k - start >= 2:
+            blocks.append((start, k))
+        start = k + 1
+    return blocks
+
+
+_worker_node = None  #: QNode: copy of the QNode held by a worker process of :meth:`QNode.jacobian`
+
+
+def _init_worker(node):
+    """Store the copy of the QNode used by a worker process of :meth:`QNode.jacobian`.
+
+    Args:
+        node (QNode): copy of the QNode, with its own device
+    """
+    global _worker_node  # pylint: disable=global-statement
+    _worker_node = node
+
+
+def _pd_worker(node, task):
+    """Compute the partial derivatives assigned to a worker of :meth:`QNode.jacobian`.
+
+    Args:
+        node (QNode, None): copy of the QNode, with its own device, or None
+            to use the one stored by :func:`_init_worker`
+        task (tuple): arguments of :meth:`QNode._pd_shifted`, and a dict of keyword arguments
+
+    Returns:
+        array[float]: partial derivatives, with shape ``(n_out, len(which))``
+    """
+    *args, kwargs = task
+    if node is None:
+        node = _worker_node
+    return node._pd_shifted(*args, **kwargs)  # pylint: disable=protected-access
+
+
 class QNode:
     """Quantum node in the hybrid computational graph.
 
@@ -200,16 +278,24 @@ class QNode:
         func (callable): a Python function containing :class:`~.operation.Operation`
             constructor calls, returning a tuple of :class:`~.operation.Expectation` instances.
         device (:class:`~pennylane._device.Device`): device to execute the function on
+        cache_size (int): maximum number of outputs and Jacobians remembered by the QNode, see :meth:`_cache_lookup`.
+            0, the default, disables the cache.
     """
     # pylint: disable=too-many-instance-attributes
     _current_context = None  #: QNode: for building Operation sequences by executing quantum circuit functions
 
-    def __init__(self, func, device):
+    def __init__(self, func, device, cache_size=0):
         self.func = func
         self.device = device
         self.num_wires = device.num_wires
         self.ops = []
 
+        self.cache_size = cache_size  #: int: maximum number of entries in the cache of outputs and Jacobians
+        #: OrderedDict[tuple->array[float], float]: cached outputs and Jacobians, least recently used first
+        self._cache = OrderedDict()
+        #: Device: device that computed the cached values
+        self._cache_device = device
+
         self.variable_ops = {}
         """ dict[int->list[(int, int)]]: Mapping from free parameter index to the list of
         :class:`Operations <pennylane.operation.Operation>` (in this circuit) that depend on it.
@@ -218,6 +304,12 @@ class QNode:
         the second the index of the parameter within the Operation.
         """
 
+        self.constant_blocks = []
+        """ list[(int, int)]: Runs ``queue[start:stop]`` of two or more consecutive
+        operations that do not depend on any free or keyword parameters. Devices may
+        precompute each run once, see :meth:`_execute`.
+        """
+
     def __str__(self):
         """String representation"""
         detail = "<QNode: device='{}', func={}, wires={}, interface=NumPy/Autograd>"
@@ -227,6 +319,98 @@ class QNode:
         """REPL representation"""
         return self.__str__()
 
+    def _cache_key(self, kind, params, kwargs, *options):
+        """Key of a value in the cache of outputs and Jacobians.
+
+        Only called if the cache is enabled, i.e. :attr:`cache_size` is positive.
+
+        Args:
+            kind (str): kind of the cached value, e.g. ``'evaluate'``
+            params (nested Sequence[Number], Number): free parameter values
+            kwargs (dict): keyword argument values
+            options (tuple): other arguments the value depends on
+
+        Returns:
+            tuple, None: key, or None if the arguments are not all numeric and cannot be cached
+        """
+        values = [np.array(list(_flatten(params)))]
+        names = sorted(kwargs)
+        values.extend(np.array(list(_flatten(kwargs[k]))) for k in names)
+        if any(v.dtype.kind not in 'biufc' for v in values if v.size):
+            return None
+        return (kind, tuple(names), tuple(v.tobytes() for v in values)) + options
+
+    def _cache_lookup(self, key):
+        """Look up a value in the cache of outputs and Jacobians.
+
+        The QNode remembers the outputs of :meth:`evaluate` and the Jacobians of :meth:`jacobian`
+        at the last :attr:`cache_size` distinct points of the parameter space, so that repeated
+        evaluations at the same point, e.g. by an optimizer step followed by the evaluation of
+        the cost, do not execute the circuit again. Only exact expectation values, computed with
+        ``shots=0``, are cached. Replacing the :attr:`device` of the QNode clears the cache.
+
+        .. note::
+
+            Since a cached value is returned without executing the circuit, the state of the
+            device afterwards still belongs to the last circuit that was executed, which
+            may have had different parameter values. The cache is therefore disabled by default,
+            and should only be enabled if the device state is not inspected after evaluations.
+
+        Args:
+            key (tuple, None): key returned by :meth:`_cache_key`
+
+        Returns:
+            array[float], float, None: cached value, or None if there is none
+        """
+        if self.device is not self._cache_device:
+            # the cached values were computed by another device
+            self.clear_cache()
+            self._cache_device = self.device
+
+        if key is None or self.device.shots != 0 or key not in self._cache:
+            return None
+        self._cache.move_to_end(key)
+        value = self._cache[key]
+        return value.copy() if isinstance(value, np.ndarray) else value
+
+    def _cache_store(self, key, value):
+        """Store a value in the cache of outputs and Jacobians, see :meth:`_cache_lookup`.
+
+        The least recently used entry is evicted if the cache is full.
+
+        Args:
+            key (tuple, None): key returned by :meth:`_cache_key`
+            value (array[float], float): value to store
+        """
+        if key is None or self.device.shots != 0:
+            return
+        self._cache[key] = value.copy() if isinstance(value, np.ndarray) else value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Forget all the cached outputs and Jacobians of the QNode."""
+        self._cache.clear()
+
+    def _store_kwargs(self, kwargs, batch=False):
+        """Temporarily store the keyword argument values in the Variable class.
+
+        The keyword arguments that are not given take their default values.
+
+        Args:
+            kwargs (dict): keyword argument values
+            batch (bool): whether the values carry a leading batch axis, see :meth:`evaluate_batch`
+        """
+        keyword_values = {}
+        keyword_values.update({k: np.array(list(_flatten(v))) for k, v in self.keyword_defaults.items()})
+        if batch:
+            # one row per flattened value, one column per batch sample
+            keyword_values.update({k: np.array([list(_flatten(x)) for x in v]).T for k, v in kwargs.items()})
+        else:
+            keyword_values.update({k: np.array(list(_flatten(v))) for k, v in kwargs.items()})
+        Variable.kwarg_values = keyword_values
+
     def _append_op(self, op):
         """Appends a quantum operation into the circuit queue.
 
@@ -335,6 +519,14 @@ class QNode:
             raise QuantumFunctionError("Continuous and discrete operations are not "
                                        "allowed in the same quantum circuit.")
 
+        #: bool: whether the wires of some operations or expectations depend on the parameters
+        self.free_wires = any(isinstance(w, Variable) for op in self.ops for w in op._wires)  # pylint: disable=protected-access
+        if not self.free_wires:
+            self._check_wires()
+
+        # find which expectation values each operation can influence
+        self._build_dag()
+
         #----------------------------------------------------------
 
         # map each free variable to the operations which depend on it
@@ -348,6 +540,127 @@ class QNode:
         #: dict[int->str]: map from free parameter index to the gradient method to be used with that parameter
         self.grad_method_for_par = {k: self._best_method(k) for k in self.variable_ops}
 
+        #: dict[int->list[int]]: indices of the returned expectation values that may depend on each
+        #: free parameter, the other entries of the Jacobian are structurally zero
+        self.ev_dependence = {k: sorted(set().union(*(self._influence[o_idx] for o_idx, _ in ops)))
+                              for k, ops in self.variable_ops.items()}
+
+        # find the maximal runs of operations without free or keyword parameters
+        self.constant_blocks = _constant_blocks(self.queue)
+
+        #: Program: precompiled operation queue, compiled by :meth:`_compile` on first execution
+        self.program = None
+        #: Device: device the circuit was checked against by :meth:`_compile`
+        self._program_device = None
+        #: dict[tuple[int]->(list[int], Program, list[(int, int)])]: for subsets of the expectation
+        #: values, the indices of the operations in their light cone, its program and its constant blocks
+        self._cones = {}
+        #: list[int]: indices of the returned expectation values
+        self._all_rows = list(range(len(self.ev)))
+
+    def _compile(self):
+        """Lower the constructed circuit into a :class:`~.program.Program` for the device.
+
+        The operations are checked against the device once here, rather than on every evaluation.
+        Replacing the :attr:`device` of the QNode discards the compiled programs, and the
+        circuit is checked against the new device on the next execution.
+        """
+        if self.program is not None and self.device is self._program_device:
+            return
+
+        if self._program_device is not None:
+            # the device was replaced
+            self.num_wires = self.device.num_wires
+            if not self.free_wires:
+                self._check_wires()
+            self._cones = {}
+
+        self.device.check_validity(self.queue, self.ev)
+        self.program = Program(self.queue)
+        self._program_device = self.device
+
+    def _build_dag(self):
+        """Build the wire-dependency DAG of the circuit.
+
+        Every operation depends on the last preceding operation acting on each of its wires.
+        Operations without wires, e.g. :class:`~.BasisState` or :class:`~.QubitStateVector` preparing
+        the whole register, act on all the wires.
+        A backward sweep through the DAG then finds the expectation values each operation
+        can influence. If the wires of some operations depend on the parameters, the DAG is
+        unknown, and every operation is assumed to influence every expectation value.
+        """
+        n = len(self.queue)
+        #: list[set[int]]: for every operation in :attr:`ops`, the indices of the operations it
+        #: directly depends on, or None if the wires depend on the parameters
+        self.dag = None
+        #: list[set[int]]: for every operation in :attr:`ops`, the indices of the expectation values
+        #: in :attr:`ev` it can influence
+        self._influence = [set(range(len(self.ev))) for _ in self.queue] + [{e} for e in range(len(self.ev))]
+        if self.free_wires:
+            return
+
+        self.dag = []
+        last = {}  # last operation on each wire
+        barrier = None  # last operation without wires, e.g. a preparation of the whole register
+        for k, op in enumerate(self.ops):
+            wires = op.wires
+            if not wires:
+                # the operation acts on all the wires
+                self.dag.append(set(last.values()) | ({barrier} if barrier is not None else set()))
+                barrier = k
+                last = {}
+                continue
+            self.dag.append({last[w] if w in last else barrier for w in wires} - {None})
+            for w in wires:
+                last[w] = k
+
+        self._influence[:n] = [set() for _ in range(n)]
+        for k in reversed(range(len(self.ops))):
+            for j in self.dag[k]:
+                self._influence[j] |= self._influence[k]
+
+    def _light_cone(self, rows):
+        """Operations that can influence some of the expectation values.
+
+        Args:
+            rows (Sequence[int]): indices of the expectation values in :attr:`ev`
+
+        Returns:
+            list[int]: indices of the operations in :attr:`queue`, in order
+        """
+        return [k for k in range(len(self.queue)) if self._influence[k].intersection(rows)]
+
+    def _cone_program(self, rows):
+        """Program of the operations in the light cone of some of the expectation values.
+
+        Args:
+            rows (Sequence[int]): indices of the expectation values in :attr:`ev`
+
+        Returns:
+            tuple[list[int], Program, list[(int, int)]]: indices of the operations in :attr:`queue`
+            that can influence the expectation values, their program and its constant blocks
+        """
+        key = tuple(rows)
+        if key not in self._cones:
+            cone = self._light_cone(rows)
+            queue = [self.queue[k] for k in cone]
+            self._cones[key] = (cone, Program(queue), _constant_blocks(queue))
+        return self._cones[key]
+
+    def _update_programs(self, o_idx):
+        """Recompile an operation in the compiled programs, after its parameters have been replaced.
+
+        Args:
+            o_idx (int): index of the operation in :attr:`ops`
+        """
+        if o_idx >= len(self.queue):
+            return
+        if self.program is not None:
+            self.program.update(o_idx)
+        for cone, program, _ in self._cones.values():
+            if o_idx in cone:
+                program.update(cone.index(o_idx))
+
     def _op_successors(self, o_idx, only='G'):
         """Successors of the given operation in the quantum circuit.
 
@@ -362,17 +675,16 @@ class QNode:
         Returns:
             list[Operation]: successors in a topological order
         """
-        succ = self.ops[o_idx+1:]
-        # TODO at some point we may wish to upgrade to a DAG description of the circuit instead
-        # of a simple queue, in which case,
-        #
-        #   succ = nx.dag.topological_sort(self.DAG.subgraph(nx.dag.descendants(self.DAG, op)).copy())
-        #
-        # or maybe just
-        #
-        #   succ = nx.dfs_preorder_nodes(self.DAG, op)
-        #
-        # if it is in a topological order? the docs aren't clear.
+        if self.dag is None:
+            succ = self.ops[o_idx+1:]
+        else:
+            # descendants of the operation in the DAG, in the order of the queue
+            reach = {o_idx}
+            for k in range(o_idx+1, len(self.ops)):
+                if self.dag[k] & reach:
+                    reach.add(k)
+            succ = [self.ops[k] for k in sorted(reach - {o_idx})]
+
         if only == 'E':
             return list(filter(lambda x: isinstance(x, pennylane.operation.Expectation), succ))
         elif only == 'G':
@@ -388,29 +700,14 @@ class QNode:
         Note that If even one gate does not support differentiation, we cannot differentiate
         with respect to this parameter at all.
 
+        For CV gates, only the successors of the gate in the circuit DAG, see :meth:`_build_dag`,
+        are taken into account.
+
         Args:
             idx (int): free parameter index
         Returns:
             str: gradient method to be used
         """
-        # TODO: For CV circuits, when the circuit DAG is implemented, determining which gradient
-        # method to use for should work like this:
-        #
-        # 1. To check whether we can use the 'A' or 'A2' method, we need first to check for the
-        #    presence of non-Gaussian ops and order-2 observables.
-        #
-        # 2. Starting from the expectation values (all leaf nodes under current limitations on
-        #    observables, see :ref:`measurements`), walk through the DAG against the edges
-        #    (upstream) in arbitrary order.
-        #
-        # 3. If the starting leaf is an order-2 EV, mark every Gaussian operation you hit with
-        #    op.grad_method='A2' (instance variable, does not mess up the class variable!).
-        #
-        # 4. If you hit a non-Gaussian gate (grad_method != 'A'), from that gate upstream mark every
-        #    gaussian operation with op.grad_method='F'.
-        #
-        # 5. Then run the standard discrete-case algorithm for determining the best gradient method
-        # for every free parameter.
         def best_for_op(o_idx):
             "Returns the best gradient method for the operation op."
             op = self.ops[o_idx]
@@ -421,9 +718,8 @@ class QNode:
             # for CV ops it is more complicated
             if op.grad_method == 'A':
                 # op is Gaussian and has the heisenberg_* methods
-                # check that all successor ops are also Gaussian
-                # TODO when we upgrade to a DAG: a non-Gaussian successor is OK if it
-                # isn't succeeded by any observables?
+                # check that all successor ops in the DAG are also Gaussian, non-Gaussian
+                # ops outside the light cone of the observables are not descendants
                 successors = self._op_successors(o_idx, 'G')
 
                 if all(x.supports_heisenberg for x in successors):
@@ -451,8 +747,12 @@ class QNode:
         return 'F'
 
     def __call__(self, *args, **kwargs):
-        """Wrapper for :meth:`~.QNode.evaluate`."""
+        """Wrapper for :meth:`~.QNode.evaluate`, or :meth:`~.QNode.evaluate_backprop`
+        if the device supports backpropagation."""
         # pylint: disable=no-member
+        if self.device.capabilities().get('backprop', False):
+            return self.evaluate_backprop(args, **kwargs)
+
         args = autograd.builtins.tuple(args)  # prevents autograd boxed arguments from going through to evaluate
         return self.evaluate(args, **kwargs)  # args as one tuple
 
@@ -460,6 +760,10 @@ class QNode:
     def evaluate(self, args, **kwargs):
         """Evaluates the quantum function on the specified device.
 
+        Only the operations in the light cone of the returned expectation values are executed,
+        see :meth:`_light_cone`. The other operations cannot change the expectation values,
+        but the state of the device afterwards does not include them.
+
         Args:
             args (tuple): input parameters to the quantum function
 
@@ -470,10 +774,15 @@ class QNode:
             # construct the circuit
             self.construct(args, **kwargs)
 
+        key = None
+        if self.cache_size > 0:
+            key = self._cache_key('evaluate', args, kwargs)
+            ret = self._cache_lookup(key)
+            if ret is not None:
+                return ret
+
         # temporarily store keyword arguments
-        keyword_values = {}
-        keyword_values.update({k: np.array(list(_flatten(v))) for k, v in self.keyword_defaults.items()})
-        keyword_values.update({k: np.array(list(_flatten(v))) for k, v in kwargs.items()})
+        self._store_kwargs(kwargs)
 
         # Try and insert kwargs-as-positional back into the kwargs dictionary.
         # NOTE: this works, but the creation of new, temporary arguments
@@ -489,10 +798,82 @@ class QNode:
 
         # temporarily store the free parameter values in the Variable class
         Variable.free_param_values = np.array(list(_flatten(args)))
-        Variable.kwarg_values = keyword_values
 
         self.device.reset()
+        if self.free_wires:
+            self._check_wires()
+
+        ret = self.output_type(self._execute(self.ev, self._all_rows))
+        self._cache_store(key, ret)
+        return ret
+
+    def evaluate_backprop(self, args, **kwargs):
+        """Evaluates the quantum function on a device that autograd can differentiate.
+
+        Unlike :meth:`evaluate`, this is not an autograd primitive. The parameter values
+        remain traced by autograd on their way through the device, which must have the
+        ``'backprop'`` capability, so the QNode is differentiated by backpropagation
+        through the simulation rather than by :meth:`jacobian`.
 
+        Args:
+            args (tuple): input parameters to the quantum function
+
+        Returns:
+            float, array[float]: output expectation value(s)
+        """
+        if not self.ops:
+            # construct the circuit
+            self.construct(_untraced(args), **kwargs)
+
+        # temporarily store keyword arguments
+        self._store_kwargs(kwargs)
+
+        # temporarily store the free parameter values in the Variable class
+        Variable.free_param_values = _flatten_traced(args)
+
+        self.device.reset()
+        if self.free_wires:
+            self._check_wires()
+
+        ret = self._execute(self.ev, self._all_rows)
+        if self.output_type is float:
+            return ret[0]
+        return ret
+
+    def _execute(self, obs, rows=None):
+        """Execute the circuit on the device, and measure the given observables.
+
+        The device executes the precompiled :attr:`program` of the circuit, or only the
+        operations in the light cone of the measured expectation values. Devices with the
+        ``'constant_blocks'`` capability are told which runs of operations in the queue do
+        not depend on any parameters, within their ``constant_blocks`` context, so that they
+        can precompute each run once.
+
+        Args:
+            obs  (Iterable[Expectation]): observables to measure
+            rows (Sequence[int], None): if given, ``obs`` are the expectation values in :attr:`ev`
+                with these indices, and only the operations that can influence them are executed
+
+        Returns:
+            array[float]: expectation values
+        """
+        self._compile()
+
+        program, blocks = self.program, self.constant_blocks
+        if rows is not None:
+            _, program, blocks = self._cone_program(rows)
+
+        with contextlib.ExitStack() as stack:
+            if blocks and self.device.capabilities().get('constant_blocks', False):
+                stack.enter_context(self.device.constant_blocks(blocks))
+            return self.device.execute_program(program, obs)
+
+    def _check_wires(self):
+        """Check the wires referenced by the circuit for the current parameter values.
+
+        Raises:
+            QuantumFunctionError: a wire is measured more than once, or does not exist on the device
+        """
         # check that no wires are measured more than once
         m_wires = list(w for ex in self.ev for w in ex.wires)
         if len(m_wires) != len(set(m_wires)):
@@ -501,16 +882,59 @@ class QNode:
         def check_op(op):
             """Make sure only existing wires are referenced."""
             for w in op.wires:
-                if w < 0 or w >= self.num_wires:
+                if w < 0 or w >= self.device.num_wires:
                     raise QuantumFunctionError("Operation {} applied to invalid wire {} "
-                                               "on device with {} wires.".format(op.name, w, self.num_wires))
+                                               "on device with {} wires.".format(op.name, w, self.device.num_wires))
 
         # check every gate/preparation and ev measurement
         for op in self.ops:
             check_op(op)
 
-        ret = self.device.execute(self.queue, self.ev)
-        return self.output_type(ret)
+    def evaluate_batch(self, args, **kwargs):
+        """Evaluates the quantum function for a batch of input parameters.
+
+        Every positional and keyword argument carries a leading batch axis of size :math:`B`;
+        sample ``b`` of the batch evaluates the circuit at ``args[i][b]`` and ``kwargs[key][b]``.
+        If the device has the ``'batched'`` capability, it receives one array of :math:`B`
+        values per free gate parameter and simulates all samples in one sweep.
+        Otherwise the samples are evaluated one after another.
+
+        Only real scalar gate parameters may vary across the batch. Batched evaluation is
+        not differentiable.
+
+        Args:
+            args (tuple): input parameters to the quantum function, each with a leading batch axis
+
+        Returns:
+            array[float]: output expectation value(s), with a leading batch axis
+        """
+        args = tuple(args)
+        batch_size = len(args[0]) if args else len(next(iter(kwargs.values())))
+        samples = [tuple(a[b] for a in args) for b in range(batch_size)]
+        sample_kwargs = [{k: v[b] for k, v in kwargs.items()} for b in range(batch_size)]
+
+        if not self.device.capabilities().get('batched', False):
+            return np.array([self.evaluate(x, **kw) for x, kw in zip(samples, sample_kwargs)])
+
+        if not self.ops:
+            # construct the circuit
+            self.construct(samples[0], **sample_kwargs[0])
+
+        # one row per free parameter, one column per batch sample
+        self._store_kwargs(kwargs, batch=True)
+        Variable.free_param_values = np.array([list(_flatten(x)) for x in samples]).T
+
+        self.device.reset()
+        if self.free_wires:
+            self._check_wires()
+
+        ret = self._execute(self.ev, self._all_rows)
+        # expectations that do not depend on the batched parameters are broadcast
+        ret = np.broadcast_to(ret.T, (batch_size, len(self.ev)))
+
+        if self.output_type is float:
+            return ret[:, 0]
+        return ret
 
     def evaluate_obs(self, obs, args, **kwargs):
         """Evaluate the expectation values of the given observables.
@@ -525,19 +949,68 @@ class QNode:
             array[float]: expectation values
         """
         # temporarily store keyword arguments
-        keyword_values = {}
-        keyword_values.update({k: np.array(list(_flatten(v))) for k, v in self.keyword_defaults.items()})
-        keyword_values.update({k: np.array(list(_flatten(v))) for k, v in kwargs.items()})
+        self._store_kwargs(kwargs)
 
         # temporarily store the free parameter values in the Variable class
         Variable.free_param_values = args
-        Variable.kwarg_values = keyword_values
 
         self.device.reset()
-        ret = self.device.execute(self.queue, obs)
+        ret = self._execute(obs)
+        return ret
+
+    def _execute_batch(self, args, rows, **kwargs):
+        """Evaluate some of the returned expectation values for several free parameter vectors.
+
+        Only the operations in the light cone of the expectation values are executed,
+        and the device receives all the circuits in one call to :meth:`.Device.batch_execute`.
+        Assumes :meth:`construct` has already been called.
+
+        Args:
+            args (Sequence[array[float]]): circuit input parameters of each circuit
+            rows (Sequence[int]): indices of the expectation values in :attr:`ev` to evaluate
+
+        Returns:
+            list[array[float]]: expectation values of each circuit
+        """
+        # temporarily store keyword arguments
+        self._store_kwargs(kwargs)
+
+        self._compile()
+        _, program, blocks = self._cone_program(rows)
+        obs = [self.ev[r] for r in rows]
+
+        with contextlib.ExitStack() as stack:
+            if blocks and self.device.capabilities().get('constant_blocks', False):
+                stack.enter_context(self.device.constant_blocks(blocks))
+            return self.device.batch_execute([(program, obs)] * len(args), args)
+
+    def _evaluate_cone(self, args, rows, **kwargs):
+        """Evaluate some of the returned expectation values, executing only their light cone.
+
+        Assumes :meth:`construct` has already been called.
+
+        Args:
+            args (array[float]): circuit input parameters
+            rows (Sequence[int]): indices of the expectation values in :attr:`ev` to evaluate
+
+        Returns:
+            array[float]: output expectation value(s), zero for the ones not evaluated
+        """
+        if len(rows) == len(self.ev):
+            return np.asarray(self.evaluate(args, **kwargs))
+
+        # temporarily store keyword arguments
+        self._store_kwargs(kwargs)
+
+        # temporarily store the free parameter values in the Variable class
+        Variable.free_param_values = args
+
+        self.device.reset()
+        ret = np.zeros(self.output_dim)
+        ret[list(rows)] = self._execute([self.ev[r] for r in rows], rows)
         return ret
 
-    def jacobian(self, params, which=None, *, method='B', h=1e-7, order=1, **kwargs):
+    def jacobian(self, params, which=None, *, method='B', h=1e-7, order=1, parallel=None, workers=None, **kwargs):
         """Compute the Jacobian of the QNode.
 
         Returns the Jacobian of the parametrized quantum circuit encapsulated in the QNode.
@@ -555,14 +1028,28 @@ class QNode:
 
           The circuit is evaluated twice for each incidence of each parameter in the circuit.
 
-        * Best known method for each parameter (``'B'``): uses the analytic method if
-          possible, otherwise finite difference.
+        * Adjoint method (``'adjoint'``). Available on simulators with the ``'adjoint'``
+          capability that return exact expectation values, for the same gates as the analytic
+          method. The circuit is evaluated once, and the states are then propagated backwards
+          through the inverse gates, giving all partial derivatives at about the cost of three
+          circuit evaluations.
+
+        * Best known method for each parameter (``'B'``): uses the adjoint method if the device
+          supports it, otherwise the analytic method if possible, otherwise finite difference.
 
         .. note::
            The finite difference method is sensitive to statistical noise in the circuit output,
            since it compares the output at two points infinitesimally close to each other. Hence the
            'F' method requires exact expectation values, i.e., `shots=0`.
 
+        The partial derivatives computed from shifted circuits, i.e. by the analytic and finite
+        difference methods, can be distributed over a pool of workers with the ``parallel`` option.
+        Every worker is given a copy of the QNode with its own copy of the device, and computes the
+        partial derivatives with respect to its share of the parameters. ``'processes'`` scales with
+        the number of cores, but starting the worker processes takes some time, so it pays off for
+        circuits with many parameters. ``'threads'`` avoids that overhead, but only runs in parallel
+        while the device releases the GIL, e.g. in NumPy operations on large states.
+
         Args:
             params (nested Sequence[Number], Number): point in parameter space at which
                 to evaluate the gradient
@@ -575,6 +1062,9 @@ class QNode:
         Keyword Args:
             h (float): finite difference method step size
             order (int): finite difference method order, 1 or 2
+            parallel (str, None): evaluate the shifted circuits in a pool of ``'threads'`` or
+                ``'processes'``, or serially if None (the default)
+            workers (int, None): number of workers of the pool, by default the number of CPUs
             shots (int): How many times the circuit should be evaluated (or sampled) to estimate
                 the expectation values. For simulator backends, 0 yields the exact result.
 
@@ -619,67 +1109,294 @@ class QNode:
                     raise ValueError("The analytic gradient method cannot be "
                                      "used with the parameter(s) {}.".format(bad))
             method = {k: method for k in which}
+        elif method == 'adjoint':
+            if not self._adjoint_supported():
+                raise ValueError("The adjoint method requires a device with the 'adjoint' "
+                                 "capability and shots=0.")
+            bad = check_method('F')
+            if bad:
+                raise ValueError("The adjoint gradient method cannot be "
+                                 "used with the parameter(s) {}.".format(bad))
+            method = {k: method for k in which}
         elif method == 'B':
             method = self.grad_method_for_par
+            if self._adjoint_supported():
+                method = {k: 'adjoint' if m == 'A' else m for k, m in method.items()}
         else:
             raise ValueError('Unknown gradient method.')
 
-        if 'F' in method.values():
-            if order == 1:
-                # the value of the circuit at params, computed only once here
-                y0 = np.asarray(self.evaluate(flat_params, **kwargs))
+        if parallel not in (None, 'threads', 'processes'):
+            raise ValueError("Unknown parallel execution mode '{}'.".format(parallel))
+
+        which = list(which)
+        key = None
+        if self.cache_size > 0:
+            key = self._cache_key('jacobian', flat_params, kwargs, tuple(which), str(sorted(method.items())), h, order)
+            grad = self._cache_lookup(key)
+            if grad is not None:
+                return grad
+
+        grad = np.zeros((self.output_dim, len(which)), dtype=float)
+
+        # all the adjoint partial derivatives are computed in a single backward sweep
+        adjoint = [k for k in which if self.ev_dependence.get(k) and method[k] == 'adjoint']
+        if adjoint:
+            for k, col in zip(adjoint, self._pd_adjoint(flat_params, adjoint, **kwargs).T):
+                grad[:, which.index(k)] = col
+
+        # the other partial derivatives are computed from shifted circuits,
+        # unused parameters and parameters no expectation value depends on have zero derivatives
+        shifted = [k for k in which if self.ev_dependence.get(k) and method[k] != 'adjoint']
+        if shifted:
+            if parallel is None:
+                cols = self._pd_shifted(flat_params, shifted, method, h, order, **kwargs)
             else:
-                y0 = None
+                cols = self._pd_parallel(flat_params, shifted, method, h, order, parallel, workers, **kwargs)
+            for k, col in zip(shifted, cols.T):
+                grad[:, which.index(k)] = col
+
+        self._cache_store(key, grad)
+        return grad
+
+    def _pd_shifted(self, params, which, method, h=1e-7, order=1, **kwargs):
+        """Partial derivatives of the node using shifted circuits.
+
+        Args:
+            params (array[float]): point in free parameter space at which
+                to evaluate the partial derivatives
+            which (Sequence[int]): return the partial derivatives with respect to these
+                free parameters
+            method (dict[int->str]): gradient method of each free parameter, ``'A'`` or ``'F'``
+            h (float): finite difference method step size
+            order (int): finite difference method order, 1 or 2
 
-        # compute the partial derivative w.r.t. each parameter using the proper method
+        Returns:
+            array[float]: partial derivatives, with shape ``(n_out, len(which))``
+        """
+        # the first-order analytic and the finite difference partial derivatives
+        # are computed together from a batch of shifted circuits, the second-order
+        # analytic ones from transformed observables
+        order2 = kwargs.get('force_order2', False)
+        batched = [k for k in which if method[k] == 'F' or method[k] == 'A' and not order2
+                   and all(self.ops[o_idx].grad_method != 'A2' for o_idx, _ in self.variable_ops[k])]
+
+        y0 = None
+        with contextlib.ExitStack() as stack:
+            # the unshifted circuit executes the light cone of all the expectation values
+            cone, program, _ = self._cone_program(self._all_rows)
+            if self.device.capabilities().get('checkpoints', False) and \
+                    (len(batched) < len(which) or self.device.batch_size(program, self.ev) < 2):
+                # the shifted circuits only differ from the unshifted one in the operations
+                # depending on the differentiated parameters, the device may cache the states before them,
+                # unless the shifted circuits are executed together in batches
+                cone = {o_idx: i for i, o_idx in enumerate(cone)}
+                positions = [cone[o_idx] for k in which for o_idx, _ in self.variable_ops.get(k, []) if o_idx in cone]
+                stack.enter_context(self.device.checkpoints(positions))
+                # the unshifted circuit records the checkpoints
+                y0 = np.asarray(self.evaluate(params, **kwargs))
+
+            if any(method[k] == 'F' for k in which) and order == 1 and y0 is None:
+                # the value of the circuit at params, computed only once here
+                y0 = np.asarray(self.evaluate(params, **kwargs))
+
+            grad = np.zeros((self.output_dim, len(which)), dtype=float)
+            if batched:
+                cols = [which.index(k) for k in batched]
+                grad[:, cols] = self._pd_batched(params, batched, method, h, order, y0, **kwargs)
+
+            for i, k in enumerate(which):
+                if k in batched:
+                    continue
+                if method[k] == 'A':
+                    grad[:, i] = self._pd_analytic(params, k, **kwargs)
+                else:
+                    raise ValueError('Unknown gradient method.')
+
+        return grad
+
+    def _pd_batched(self, params, which, method, h=1e-7, order=1, y0=None, **kwargs):
+        """Partial derivatives of the node, from a batch of shifted circuits.
+
+        The first-order analytic and the finite difference partial derivatives are linear
+        combinations of the expectation values of the circuit at shifted parameter values.
+        The shifted parameter vectors of all the requested parameters are generated first.
+        The circuits that measure the same expectation values are executed together, by a
+        single call to :meth:`.Device.batch_execute` on the light cone of these expectation
+        values, and their results are then combined with the multipliers of the gradient recipes.
+
+        Every differentiated occurrence of a free parameter in a gate is temporarily replaced by
+        a Variable of its own, so that all the shifted circuits execute the same operations.
+
+        Args:
+            params (array[float]): point in free parameter space at which
+                to evaluate the partial derivatives
+            which (Sequence[int]): return the partial derivatives with respect to these
+                free parameters
+            method (dict[int->str]): gradient method of each free parameter, ``'A'`` or ``'F'``
+            h (float): finite difference method step size
+            order (int): finite difference method order, 1 or 2
+            y0 (array[float]): value of the circuit at params, required by the first-order finite difference method
+
+        Returns:
+            array[float]: partial derivatives, with shape ``(n_out, len(which))``
+        """
+        if order not in (1, 2) and any(method[k] == 'F' for k in which):
+            raise ValueError('Order must be 1 or 2.')
+
+        n = self.num_variables
         grad = np.zeros((self.output_dim, len(which)), dtype=float)
+        terms = {}  # measured expectation values -> list of (column, multiplier, shifted position, shift)
+        temps = []  # occurrences (o_idx, p_idx, original Variable) replaced by temporary Variables
 
         for i, k in enumerate(which):
-            if k not in self.variable_ops:
-                # unused parameter
+            if method[k] == 'F':
+                rows = tuple(self.ev_dependence[k])
+                if order == 1:
+                    terms.setdefault(rows, []).append((i, 1 / h, k, h))
+                    grad[list(rows), i] = -np.ravel(y0)[list(rows)] / h
+                else:
+                    # symmetric difference
+                    terms.setdefault(rows, []).extend([(i, 1 / h, k, 0.5*h), (i, -1 / h, k, -0.5*h)])
                 continue
 
-            par_method = method[k]
-            if par_method == 'A':
-                grad[:, i] = self._pd_analytic(flat_params, k, **kwargs)
-            elif par_method == 'F':
-                grad[:, i] = self._pd_finite_diff(flat_params, k, h, order, y0, **kwargs)
-            else:
-                raise ValueError('Unknown gradient method.')
+            # find the operations in which the free parameter appears, use the product rule
+            for o_idx, p_idx in self.variable_ops[k]:
+                if not self._influence[o_idx]:
+                    # the operation cannot influence any expectation value
+                    continue
+                op = self.ops[o_idx]
+                orig = op.params[p_idx]
+
+                # get the gradient recipe for this parameter
+                recipe = op.grad_recipe[p_idx]
+                multiplier = 0.5 if recipe is None else recipe[0]
+                multiplier *= orig.mult
+                shift = np.pi / 2 if recipe is None else recipe[1]
+                shift /= orig.mult
+
+                # only the expectation values in the future light cone of the operation are measured
+                rows = tuple(sorted(self._influence[o_idx]))
+                pos = n + len(temps)
+                terms.setdefault(rows, []).extend([(i, multiplier, pos, shift), (i, -multiplier, pos, -shift)])
+                temps.append((o_idx, p_idx, orig))
+
+        # the temporary Variables take the values of the original ones, unless shifted
+        base = np.r_[params, [params[orig.idx] for _, _, orig in temps]]
+        for j, (o_idx, p_idx, orig) in enumerate(temps):
+            temp_var = copy.copy(orig)
+            temp_var.idx = n + j
+            self.ops[o_idx].params[p_idx] = temp_var
+        for o_idx in {o_idx for o_idx, _, _ in temps}:
+            self._update_programs(o_idx)
+
+        try:
+            for rows, group in terms.items():
+                shifted = []
+                for _, _, pos, shift in group:
+                    shifted.append(base.copy())
+                    shifted[-1][pos] += shift
+                res = self._execute_batch(shifted, rows, **kwargs)
+                for (i, multiplier, _, _), y in zip(group, res):
+                    grad[list(rows), i] += multiplier * np.asarray(y)
+        finally:
+            # restore the original parameters
+            for o_idx, p_idx, orig in temps:
+                self.ops[o_idx].params[p_idx] = orig
+            for o_idx in {o_idx for o_idx, _, _ in temps}:
+                self._update_programs(o_idx)
 
         return grad
 
-    def _pd_finite_diff(self, params, idx, h=1e-7, order=1, y0=None, **kwargs):
-        """Partial derivative of the node using the finite difference method.
+    def _pd_parallel(self, params, which, method, h, order, parallel, workers=None, **kwargs):
+        """Partial derivatives of the node using shifted circuits, computed by a pool of workers.
+
+        The parameters are dealt out to the workers in turn, so that parameters of neighbouring
+        operations, which tend to have similar costs, are spread over all the workers. Each worker
+        computes its partial derivatives with :meth:`_pd_shifted` on its own copy of the QNode and
+        the device. Thread workers are given deep copies. Process workers are forked where possible,
+        and otherwise receive a pickled copy, which requires a picklable quantum function and device.
 
         Args:
-            params (array[float]): point in parameter space at which to evaluate
-                the partial derivative
-            idx (int): return the partial derivative with respect to this parameter
-            h (float): step size
+            params (array[float]): point in free parameter space at which
+                to evaluate the partial derivatives
+            which (Sequence[int]): return the partial derivatives with respect to these
+                free parameters
+            method (dict[int->str]): gradient method of each free parameter, ``'A'`` or ``'F'``
+            h (float): finite difference method step size
             order (int): finite difference method order, 1 or 2
-            y0 (float): Value of the circuit at params. Should only be computed once.
+            parallel (str): ``'threads'`` or ``'processes'``
+            workers (int, None): number of workers, by default the number of CPUs
 
         Returns:
-            float: partial derivative of the node.
+            array[float]: partial derivatives, with shape ``(n_out, len(which))``
         """
-        shift_params = params.copy()
-        if order == 1:
-            # shift one parameter by h
-            shift_params[idx] += h
-            y = np.asarray(self.evaluate(shift_params, **kwargs))
-            return (y-y0) / h
-        elif order == 2:
-            # symmetric difference
-            # shift one parameter by +-h/2
-            shift_params[idx] += 0.5*h
-            y2 = np.asarray(self.evaluate(shift_params, **kwargs))
-            shift_params[idx] = params[idx] -0.5*h
-            y1 = np.asarray(self.evaluate(shift_params, **kwargs))
-            return (y2-y1) / h
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('The number of workers must be positive.')
+
+        chunks = [which[i::workers] for i in range(min(workers, len(which)))]
+        tasks = [(params, chunk, method, h, order, kwargs) for chunk in chunks]
+
+        if parallel == 'threads':
+            nodes = [copy.deepcopy(self) for _ in chunks]
+            with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                results = list(pool.map(_pd_worker, nodes, tasks))
         else:
-            raise ValueError('Order must be 1 or 2.')
+            # forked workers inherit the QNode without pickling it
+            context = None
+            if 'fork' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context,
+                                     initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_pd_worker, itertools.repeat(None), tasks))
 
+        grad = np.zeros((self.output_dim, len(which)), dtype=float)
+        for i, res in enumerate(results):
+            grad[:, i::workers] = res
+        return grad
+
+    def _adjoint_supported(self):
+        """Whether the device can compute the Jacobian using the adjoint method."""
+        return bool(self.device.capabilities().get('adjoint', False)) and self.device.shots == 0
+
+    def _pd_adjoint(self, params, which, **kwargs):
+        """Partial derivatives of the node using the adjoint method.
+
+        Args:
+            params (array[float]): point in free parameter space at which
+                to evaluate the partial derivatives
+            which (Sequence[int]): return the partial derivatives with respect to these
+                free parameters
+
+        Returns:
+            array[float]: partial derivatives, with shape ``(n_out, len(which))``
+        """
+        self._store_kwargs(kwargs)
+        Variable.free_param_values = np.array(list(_flatten(params)))
+
+        self._compile()
+        self.device.reset()
+        if self.free_wires:
+            self._check_wires()
+
+        # derivatives with respect to every occurrence of the free parameters
+        # in the light cone of the expectation values
+        cone, _, _ = self._cone_program(self._all_rows)
+        queue = [self.queue[o_idx] for o_idx in cone]
+        cone = {o_idx: i for i, o_idx in enumerate(cone)}
+        occurrences = [[(o_idx, p_idx) for o_idx, p_idx in self.variable_ops[k] if o_idx in cone] for k in which]
+        positions = [(cone[o_idx], p_idx) for occ in occurrences for o_idx, p_idx in occ]
+        jac = self.device.adjoint_jacobian(queue, self.ev, positions)
+
+        # product rule, each occurrence is scaled by the multiplier of its Variable
+        grad = np.zeros((self.output_dim, len(which)), dtype=float)
+        col = 0
+        for i, occ in enumerate(occurrences):
+            for o_idx, p_idx in occ:
+                grad[:, i] += jac[:, col] * list(_flatten(self.ops[o_idx].params))[p_idx].mult
+                col += 1
+        return grad
 
     def _pd_analytic(self, params, idx, force_order2=False, **kwargs):
         """Partial derivative of the node using the analytic method.
@@ -702,6 +1419,9 @@ class QNode:
         pd = 0.0
         # find the Commands in which the free parameter appears, use the product rule
         for o_idx, p_idx in self.variable_ops[idx]:
+            if not self._influence[o_idx]:
+                # the operation cannot influence any expectation value
+                continue
             op = self.ops[o_idx]
 
             # we temporarily edit the Operation such that parameter p_idx is replaced by a new one,
@@ -713,6 +1433,7 @@ class QNode:
             temp_var = copy.copy(orig)
             temp_var.idx = n
             op.params[p_idx] = temp_var
+            self._update_programs(o_idx)
 
             # get the gradient recipe for this parameter
             recipe = op.grad_recipe[p_idx]
@@ -729,9 +1450,11 @@ class QNode:
 
             if not force_order2 and op.grad_method != 'A2':
                 # basic analytic method, for discrete gates and gaussian CV gates succeeded by order-1 observables
-                # evaluate the circuit in two points with shifted parameter values
-                y2 = np.asarray(self.evaluate(shift_p1, **kwargs))
-                y1 = np.asarray(self.evaluate(shift_p2, **kwargs))
+                # evaluate the circuit in two points with shifted parameter values,
+                # only for the expectation values in the future light cone of the operation
+                rows = sorted(self._influence[o_idx])
+                y2 = self._evaluate_cone(shift_p1, rows, **kwargs)
+                y1 = self._evaluate_cone(shift_p2, rows, **kwargs)
                 pd += (y2-y1) * multiplier
             else:
                 # order-2 method, for gaussian CV gates succeeded by order-2 observables
@@ -758,17 +1481,8 @@ class QNode:
                     B_inv = B_inv @ temp
                 Z = B @ Z @ B_inv  # conjugation
 
-                # ev_successors = self._op_successors(o_idx, 'E')
-
                 def tr_obs(ex):
                     """Transform the observable"""
-                    # TODO: At initial release, since we use a queue to represent circuit, all expectations values
-                    # are successors to all gates in the same circuit.
-                    # When library uses a DAG representation for circuits, uncomment following if statement
-
-                    ## if ex is not a successor of op, multiplying by Z should do nothing.
-                    #if ex not in ev_successors:
-                    #    return ex
                     q = ex.heisenberg_obs(w)
                     qp = q @ Z
                     if q.ndim == 2:
@@ -776,14 +1490,18 @@ class QNode:
                         qp = qp +qp.T
                     return pennylane.expval.PolyXP(qp, wires=range(w), do_queue=False)
 
-                # transform the observables
-                obs = list(map(tr_obs, self.ev))
+                # transform the observables in the future light cone of the operation,
+                # the others do not depend on the parameter
+                rows = sorted(self._influence[o_idx])
+                obs = [tr_obs(self.ev[r]) for r in rows]
                 # measure transformed observables
-                temp = self.evaluate_obs(obs, unshifted_params, **kwargs)
+                temp = np.zeros(self.output_dim)
+                temp[rows] = self.evaluate_obs(obs, unshifted_params, **kwargs)
                 pd += temp
 
             # restore the original parameter
             op.params[p_idx] = orig
+            self._update_programs(o_idx)
 
         return pd
 
@@ -812,6 +1530,45 @@ class QNode:
         return TFEQNode(self)
 
 
+def _untraced(x):
+    """Values of a nested structure of arguments, with the autograd boxes removed.
+
+    Args:
+        x (array, Iterable, other): possibly traced nested arguments
+
+    Returns:
+        array, Iterable, other: x with every autograd box replaced by its value
+    """
+    x = getval(x)
+    if isinstance(x, (list, tuple)):
+        return type(x)(_untraced(v) for v in x)
+    return x
+
+
+def _flatten_traced(x):
+    """Flatten a nested structure of arguments into a 1D array in depth-first order,
+    like :func:`~.utils._flatten`, but with autograd operations, so that traced values stay traced.
+
+    Args:
+        x (array, Iterable, other): possibly traced nested arguments
+
+    Returns:
+        array: flattened values
+    """
+    def pieces(y):
+        """1D arrays of the leaves of y"""
+        if isinstance(getval(y), np.ndarray):
+            yield np.ravel(y)
+        elif isinstance(y, Iterable) and not isinstance(y, (str, bytes)):
+            for item in y:
+                yield from pieces(item)
+        else:
+            yield np.reshape(y, (1,))
+
+    temp = list(pieces(x))
+    return np.concatenate(temp) if temp else np.array([])
+
+
 #def QNode_vjp(ans, self, params, *args, **kwargs):
 def QNode_vjp(ans, self, args, **kwargs):
     """Returns the vector Jacobian product operator for a QNode, as a function
@@ -58,6 +58,8 @@ arguments are stored in the :attr:`Variable.free_param_values` list and the
 :attr:`Variable.kwarg_values` dictionary respectively; these are
 then returned by :meth:`Variable.val`, using its ``idx`` value, and, for
 keyword arguments, its ``name``, to return the correct value to the operation.
+The values are stored separately for each thread, so QNodes can be evaluated
+concurrently in several threads.
 
 .. note::
     The :meth:`Operation.parameters() <pennylane.operation.Operation.parameters>`
@@ -72,13 +74,43 @@ keyword arguments, its ``name``, to return the correct value to the operation.
 import logging
 from collections.abc import Sequence
 import copy
+import threading
 
 import numpy as np
 
 logging.getLogger()
 
 
-class Variable:
+_values = threading.local()  #: per-thread storage of the current argument values of the Variables
+
+
+class _VariableValues(type):
+    """Metaclass of :class:`Variable`, which stores the current argument values per thread.
+
+    Each thread sees its own :attr:`Variable.free_param_values` and :attr:`Variable.kwarg_values`,
+    so that QNodes can be evaluated concurrently in several threads.
+    """
+    @property
+    def free_param_values(cls):
+        """array[float]: current free parameter values, set in :meth:`QNode.evaluate`
+        (one column per sample in :meth:`QNode.evaluate_batch`)"""
+        return getattr(_values, 'free_param_values', None)
+
+    @free_param_values.setter
+    def free_param_values(cls, value):
+        _values.free_param_values = value
+
+    @property
+    def kwarg_values(cls):
+        """dict: dictionary containing the keyword argument values, set in :meth:`QNode.evaluate`"""
+        return getattr(_values, 'kwarg_values', None)
+
+    @kwarg_values.setter
+    def kwarg_values(cls, value):
+        _values.kwarg_values = value
+
+
+class Variable(metaclass=_VariableValues):
     """A reference class to dynamically track and update circuit parameters.
 
     Represents a placeholder variable. This can either be a free quantum
@@ -98,8 +130,8 @@ class Variable:
         name (str): name of the variable (optional)
     """
     # pylint: disable=too-few-public-methods
-    free_param_values = None  #: array[float]: current free parameter values, set in :meth:`QNode.evaluate`
-    kwarg_values = None #: dict: dictionary containing the keyword argument values, set in :meth:`QNode.evaluate`
+    # the current argument values, Variable.free_param_values and Variable.kwarg_values,
+    # are stored per thread by the metaclass
 
     def __init__(self, idx=None, name=None):
         self.idx = idx    #: int: parameter index
@@ -140,10 +172,11 @@ class Variable:
         # pylint: disable=unsubscriptable-object
         if self.name is None:
             # The variable is a placeholder for a positional argument
-            return self.free_param_values[self.idx] * self.mult
+            return Variable.free_param_values[self.idx] * self.mult
 
         # The variable is a placeholder for a keyword argument
-        if isinstance(self.kwarg_values[self.name], (Sequence, np.ndarray)):
-            return self.kwarg_values[self.name][self.idx] * self.mult
+        kwarg_values = Variable.kwarg_values
+        if isinstance(kwarg_values[self.name], (Sequence, np.ndarray)):
+            return kwarg_values[self.name][self.idx] * self.mult
 
-        return self.kwarg_values[self.name] * self.mult
+        return kwarg_values[self.name] * self.mult
@@ -53,7 +53,10 @@ info = {
     'entry_points': {
         'pennylane.plugins': [
             'default.qubit = pennylane.plugins:DefaultQubit',
-            'default.gaussian = pennylane.plugins:DefaultGaussian'
+            'default.autograd = pennylane.plugins:DefaultQubitAutograd',
+            'default.gaussian = pennylane.plugins:DefaultGaussian',
+            'default.clifford = pennylane.plugins:DefaultClifford',
+            'default.mps = pennylane.plugins:DefaultMPS'
             ],
         },
     'description': 'PennyLane is a Python quantum machine learning library by Xanadu Inc.',
@@ -0,0 +1,167 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the :mod:`pennylane.plugin.DefaultClifford` device.
+"""
+# pylint: disable=protected-access,cell-var-from-loop
+import unittest
+import logging as log
+
+from defaults import pennylane as qml, BaseTest
+
+from pennylane import numpy as np
+
+from pennylane.plugins.default_clifford import clifford_power, DefaultClifford
+
+
+log.getLogger('defaults')
+
+
+class TestAuxillaryFunctions(BaseTest):
+    """Tests the auxillary functions of the device."""
+
+    def test_clifford_power(self):
+        """Test that rotation angles are converted into quarter turns"""
+        self.logTestName()
+
+        self.assertEqual(clifford_power(0), 0)
+        self.assertEqual(clifford_power(np.pi/2), 1)
+        self.assertEqual(clifford_power(-np.pi/2), 3)
+        self.assertEqual(clifford_power(5*np.pi), 2)
+
+        with self.assertRaisesRegex(ValueError, "multiples of pi/2"):
+            clifford_power(0.1)
+
+
+class TestDefaultCliffordIntegration(BaseTest):
+    """Integration tests for default.clifford."""
+
+    def test_load_device(self):
+        """Test that the device loads correctly"""
+        self.logTestName()
+
+        dev = qml.device('default.clifford', wires=2)
+        self.assertTrue(isinstance(dev, DefaultClifford))
+        self.assertEqual(dev.num_wires, 2)
+        self.assertEqual(dev.shots, 0)
+
+    def test_random_circuits(self):
+        """Test that random Clifford circuits agree with default.qubit"""
+        self.logTestName()
+        np.random.seed(42)
+        n = 4
+        one_qubit = ['PauliX', 'PauliY', 'PauliZ', 'Hadamard', 'PhaseShift', 'RX', 'RY', 'RZ', 'Rot']
+        two_qubit = ['CNOT', 'CZ', 'SWAP']
+        paulis = ['PauliX', 'PauliY', 'PauliZ', 'Identity']
+
+        for _ in range(20):
+            ops = []
+            for _ in range(20):
+                if np.random.rand() < 0.6:
+                    g = one_qubit[np.random.randint(len(one_qubit))]
+                    p = list(np.random.randint(-4, 5, size=getattr(qml, g).num_params) * np.pi/2)
+                    ops.append((g, p, [np.random.randint(n)]))
+                else:
+                    g = two_qubit[np.random.randint(len(two_qubit))]
+                    ops.append((g, [], list(np.random.choice(n, 2, replace=False))))
+            obs = list(np.random.choice(paulis, 3))
+            basis = np.random.randint(2, size=n)
+
+            def circuit():
+                """Test quantum function"""
+                qml.BasisState(basis, wires=list(range(n)))
+                for g, p, w in ops:
+                    getattr(qml, g)(*p, wires=w)
+                return qml.expval.Tensor(obs, wires=[0, 1, 2]), qml.expval.PauliY(3)
+
+            res = qml.QNode(circuit, qml.device('default.clifford', wires=n))()
+            expected = qml.QNode(circuit, qml.device('default.qubit', wires=n))()
+            self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+    def test_many_qubits(self):
+        """Test a GHZ state on many qubits"""
+        self.logTestName()
+        n = 200
+        dev = qml.device('default.clifford', wires=n)
+
+        @qml.qnode(dev)
+        def circuit():
+            """Test quantum function"""
+            qml.Hadamard(wires=0)
+            for i in range(n-1):
+                qml.CNOT(wires=[i, i+1])
+            return qml.expval.Tensor(['PauliX'] * (n-2), wires=list(range(n-2))), \
+                qml.expval.Tensor(['PauliZ', 'PauliZ'], wires=[n-2, n-1])
+
+        self.assertAllEqual(circuit(), [0, 1])
+
+    def test_gradient(self):
+        """Test that the parameter-shift rule works at Clifford points"""
+        self.logTestName()
+        dev = qml.device('default.clifford', wires=2)
+
+        @qml.qnode(dev)
+        def circuit(x, y):
+            """Test quantum function"""
+            qml.RX(x, wires=0)
+            qml.CNOT(wires=[0, 1])
+            qml.RY(y, wires=1)
+            return qml.expval.PauliZ(1)
+
+        x, y = np.pi/2, np.pi
+        # <Z_1> = cos(x) cos(y)
+        self.assertAllAlmostEqual(circuit.jacobian([x, y]), [[1, 0]], delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "multiples of pi/2"):
+            circuit(0.1, y)
+
+    def test_shots(self):
+        """Test that sampled expectation values are estimated from random outcomes"""
+        self.logTestName()
+        dev = qml.device('default.clifford', wires=2, shots=1000)
+
+        @qml.qnode(dev)
+        def circuit():
+            """Test quantum function"""
+            qml.Hadamard(wires=0)
+            qml.PauliX(wires=1)
+            return qml.expval.PauliZ(0), qml.expval.PauliZ(1)
+
+        res = circuit()
+        self.assertAlmostEqual(res[0], 0, delta=0.2)
+        self.assertEqual(res[1], -1)
+
+    def test_unsupported(self):
+        """Test that non-Pauli observables are rejected"""
+        self.logTestName()
+        dev = qml.device('default.clifford', wires=2)
+
+        @qml.qnode(dev)
+        def circuit():
+            """Test quantum function"""
+            return qml.expval.Tensor(['PauliZ', 'Hadamard'], wires=[0, 1])
+
+        with self.assertRaisesRegex(ValueError, "Pauli observables"):
+            circuit()
+
+
+if __name__ == '__main__':
+    print('Testing PennyLane version ' + qml.version() + ', default.clifford plugin.')
+    # run the tests in this file
+    suite = unittest.TestSuite()
+    for t in (TestAuxillaryFunctions,
+              TestDefaultCliffordIntegration):
+        ttt = unittest.TestLoader().loadTestsFromTestCase(t)
+        suite.addTests(ttt)
+    unittest.TextTestRunner().run(suite)
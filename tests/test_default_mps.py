@@ -0,0 +1,180 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the :mod:`pennylane.plugin.DefaultMPS` device.
+"""
+# pylint: disable=protected-access,cell-var-from-loop
+import unittest
+import logging as log
+
+from defaults import pennylane as qml, BaseTest
+
+from pennylane import numpy as np
+
+from pennylane.plugins.default_mps import DefaultMPS
+
+
+log.getLogger('defaults')
+
+
+U = np.array([[0.83645892-0.40533293j, -0.20215326+0.30850569j],
+              [-0.23889780-0.28101519j, -0.88031770-0.29832709j]])
+
+
+class TestDefaultMPSDevice(BaseTest):
+    """Unit tests for the chain operations of default.mps."""
+
+    def setUp(self):
+        self.dev = DefaultMPS(wires=4)
+
+    def test_load_device(self):
+        """Test that the device loads correctly with the configured options"""
+        self.logTestName()
+
+        dev = qml.device('default.mps', wires=3, bond_dim=8)
+        self.assertTrue(isinstance(dev, DefaultMPS))
+        self.assertEqual(dev.num_wires, 3)
+        self.assertEqual(dev.bond_dim, 8)
+        self.assertEqual(dev.cutoff, 1e-10)
+        self.assertEqual(dev.bond_dims, [1, 1])
+
+    def test_state_vector(self):
+        """Test that a state vector is split into a chain that reproduces it"""
+        self.logTestName()
+
+        state = np.random.random(16) + 1j * np.random.random(16)
+        state /= np.linalg.norm(state)
+        self.dev.apply('QubitStateVector', list(range(4)), [state])
+        self.assertEqual(self.dev.bond_dims, [2, 4, 2])
+
+        theta = self.dev._merge(0, 4)
+        self.assertAllAlmostEqual(np.reshape(theta, [-1]), state, delta=self.tol)
+
+    def test_canonical_form(self):
+        """Test that moving the orthogonality center leaves the state unchanged"""
+        self.logTestName()
+
+        self.dev.apply('Hadamard', [0], [])
+        self.dev.apply('CNOT', [0, 3], [])
+        self.dev.apply('RX', [2], [0.432])
+        self.dev.apply('CZ', [2, 1], [])
+        before = self.dev._merge(0, 4)
+
+        for site in (3, 0, 2):
+            self.dev._move_center(site)
+            self.assertAllAlmostEqual(self.dev._merge(0, 4), before, delta=self.tol)
+            for A in self.dev._tensors[:site]:
+                # left-canonical sites
+                M = np.reshape(A, (-1, A.shape[2]))
+                self.assertAllAlmostEqual(M.conj().T @ M, np.eye(A.shape[2]), delta=self.tol)
+
+    def test_truncation(self):
+        """Test that the bond dimension never exceeds bond_dim, and that the state stays normalized"""
+        self.logTestName()
+
+        dev = DefaultMPS(wires=6, bond_dim=2)
+        for _ in range(3):
+            for w in range(6):
+                dev.apply('Rot', [w], list(np.random.random(3)))
+            for w in range(5):
+                dev.apply('CNOT', [w, w + 1], [])
+
+        self.assertTrue(max(dev.bond_dims) <= 2)
+        self.assertAlmostEqual(dev.ev_product({}), 1, delta=self.tol)
+        self.assertAlmostEqual(np.linalg.norm(dev._merge(0, 6)), 1, delta=self.tol)
+
+
+class TestDefaultMPSIntegration(BaseTest):
+    """Integration tests for default.mps."""
+
+    def test_random_circuits(self):
+        """Test that circuits with non-neighbouring and multi-qubit gates agree with default.qubit"""
+        self.logTestName()
+        np.random.seed(42)
+        n = 5
+        one_qubit = ['PauliX', 'PauliY', 'PauliZ', 'Hadamard', 'PhaseShift', 'RX', 'RY', 'RZ', 'Rot']
+        two_qubit = ['CNOT', 'CZ', 'SWAP']
+        A = np.random.random([4, 4]) + 1j * np.random.random([4, 4])
+        A = A + A.conj().T
+        V = np.kron(U, np.kron(U.T, U))
+
+        for _ in range(10):
+            ops = []
+            for _ in range(20):
+                if np.random.rand() < 0.5:
+                    g = one_qubit[np.random.randint(len(one_qubit))]
+                    ops.append((g, list(np.random.random(getattr(qml, g).num_params)), [np.random.randint(n)]))
+                elif np.random.rand() < 0.8:
+                    g = two_qubit[np.random.randint(len(two_qubit))]
+                    ops.append((g, [], list(np.random.choice(n, 2, replace=False))))
+                else:
+                    ops.append(('QubitUnitary', [V], list(np.random.choice(n, 3, replace=False))))
+
+            def circuit():
+                """Test quantum function"""
+                qml.BasisState(np.array([1, 0, 1, 0, 0]), wires=list(range(n)))
+                for g, p, w in ops:
+                    getattr(qml, g)(*p, wires=w)
+                return qml.expval.Hermitian(A, wires=[3, 0]), \
+                    qml.expval.Tensor(['PauliX', 'PauliY'], wires=[4, 1]), qml.expval.Hadamard(2)
+
+            res = qml.QNode(circuit, qml.device('default.mps', wires=n))()
+            expected = qml.QNode(circuit, qml.device('default.qubit', wires=n))()
+            self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+    def test_many_qubits(self):
+        """Test a nearest-neighbour circuit on many qubits, and its gradient"""
+        self.logTestName()
+        n = 50
+        layers = 2
+        dev = qml.device('default.mps', wires=n, bond_dim=16)
+
+        @qml.qnode(dev)
+        def circuit(weights):
+            """Test quantum function"""
+            qml.template.StronglyEntanglingCircuit(weights, periodic=False, ranges=[1] * layers, wires=range(n))
+            return qml.expval.PauliZ(0), qml.expval.Tensor(['PauliZ', 'PauliZ'], wires=[24, 25])
+
+        weights = np.random.random([layers, n, 3])
+        res = circuit(weights)
+        self.assertEqual(res.shape, (2,))
+        self.assertTrue(max(dev.bond_dims) <= 16)
+
+        # the first wire only depends on a few of the weights
+        grad = circuit.jacobian([weights], which=[0, 1, 2])
+        self.assertTrue(np.all(np.isfinite(grad)))
+
+    def test_shots(self):
+        """Test that sampled expectation values are close to the exact ones"""
+        self.logTestName()
+
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x, wires=0)
+            qml.CNOT(wires=[0, 2])
+            return qml.expval.PauliZ(0), qml.expval.Tensor(['PauliZ', 'PauliZ'], wires=[1, 2])
+
+        res = qml.QNode(circuit, qml.device('default.mps', wires=3, shots=10000))(0.543)
+        self.assertAllAlmostEqual(res, [np.cos(0.543)] * 2, delta=0.05)
+
+
+if __name__ == '__main__':
+    print('Testing PennyLane version ' + qml.version() + ', default.mps plugin.')
+    # run the tests in this file
+    suite = unittest.TestSuite()
+    for t in (TestDefaultMPSDevice,
+              TestDefaultMPSIntegration):
+        ttt = unittest.TestLoader().loadTestsFromTestCase(t)
+        suite.addTests(ttt)
+    unittest.TextTestRunner().run(suite)
@@ -18,13 +18,16 @@ Unit tests for the :mod:`pennylane.plugin.DefaultQubit` device.
 import unittest
 import inspect
 import logging as log
+import tempfile
 
 from pennylane import numpy as np
 
 from defaults import pennylane as qml, BaseTest
-from pennylane.plugins.default_qubit import (spectral_decomposition_qubit,
-                                             I, X, Z, CNOT, Rphi, Rotx, Roty, Rotz, Rot3,
-                                             unitary, hermitian, DefaultQubit)
+from pennylane.plugins.default_qubit import (spectral_decomposition_qubit, batched_matrix,
+                                             I, X, Z, H as Hd, CNOT, Rphi, Rotx, Roty, Rotz, Rot3,
+                                             unitary, hermitian, tensor, DefaultQubit)
+from pennylane.program import Program
+from pennylane.variable import Variable
 
 log.getLogger('defaults')
 
@@ -62,6 +65,23 @@ class TestAuxillaryFunctions(BaseTest):
         # verify that H = \sum_k a_k P_k
         self.assertAllAlmostEqual(H, np.einsum('i,ijk->jk', a, P), delta=self.tol)
 
+    def test_batched_matrix(self):
+        """Test that batched matrix entries give one matrix per sample."""
+        self.logTestName()
+
+        # scalar entries give a single matrix
+        self.assertAllEqual(batched_matrix([[1, 2], [3, 4]]), np.array([[1, 2], [3, 4]]))
+
+        theta = np.array([0.1, -0.4, 1.2])
+        res = Rotx(theta)
+        self.assertEqual(res.shape, (3, 2, 2))
+        for t, r in zip(theta, res):
+            self.assertAllAlmostEqual(r, Rotx(t), delta=self.tol)
+
+        res = Rot3(theta, 0.2, theta[::-1])
+        for k, r in enumerate(res):
+            self.assertAllAlmostEqual(r, Rot3(theta[k], 0.2, theta[2-k]), delta=self.tol)
+
     def test_phase_shift(self):
         """Test phase shift is correct"""
         self.logTestName()
@@ -184,6 +204,17 @@ class TestStateFunctions(BaseTest):
         with self.assertRaisesRegex(ValueError, "must be Hermitian"):
             hermitian(H2)
 
+    def test_tensor(self):
+        """Test that the tensor function produces the Kronecker product of its factors."""
+        self.logTestName()
+
+        out = tensor(np.array(['PauliX', 'Identity', 'PauliZ']))
+        self.assertAllAlmostEqual(out, np.kron(np.kron(X, I), Z), delta=self.tol)
+
+        # test unknown factor
+        with self.assertRaisesRegex(ValueError, "not a supported single-qubit observable"):
+            tensor(np.array(['PauliZ', 'CNOT']))
+
 
 class TestDefaultQubitDevice(BaseTest):
     """Test the default qubit device. The test ensures that the device is properly
@@ -271,6 +302,292 @@ class TestDefaultQubitDevice(BaseTest):
         with self.assertRaisesRegex(ValueError, "Bad target subsystems."):
             dev.expand_two(U2, [-1, 5])
 
+    def test_mat_vec_product(self):
+        """Test that applying a gate by tensor contraction agrees with the expanded operator."""
+        self.logTestName()
+
+        dev = DefaultQubit(wires=4)
+        state = np.random.random([16]) + 1j*np.random.random([16])
+        state /= np.linalg.norm(state)
+
+        for w in range(4):
+            res = dev.mat_vec_product(U, state, [w])
+            expected = dev.expand_one(U, [w]) @ state
+            self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+        for w in ([0, 1], [1, 0], [0, 3], [3, 1], [2, 3]):
+            res = dev.mat_vec_product(U2, state, w)
+            expected = dev.expand_two(U2, w) @ state
+            self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+        # test exception raised if the matrix does not match the number of wires
+        with self.assertRaisesRegex(ValueError, "4x4 matrix required"):
+            dev.mat_vec_product(U, state, [0, 1])
+
+    def test_mat_vec_product_batched(self):
+        """Test that batched matrices and states are multiplied sample by sample."""
+        self.logTestName()
+
+        dev = DefaultQubit(wires=3)
+        states = np.random.random([4, 8]) + 1j*np.random.random([4, 8])
+        mats = np.array([U2, U2 @ U2, U2.conj().T, np.identity(4)])
+
+        # batch of matrices and batch of states
+        res = dev.mat_vec_product(mats, states, [2, 0])
+        self.assertEqual(res.shape, (4, 8))
+        for m, v, r in zip(mats, states, res):
+            self.assertAllAlmostEqual(r, dev.mat_vec_product(m, v, [2, 0]), delta=self.tol)
+
+        # batch of matrices applied to a single state
+        res = dev.mat_vec_product(mats, states[0], [1, 2])
+        for m, r in zip(mats, res):
+            self.assertAllAlmostEqual(r, dev.mat_vec_product(m, states[0], [1, 2]), delta=self.tol)
+
+        # single matrix applied to a batch of states
+        res = dev.mat_vec_product(U, states, [1])
+        for v, r in zip(states, res):
+            self.assertAllAlmostEqual(r, dev.mat_vec_product(U, v, [1]), delta=self.tol)
+
+    def test_batched_execution(self):
+        """Test that per-sample parameter arrays give the same results as separate executions."""
+        self.logTestName()
+
+        def run(dev, a, b):
+            """apply a circuit and return its expectation values"""
+            dev.pre_apply()
+            dev.apply('Hadamard', [1], [])
+            dev.apply('RX', [0], [a])
+            dev.apply('CNOT', [0, 2], [])
+            dev.apply('Rot', [2], [a, 0.3, b])
+            dev.apply('RY', [1], [b])
+            dev.apply('CZ', [1, 2], [])
+            dev.post_apply()
+            dev.pre_expval()
+            res = [dev.expval('PauliZ', [0], []),
+                   dev.expval('Hermitian', [1, 2], [np.diag([1., 2., 3., 4.])]),
+                   dev.expval('Tensor', [0, 2], [np.array(['PauliX', 'PauliY'])])]
+            dev.post_expval()
+            return np.array(res)
+
+        a = np.random.random(5)
+        b = np.random.random(5)
+
+        for fusion in (True, False):
+            dev = DefaultQubit(wires=3, gate_fusion=fusion)
+            res = run(dev, a, b)
+            self.assertEqual(dev._state.shape, (5, 8))
+            expected = np.array([run(dev, a[k], b[k]) for k in range(5)]).T
+            self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+    def test_batch_execute(self):
+        """Test that circuits sharing a program are executed together as one batch."""
+        self.logTestName()
+
+        queue = [qml.RX(Variable(0), wires=[0], do_queue=False), qml.CNOT(wires=[0, 1], do_queue=False),
+                 qml.RY(Variable(1), wires=[1], do_queue=False)]
+        evs = [qml.expval.PauliZ(0, do_queue=False), qml.expval.PauliZ(1, do_queue=False)]
+        program = Program(queue)
+        # operation queues are executed on their own
+        other = [qml.PauliX(wires=[0], do_queue=False)]
+        circuits = [(program, evs), (other, evs[:1]), (program, evs), (program, evs), (program, evs)]
+        params = [np.array([0.1 * k, 0.2 + 0.1 * k]) for k in range(5)]
+
+        dev = DefaultQubit(wires=2)
+        runs = []
+        pre_apply = dev.pre_apply
+        dev.pre_apply = lambda: runs.append(dev._op_queue) or pre_apply()
+        previous = np.array([0.7, 0.8])
+        Variable.free_param_values = previous
+        res = dev.batch_execute(circuits, params)
+        del dev.pre_apply
+        # the parameter values of the caller are restored
+        self.assertIs(Variable.free_param_values, previous)
+
+        self.assertEqual([len(q) for q in runs], [1, 3])
+        self.assertEqual(dev.batch_size(program, evs), 2**20 * dev.batch_memory // 64)
+        self.assertEqual(dev.batch_size(other, evs[:1]), 1)
+        self.assertEqual(DefaultQubit(wires=2, batch_memory=0).batch_size(program, evs), 1)
+        self.assertAllAlmostEqual(res[1], [-1], delta=self.tol)
+        for r, p in zip(res[:1] + res[2:], params[:1] + params[2:]):
+            expected = [np.cos(p[0]), np.cos(p[0]) * np.cos(p[1])]
+            self.assertAllAlmostEqual(r, expected, delta=self.tol)
+
+    def test_single_precision(self):
+        """Test that the complex64 mode keeps the state in single precision."""
+        self.logTestName()
+
+        def run(dev):
+            """apply a circuit and return the final state and an expectation value"""
+            dev.pre_apply()
+            dev.apply('Hadamard', [0], [])
+            dev.apply('RX', [1], [0.432])
+            dev.apply('CNOT', [0, 2], [])
+            dev.apply('Rot', [2], [0.1, -0.2, 0.3])
+            dev.apply('QubitUnitary', [1, 2], [U2])
+            dev.post_apply()
+            return dev._state, dev.expval('Hermitian', [2, 0], [np.kron(H, Z)])
+
+        state64, ev64 = run(DefaultQubit(wires=3, dtype='complex64'))
+        state128, ev128 = run(DefaultQubit(wires=3))
+
+        self.assertEqual(state64.dtype, np.complex64)
+        self.assertEqual(state128.dtype, np.complex128)
+        self.assertAllAlmostEqual(state64, state128, delta=1e-6)
+        self.assertAlmostEqual(ev64, ev128, delta=1e-5)
+
+        with self.assertRaisesRegex(ValueError, "requires a complex dtype"):
+            DefaultQubit(wires=3, dtype='float32')
+
+    def test_threads(self):
+        """Test that gates applied in parallel chunks agree with serial application."""
+        self.logTestName()
+
+        ops = [('Hadamard', [0], []), ('RX', [3], [0.3]), ('CNOT', [3, 1], []),
+               ('QubitUnitary', [2, 0], [U2]), ('CZ', [0, 2], []), ('Rot', [1], [0.1, 0.2, 0.3]),
+               ('SWAP', [1, 3], []), ('PauliY', [2], []), ('RY', [2], [np.array([0.4, -0.5])])]
+
+        serial = DefaultQubit(wires=4)
+        parallel = DefaultQubit(wires=4, threads=4)
+        # force small registers to be split as well
+        parallel._parallel_min_wires = 0
+
+        self.assertEqual(serial._chunks(0, [0]), None)
+        self.assertEqual(len(parallel._chunks(0, [0])), 4)
+
+        for dev in (serial, parallel):
+            dev.pre_apply()
+            for name, wires, par in ops:
+                dev.apply(name, wires, par)
+            dev.post_apply()
+
+        self.assertAllAlmostEqual(parallel._state, serial._state, delta=self.tol)
+
+    def test_memmap(self):
+        """Test that an out-of-core state streamed in blocks agrees with an in-memory state."""
+        self.logTestName()
+
+        ops = [('QubitStateVector', [0, 1, 2, 3], [np.ones(16)/4]), ('Hadamard', [0], []),
+               ('RX', [3], [0.3]), ('CNOT', [3, 1], []), ('QubitUnitary', [2, 0], [U2]),
+               ('Rot', [1], [0.1, 0.2, 0.3]), ('RY', [1], [0.7]), ('SWAP', [1, 3], []), ('PauliY', [2], [])]
+
+        def run(dev):
+            """apply the circuit and return its expectation values"""
+            dev.pre_apply()
+            for name, wires, par in ops:
+                dev.apply(name, wires, par)
+            dev.post_apply()
+            dev.pre_expval()
+            res = [dev.expval('PauliZ', [0], []),
+                   dev.expval('Hermitian', [1, 3], [np.diag([1., 2., 3., 4.])]),
+                   dev.expval('Tensor', [2, 3], [np.array(['PauliX', 'PauliY'])])]
+            dev.post_expval()
+            return np.array(res)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            expected = run(DefaultQubit(wires=4))
+
+            for shots in (0, 1000):
+                dev = DefaultQubit(wires=4, shots=shots, memmap_dir=tmpdir)
+                # blocks of four amplitudes
+                dev._block_wires = 2
+                ref = DefaultQubit(wires=4, shots=shots)
+
+                np.random.seed(42)
+                res = run(dev)
+                self.assertTrue(isinstance(dev._state, np.memmap))
+                np.random.seed(42)
+                self.assertAllAlmostEqual(res, run(ref), delta=self.tol)
+                self.assertAllAlmostEqual(dev._state, ref._state, delta=self.tol)
+
+            self.assertAllAlmostEqual(res, expected, delta=0.2)
+
+    def test_gate_kernels(self):
+        """Test that the in-place gate kernels agree with applying the gate matrices."""
+        self.logTestName()
+
+        dev = DefaultQubit(wires=3)
+        state = np.random.random([8]) + 1j*np.random.random([8])
+        state /= np.linalg.norm(state)
+
+        for name in dev._kernel_map:
+            log.debug("\tTesting %s kernel...", name)
+            O = dev._operation_map[name]
+            if O.shape == (2, 2):
+                wires = ([0], [1], [2])
+            else:
+                wires = ([0, 1], [1, 0], [2, 0], [1, 2])
+
+            for w in wires:
+                dev._state = state.copy()
+                dev.apply(name, wires=w, par=[])
+                expected = dev.mat_vec_product(O, state, w)
+                self.assertAllAlmostEqual(dev._state, expected, delta=self.tol)
+
+    def test_gate_fusion(self):
+        """Test that runs of single-qubit gates are deferred and fused during execution."""
+        self.logTestName()
+
+        dev = DefaultQubit(wires=2)
+        a, b, c = 0.432, -0.152, 0.9234
+
+        dev.pre_apply()
+        dev.apply('RX', wires=[0], par=[a])
+        dev.apply('Hadamard', wires=[1], par=[])
+        dev.apply('Rot', wires=[0], par=[a, b, c])
+        dev.apply('PhaseShift', wires=[0], par=[b])
+
+        # nothing has been applied yet
+        self.assertEqual(len(dev._pending[0]), 3)
+        self.assertEqual(len(dev._pending[1]), 1)
+        self.assertAllEqual(dev._state, np.array([1, 0, 0, 0]))
+
+        # a two-qubit gate flushes the pending gates on its wires first
+        dev.apply('CNOT', wires=[1, 0], par=[])
+        self.assertEqual(dev._pending, {})
+
+        dev.apply('RY', wires=[1], par=[c])
+        dev.post_apply()
+        self.assertEqual(dev._pending, None)
+
+        state = np.kron(Rphi(b) @ Rot3(a, b, c) @ Rotx(a) @ np.array([1, 0]), Hd @ np.array([1, 0]))
+        state = dev.expand_two(CNOT, [1, 0]) @ state
+        expected = np.kron(I, Roty(c)) @ state
+        self.assertAllAlmostEqual(dev._state, expected, delta=self.tol)
+
+    def test_reduced_density_matrix(self):
+        """Test that the reduced density matrix is correct, and cached while measuring"""
+        self.logTestName()
+
+        dev = DefaultQubit(wires=3)
+        state = np.random.random([8]) + 1j*np.random.random([8])
+        state /= np.linalg.norm(state)
+        dev._state = state
+
+        # partial trace of the full density matrix
+        rho = np.outer(state, state.conj()).reshape([2]*6)
+        expected = [np.einsum('abcdbc->ad', rho),
+                    np.einsum('abcaec->be', rho),
+                    np.einsum('abcabf->cf', rho)]
+
+        for w in range(3):
+            self.assertAllAlmostEqual(dev.reduced_density_matrix([w]), expected[w], delta=self.tol)
+
+        # expectation values agree with the expanded observable
+        for w in range(3):
+            res = dev.ev(H, [w])
+            expected_ev = np.vdot(state, dev.expand_one(H, [w]) @ state).real
+            self.assertAlmostEqual(res, expected_ev, delta=self.tol)
+
+        # not cached outside of the measurement stage
+        self.assertEqual(dev._rho_cache, None)
+
+        dev.pre_expval()
+        dev.expval('PauliZ', [1], [])
+        dev.expval('PauliX', [1], [])
+        self.assertEqual(list(dev._rho_cache), [(1,)])
+        dev.post_expval()
+        self.assertEqual(dev._rho_cache, None)
+
     def test_get_operator_matrix(self):
         """Test the the correct matrix is returned given an operation name"""
         self.logTestName()
@@ -289,6 +606,8 @@ class TestDefaultQubitDevice(BaseTest):
                 p = [U]
             elif name == 'Hermitian':
                 p = [H]
+            elif name == 'Tensor':
+                p = [np.array(['PauliX', 'PauliZ'])]
 
             res = self.dev._get_operator_matrix(name, p)
 
@@ -358,8 +677,34 @@ class TestDefaultQubitDevice(BaseTest):
             # verify the device is now in the expected state
             self.assertAllAlmostEqual(self.dev._state, expected_out, delta=self.tol)
 
+    def test_apply_multi_qubit_unitary(self):
+        """Test that QubitUnitary can be applied to more than two wires"""
+        self.logTestName()
+
+        dev = DefaultQubit(wires=4)
+        state = np.random.random([16]) + 1j*np.random.random([16])
+        state /= np.linalg.norm(state)
+
+        # random 3-qubit unitary
+        A = np.random.random([8, 8]) + 1j*np.random.random([8, 8])
+        U3, _ = np.linalg.qr(A)
+
+        # wires in increasing order: compare against the kron-expanded operator
+        dev._state = state
+        dev.apply('QubitUnitary', wires=[1, 2, 3], par=[U3])
+        expected = np.kron(I, U3) @ state
+        self.assertAllAlmostEqual(dev._state, expected, delta=self.tol)
+
+        # permuted wires: equivalent to swapping wires before and after the unitary
+        dev._state = state
+        dev.apply('QubitUnitary', wires=[2, 0, 3], par=[U3])
+        perm = np.transpose(state.reshape([2]*4), [2, 0, 3, 1]).reshape(16)
+        out = np.kron(U3, I) @ perm
+        expected = np.transpose(out.reshape([2]*4), [1, 3, 0, 2]).reshape(16)
+        self.assertAllAlmostEqual(dev._state, expected, delta=self.tol)
+
     def test_apply_errors(self):
-        """Test that apply fails for incorrect state preparation, and > 2 qubit gates"""
+        """Test that apply fails for incorrect state preparation, and mismatched gate sizes"""
         self.logTestName()
 
         with self.assertRaisesRegex(ValueError, r'State vector must be of length 2\*\*wires.'):
@@ -373,7 +718,7 @@ class TestDefaultQubitDevice(BaseTest):
             self.dev.apply('BasisState', wires=[0, 1, 2], par=[np.array([0, 1])])
 
 
-        with self.assertRaisesRegex(ValueError, "This plugin supports only one- and two-qubit gates."):
+        with self.assertRaisesRegex(ValueError, "8x8 matrix required"):
             self.dev.apply('QubitUnitary', wires=[0, 1, 2], par=[U2])
 
     def test_ev(self):
@@ -391,7 +736,10 @@ class TestDefaultQubitDevice(BaseTest):
             # get the equivalent pennylane operation class
             op = qml.expval.__getattribute__(name)
 
-            if op.par_domain == 'A':
+            if name == 'Tensor':
+                # a single factor acting on wire 0
+                p = [np.array(['PauliY'])]
+            elif op.par_domain == 'A':
                 # the parameter is an array
                 p = [H]
             else:
@@ -432,6 +780,63 @@ class TestDefaultQubitDevice(BaseTest):
                 self.assertEqual(len(l.records), 1)
                 self.assertIn('Nonvanishing imaginary part', l.output[0])
 
+    def test_ev_multi_wire(self):
+        """Test that expectation values of observables on several wires are calculated correctly"""
+        self.logTestName()
+        dev = DefaultQubit(wires=3)
+        state = np.random.random(8) + 1j*np.random.random(8)
+        dev._state = state/np.linalg.norm(state)
+
+        A = np.random.random([4, 4]) + 1j*np.random.random([4, 4])
+        A = A + A.conj().T
+
+        # reference: swap the qubits into the order (2, 0, 1) and embed A on the first two
+        psi = np.reshape(np.moveaxis(np.reshape(dev._state, [2]*3), [2, 0, 1], [0, 1, 2]), [8])
+        expected = psi.conj() @ np.kron(A, I) @ psi
+        self.assertAlmostEqual(dev.ev(A, [2, 0]), expected.real, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "2x2 matrix required"):
+            dev.ev(A, [0])
+
+    def test_expval_tensor(self):
+        """Test that tensor product expectations are contracted factor by factor"""
+        self.logTestName()
+        dev = DefaultQubit(wires=3)
+        state = np.random.random(8) + 1j*np.random.random(8)
+        dev._state = state/np.linalg.norm(state)
+
+        res = dev.expval('Tensor', [0, 2], [np.array(['PauliX', 'PauliZ'])])
+        expected = dev._state.conj() @ np.kron(np.kron(X, I), Z) @ dev._state
+        self.assertAlmostEqual(res, expected.real, delta=self.tol)
+
+        # identity factors are skipped
+        res = dev.expval('Tensor', [1, 2], [np.array(['Identity', 'Identity'])])
+        self.assertAlmostEqual(res, 1, delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "number of observables must be equal to the number of wires"):
+            dev.expval('Tensor', [0, 1], [np.array(['PauliZ'])])
+
+
+    def test_sample(self):
+        """Test that expectations are estimated from shared computational-basis samples"""
+        self.logTestName()
+        dev = DefaultQubit(wires=3, shots=20000)
+        state = np.random.random(8) + 1j*np.random.random(8)
+        dev._state = state/np.linalg.norm(state)
+
+        A = np.diag([1., 2., 3., 4.])
+        observables = [('Hermitian', [2, 0], [A]), ('PauliX', [1], [])]
+        res = dev.sample(observables)
+        expected = np.array([dev.ev(A, [2, 0]), dev.ev(X, [1])])
+        self.assertAllAlmostEqual(np.array(res), expected, delta=0.05)
+
+        # Bell state: the outcomes of Z0 and Z1 always agree when drawn from the same samples
+        dev = DefaultQubit(wires=2, shots=1)
+        dev._state = np.array([1, 0, 0, 1])/np.sqrt(2)
+        for _ in range(20):
+            z0, z1 = dev.sample([('PauliZ', [0], []), ('PauliZ', [1], [])])
+            self.assertEqual(z0, z1)
+
 
 class TestDefaultQubitIntegration(BaseTest):
     """Integration tests for default.qubit. This test ensures it integrates
@@ -445,6 +850,10 @@ class TestDefaultQubitIntegration(BaseTest):
         self.assertEqual(dev.num_wires, 2)
         self.assertEqual(dev.shots, 0)
         self.assertEqual(dev.short_name, 'default.qubit')
+        self.assertEqual(dev.dtype, np.complex128)
+
+        dev = qml.device('default.qubit', wires=2, dtype='complex64')
+        self.assertEqual(dev.dtype, np.complex64)
 
     def test_args(self):
         """Test that the plugin requires correct arguments"""
@@ -563,6 +972,50 @@ class TestDefaultQubitIntegration(BaseTest):
 
         self.assertAlmostEqual(np.mean(runs), -np.sin(p), delta=0.01)
 
+    def test_three_qubit_unitary(self):
+        """Test that a QNode can apply a QubitUnitary on three wires"""
+        self.logTestName()
+        dev = qml.device('default.qubit', wires=3)
+
+        # Toffoli gate
+        toffoli = np.identity(8)
+        toffoli[6:, 6:] = np.array([[0, 1], [1, 0]])
+
+        @qml.qnode(dev)
+        def circuit(x):
+            """Test quantum function"""
+            qml.RX(x, wires=0)
+            qml.PauliX(wires=2)
+            qml.QubitUnitary(toffoli, wires=[0, 2, 1])
+            return qml.expval.PauliZ(1)
+
+        # the target flips iff the first control is |1>, which occurs with probability sin(x/2)^2
+        p = 0.543
+        self.assertAlmostEqual(circuit(p), np.cos(p), delta=self.tol)
+
+    def test_gate_fusion_transparent(self):
+        """Test that gate fusion does not change the results or the gradients of a QNode"""
+        self.logTestName()
+
+        def circuit(x, y, z):
+            """Test quantum function"""
+            qml.Rot(x, y, z, wires=0)
+            qml.RX(y, wires=0)
+            qml.PhaseShift(z, wires=0)
+            qml.Hadamard(wires=1)
+            qml.RZ(x, wires=1)
+            qml.CNOT(wires=[0, 1])
+            qml.RY(x, wires=1)
+            qml.PauliX(wires=1)
+            return qml.expval.PauliZ(0), qml.expval.PauliY(1)
+
+        params = [0.432, -0.152, 0.9234]
+        fused = qml.QNode(circuit, qml.device('default.qubit', wires=2, gate_fusion=True))
+        unfused = qml.QNode(circuit, qml.device('default.qubit', wires=2, gate_fusion=False))
+
+        self.assertAllAlmostEqual(fused(*params), unfused(*params), delta=self.tol)
+        self.assertAllAlmostEqual(fused.jacobian(params), unfused.jacobian(params), delta=self.tol)
+
     def test_supported_gates(self):
         """Test that all supported gates work correctly"""
         self.logTestName()
@@ -669,9 +1122,189 @@ class TestDefaultQubitIntegration(BaseTest):
                 return expectation
 
             if op.num_params == 0:
-                self.assertAllEqual(circuit(), reference())
+                self.assertAllAlmostEqual(circuit(), reference(), delta=self.tol)
             elif g == 'Hermitian':
-                self.assertAllEqual(circuit(H), reference(H))
+                self.assertAllAlmostEqual(circuit(H), reference(H), delta=self.tol)
+            elif g == 'Tensor':
+                obs = np.array(['PauliZ'])
+                self.assertAllAlmostEqual(circuit(obs), reference(obs), delta=self.tol)
+
+    def test_shared_samples(self):
+        """Test that all expectations of a circuit evaluation come from the same samples"""
+        self.logTestName()
+        dev = qml.device('default.qubit', wires=4, shots=1)
+
+        @qml.qnode(dev)
+        def circuit():
+            """Test quantum function"""
+            qml.Hadamard(wires=0)
+            qml.CNOT(wires=[0, 1])
+            qml.CNOT(wires=[0, 2])
+            qml.CNOT(wires=[0, 3])
+            return qml.expval.PauliZ(0), qml.expval.Tensor(['PauliZ', 'PauliZ'], wires=[2, 3]), qml.expval.PauliZ(1)
+
+        for _ in range(20):
+            z0, z2z3, z1 = circuit()
+            self.assertEqual(z0, z1)
+            self.assertEqual(z2z3, 1)
+
+    def test_checkpoints(self):
+        """Test that Jacobians computed with cached intermediate states are unchanged,
+        and that the shifted circuits resume from the checkpoints"""
+        self.logTestName()
+
+        def circuit(w):
+            """Test quantum function"""
+            for l in range(2):
+                for i in range(3):
+                    qml.RX(w[l, i], wires=i)
+                qml.CNOT(wires=[0, 1])
+                qml.CNOT(wires=[1, 2])
+            return qml.expval.PauliZ(0), qml.expval.PauliY(2)
+
+        w = np.random.random([2, 3])
+        res = []
+        applied = []
+
+        for budget in (0, 1):
+            # the shifted circuits are not batched, so that they can resume from the checkpoints
+            dev = qml.device('default.qubit', wires=3, gate_fusion=False, checkpoint_memory=budget, batch_memory=0)
+            applied.append(0)
+
+            def count(name, wires, par, apply=dev._apply_operation):
+                """count the operations applied to the state"""
+                applied[-1] += 1
+                apply(name, wires, par)
+
+            dev._apply_operation = count
+            res.append(qml.QNode(circuit, dev).jacobian((w,), method='A'))
+
+        self.assertAllAlmostEqual(res[0], res[1], delta=self.tol)
+        self.assertLess(applied[1], applied[0])
+        self.assertEqual(dev._checkpoints, None)
+
+        # with the default settings the shifted circuits are batched, and no checkpoints are recorded
+        dev = qml.device('default.qubit', wires=3)
+        recorded = []
+        checkpoints = dev.checkpoints
+        dev.checkpoints = lambda positions: recorded.append(positions) or checkpoints(positions)
+        jac = qml.QNode(circuit, dev).jacobian((w,), method='A')
+        self.assertAllAlmostEqual(jac, res[0], delta=self.tol)
+        self.assertEqual(recorded, [])
+
+    def test_adjoint(self):
+        """Test that the adjoint method agrees with the parameter-shift rule,
+        and that it is used by default"""
+        self.logTestName()
+        ZZ = np.kron(Z, Z)
+
+        def circuit(w, x):
+            """Test quantum function"""
+            qml.BasisState(np.array([1, 0, 0]), wires=[0, 1, 2])
+            for i in range(3):
+                qml.Rot(w[i, 0], w[i, 1], w[i, 2], wires=i)
+            qml.CNOT(wires=[0, 1])
+            qml.RX(2 * x, wires=2)
+            qml.CZ(wires=[1, 2])
+            qml.PhaseShift(x, wires=1)
+            qml.RY(w[1, 2], wires=0)
+            qml.QubitUnitary(CNOT, wires=[2, 0])
+            return qml.expval.PauliZ(0), qml.expval.Tensor(['PauliX', 'PauliY'], wires=[1, 2])
+
+        w = np.random.random([3, 3])
+        x = 0.432
+        dev = qml.device('default.qubit', wires=3)
+        node = qml.QNode(circuit, dev)
+        expected = node.jacobian((w, x), method='A')
+        self.assertAllAlmostEqual(node.jacobian((w, x), method='adjoint'), expected, delta=self.tol)
+
+        # 'B' calls the device once, for all parameters at once
+        calls = []
+        adjoint_jacobian = dev.adjoint_jacobian
+        dev.adjoint_jacobian = lambda *args: calls.append(args) or adjoint_jacobian(*args)
+        self.assertAllAlmostEqual(node.jacobian((w, x)), expected, delta=self.tol)
+        self.assertEqual(len(calls), 1)
+
+        # multi-wire Hermitian observables
+        def circuit2(x):
+            """Test quantum function"""
+            qml.RX(x, wires=0)
+            qml.CNOT(wires=[0, 1])
+            qml.RY(x, wires=1)
+            return qml.expval.Hermitian(ZZ, wires=[0, 1])
+
+        node = qml.QNode(circuit2, dev)
+        self.assertAllAlmostEqual(node.jacobian([0.3], method='adjoint'), node.jacobian([0.3], method='A'), delta=self.tol)
+
+        # sampled expectations are not supported
+        dev = qml.device('default.qubit', wires=3, shots=10)
+        node = qml.QNode(circuit, dev)
+        with self.assertRaisesRegex(ValueError, "shots=0"):
+            node.jacobian((w, x), method='adjoint')
+        with self.assertRaisesRegex(ValueError, "shots=0"):
+            dev.adjoint_jacobian(node.queue, node.ev, [(1, 0)])
+
+    def test_constant_blocks(self):
+        """Test that runs of constant operations are fused into cached unitaries,
+        without changing the results"""
+        self.logTestName()
+
+        def circuit(w):
+            """Test quantum function"""
+            qml.BasisState(np.array([1, 0, 0, 1, 0]), wires=list(range(5)))
+            qml.Hadamard(wires=0)
+            for i in range(4):
+                qml.CNOT(wires=[i, i+1])
+            qml.Rot(0.3, 1.8, 5.4, wires=2)
+            qml.RX(w[0], wires=0)
+            qml.QubitUnitary(CNOT, wires=[4, 2])
+            qml.CZ(wires=[1, 3])
+            qml.RY(w[1], wires=4)
+            return qml.expval.PauliZ(0), qml.expval.Tensor(['PauliX', 'PauliY'], wires=[2, 4]), qml.expval.PauliY(3)
+
+        w = np.array([0.432, -0.1])
+        for gate_fusion in (True, False):
+            dev = qml.device('default.qubit', wires=5, gate_fusion=gate_fusion)
+            node = qml.QNode(circuit, dev)
+            ref = qml.QNode(circuit, qml.device('default.autograd', wires=5))
+            self.assertAllAlmostEqual(node(w), ref(w), delta=self.tol)
+            self.assertEqual(node.constant_blocks, [(0, 7), (8, 10)])
+
+            # the BasisState is applied on its own, the CNOT ladder is split at four wires
+            segments = [s[:2] for ops, block in dev._block_cache.items() for s in block]
+            self.assertEqual(sorted(segments), [(0, 2), (1, 5), (5, 7)])
+
+            # later evaluations and gradients reuse the cached unitaries
+            jac = node.jacobian([w], method='A')
+            self.assertAllAlmostEqual(jac, ref.jacobian([w]), delta=self.tol)
+            calls = []
+            segment_unitary = dev._segment_unitary
+            dev._segment_unitary = lambda *args: calls.append(args) or segment_unitary(*args)
+            self.assertAllAlmostEqual(node(w), ref(w), delta=self.tol)
+            self.assertAllAlmostEqual(node.jacobian([w], method='A'), jac, delta=self.tol)
+            self.assertEqual(calls, [])
+            self.assertEqual(dev._constant_blocks, None)
+
+    def test_multi_wire_observables(self):
+        """Test tensor products and Hermitian observables on several wires, with and without sampling"""
+        self.logTestName()
+        a = 0.543
+        ZZ = np.kron(Z, Z)
+
+        for shots in (0, 10000):
+            dev = qml.device('default.qubit', wires=4, shots=shots)
+
+            @qml.qnode(dev)
+            def circuit(x):
+                """Test quantum function"""
+                qml.RX(x, wires=0)
+                qml.CNOT(wires=[0, 2])
+                qml.RY(x, wires=1)
+                return qml.expval.Tensor(['PauliX', 'PauliY'], wires=[0, 2]), qml.expval.Hermitian(ZZ, wires=[1, 3])
+
+            # <X0 Y2> = -sin(x) and <Z1 Z3> = cos(x)
+            delta = self.tol if shots == 0 else 0.05
+            self.assertAllAlmostEqual(circuit(a), [-np.sin(a), np.cos(a)], delta=delta)
 
 
 if __name__ == '__main__':
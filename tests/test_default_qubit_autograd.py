@@ -0,0 +1,168 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the :mod:`pennylane.plugin.DefaultQubitAutograd` device.
+"""
+# pylint: disable=protected-access,cell-var-from-loop
+import unittest
+import logging as log
+
+from defaults import pennylane as qml, BaseTest
+
+from pennylane import numpy as np
+
+from pennylane.plugins import default_qubit as dq
+from pennylane.plugins.default_qubit_autograd import Rphi, Rotx, Roty, Rotz, Rot3, DefaultQubitAutograd
+
+
+log.getLogger('defaults')
+
+
+U = np.array([[0.83645892-0.40533293j, -0.20215326+0.30850569j],
+              [-0.23889780-0.28101519j, -0.88031770-0.29832709j]])
+
+
+def circuit(w, x):
+    """Test quantum function"""
+    qml.BasisState(np.array([1, 0, 0]), wires=[0, 1, 2])
+    for i in range(3):
+        qml.Rot(w[i, 0], w[i, 1], w[i, 2], wires=i)
+    qml.CNOT(wires=[0, 1])
+    qml.RX(2 * x, wires=2)
+    qml.CZ(wires=[1, 2])
+    qml.PhaseShift(x, wires=1)
+    qml.SWAP(wires=[0, 2])
+    qml.RY(w[1, 2], wires=0)
+    qml.QubitUnitary(U, wires=1)
+    return qml.expval.PauliZ(0), qml.expval.Tensor(['PauliX', 'PauliY'], wires=[1, 2])
+
+
+class TestGates(BaseTest):
+    """Tests the parametrized gates of the device."""
+
+    def test_gates(self):
+        """Test that the gates agree with those of default.qubit"""
+        self.logTestName()
+
+        for a in (0, 0.432, -1.1):
+            self.assertAllAlmostEqual(Rphi(a), dq.Rphi(a), delta=self.tol)
+            self.assertAllAlmostEqual(Rotx(a), dq.Rotx(a), delta=self.tol)
+            self.assertAllAlmostEqual(Roty(a), dq.Roty(a), delta=self.tol)
+            self.assertAllAlmostEqual(Rotz(a), dq.Rotz(a), delta=self.tol)
+            self.assertAllAlmostEqual(Rot3(a, 0.1, -a), dq.Rot3(a, 0.1, -a), delta=self.tol)
+
+
+class TestDefaultQubitAutogradIntegration(BaseTest):
+    """Integration tests for default.autograd."""
+
+    def test_load_device(self):
+        """Test that the device loads correctly"""
+        self.logTestName()
+
+        dev = qml.device('default.autograd', wires=2)
+        self.assertTrue(isinstance(dev, DefaultQubitAutograd))
+        self.assertEqual(dev.num_wires, 2)
+        self.assertEqual(dev.shots, 0)
+        self.assertTrue(dev.capabilities()['backprop'])
+
+        with self.assertRaisesRegex(ValueError, "shots must be 0"):
+            qml.device('default.autograd', wires=2, shots=10)
+
+    def test_config_section(self):
+        """Test that the configuration section of the device does not
+        end up in the options of default.qubit"""
+        self.logTestName()
+
+        config = qml.Configuration('noconfig')
+        config['default.qubit.shots'] = 0
+        config['default.autograd.shots'] = 0
+
+        dev = qml.device('default.qubit', wires=2, config=config)
+        self.assertEqual(dev.short_name, 'default.qubit')
+        dev = qml.device('default.autograd', wires=2, config=config)
+        self.assertTrue(isinstance(dev, DefaultQubitAutograd))
+
+    def test_expectations(self):
+        """Test that the expectation values agree with default.qubit"""
+        self.logTestName()
+
+        w = np.random.random([3, 3])
+        x = 0.543
+        node = qml.QNode(circuit, qml.device('default.autograd', wires=3))
+        ref = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+        self.assertAllAlmostEqual(node(w, x), ref(w, x), delta=self.tol)
+
+        A = np.array([[1.02789352, 1.61296440-0.3498192j],
+                      [1.61296440+0.3498192j, 1.23920938+0j]])
+
+        def circuit2(x):
+            """Test quantum function"""
+            qml.QubitStateVector(np.array([1, 1j, 0, 1]) / np.sqrt(3), wires=[0, 1])
+            qml.RY(x, wires=0)
+            qml.Hadamard(wires=1)
+            return qml.expval.Hermitian(A, wires=0), qml.expval.PauliX(1)
+
+        node = qml.QNode(circuit2, qml.device('default.autograd', wires=2))
+        ref = qml.QNode(circuit2, qml.device('default.qubit', wires=2))
+        self.assertAllAlmostEqual(node(x), ref(x), delta=self.tol)
+
+    def test_backprop(self):
+        """Test that autograd differentiates through the simulation,
+        executing the circuit only once per gradient"""
+        self.logTestName()
+
+        w = np.random.random([3, 3])
+        x = 0.543
+        dev = qml.device('default.autograd', wires=3)
+        node = qml.QNode(circuit, dev)
+        ref = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+
+        def cost(w, x, node):
+            """Classical processing of the QNode output"""
+            res = node(w, x)
+            return res[0] + 2 * res[1] ** 2
+
+        node(w, x)
+        calls = []
+        execute = dev.execute_program
+        dev.execute_program = lambda *args: calls.append(args) or execute(*args)
+
+        grad = qml.grad(cost, [0, 1])(w, x, node)
+        expected = qml.grad(cost, [0, 1])(w, x, ref)
+        self.assertAllAlmostEqual(grad[0], expected[0], delta=self.tol)
+        self.assertAlmostEqual(grad[1], expected[1], delta=self.tol)
+        self.assertEqual(len(calls), 1)
+
+        # QNodes returning a single expectation value
+        @qml.qnode(dev)
+        def circuit3(x):
+            """Test quantum function"""
+            qml.RX(x, wires=0)
+            return qml.expval.PauliZ(0)
+
+        self.assertAlmostEqual(qml.grad(circuit3, 0)(x), -np.sin(x), delta=self.tol)
+
+        # the Jacobian is still available
+        self.assertAllAlmostEqual(node.jacobian((w, x)), ref.jacobian((w, x)), delta=self.tol)
+
+
+if __name__ == '__main__':
+    print('Testing PennyLane version ' + qml.version() + ', default.autograd plugin.')
+    # run the tests in this file
+    suite = unittest.TestSuite()
+    for t in (TestGates,
+              TestDefaultQubitAutogradIntegration):
+        ttt = unittest.TestLoader().loadTestsFromTestCase(t)
+        suite.addTests(ttt)
+    unittest.TextTestRunner().run(suite)
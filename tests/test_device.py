@@ -25,6 +25,8 @@ from autograd import numpy as np
 
 from defaults import pennylane as qml, BaseTest
 from pennylane.plugins import DefaultQubit
+from pennylane.program import Program
+from pennylane.variable import Variable
 
 
 class DeviceTest(BaseTest):
@@ -209,10 +211,63 @@ class DeviceTest(BaseTest):
                     else:
                         expval = dev.execute([qml.RX(0.5, wires=0, do_queue=False)], queue)
 
+    def test_batch_execute(self):
+        """check that a batch of circuits gives the same results as executing them one by one"""
+        self.logTestName()
+
+        circuits = {
+            'default.qubit': lambda p: ([qml.RX(p, wires=[0], do_queue=False), qml.CNOT(wires=[0, 1], do_queue=False)],
+                                        [qml.expval.PauliZ(1, do_queue=False)]),
+            'default.gaussian': lambda p: ([qml.Displacement(p, 0., wires=[0], do_queue=False)],
+                                           [qml.expval.X(0, do_queue=False), qml.expval.X(1, do_queue=False)]),
+        }
+        for name, dev in self.dev.items():
+            # operation queues with fixed parameters
+            batch = [circuits[name](x) for x in (0.1, 0.2, 0.3)]
+            res = dev.batch_execute(batch)
+            self.assertEqual(len(res), 3)
+            for r, (queue, ev) in zip(res, batch):
+                self.assertAllAlmostEqual(r, dev.execute(queue, ev), delta=self.tol)
+
+            # one program, with different free parameter values for each circuit
+            queue, ev = circuits[name](Variable(0))
+            program = Program(queue)
+            params = [np.array([x]) for x in (0.1, 0.2, 0.3)]
+            previous = np.array([0.7])
+            Variable.free_param_values = previous
+            res = dev.batch_execute([(program, ev)] * 3, params)
+            # the parameter values of the caller are restored
+            self.assertIs(Variable.free_param_values, previous)
+            for r, (queue, ev) in zip(res, batch):
+                self.assertAllAlmostEqual(r, dev.execute(queue, ev), delta=self.tol)
+
+            with self.assertRaisesRegex(ValueError, '2 parameter vectors given for 3 circuits'):
+                dev.batch_execute([(program, ev)] * 3, params[:2])
+
 
 class InitDeviceTests(BaseTest):
     """Tests for device loader in __init__.py"""
 
+    def test_execute_override(self):
+        """check that programs are executed by the execute method of plugins that override it"""
+        self.logTestName()
+
+        calls = []
+
+        class Plugin(DefaultQubit):
+            """plugin with its own execute method"""
+            def execute(self, queue, expectation):
+                calls.append([op.name for op in queue])
+                return super().execute(queue, expectation)
+
+        dev = Plugin(wires=2)
+        queue = [qml.RX(Variable(0), wires=[0], do_queue=False), qml.CNOT(wires=[0, 1], do_queue=False)]
+        ev = [qml.expval.PauliZ(1, do_queue=False)]
+        Variable.free_param_values = np.array([0.3])
+        res = dev.execute_program(Program(queue), ev)
+        self.assertAllAlmostEqual(res, [np.cos(0.3)], delta=self.tol)
+        self.assertEqual(calls, [['RX', 'CNOT']])
+
     def test_no_device(self):
         """Test exception raised for a device that doesn't exist"""
         self.logTestName()
@@ -504,6 +504,40 @@ class BasicTest(BaseTest):
                     x_twosteps_target = x_onestep - adapted_stepsize * firstmoment / (np.sqrt(secondmoment) + 1e-8)
                     self.assertAllAlmostEqual(x_twosteps, x_twosteps_target, delta=self.tol)
 
+    def test_step_and_cost(self):
+        """Tests that step_and_cost takes the same step as step, and returns the
+        objective function value before the step"""
+        self.logTestName()
+
+        for name, opt_class in [('sgd', GradientDescentOptimizer), ('mom', MomentumOptimizer),
+                                ('nesmom', NesterovMomentumOptimizer), ('adag', AdagradOptimizer),
+                                ('rms', RMSPropOptimizer), ('adam', AdamOptimizer)]:
+            with self.subTest(i=name):
+                opt1, opt2 = opt_class(stepsize), opt_class(stepsize)
+                for f, x in [(self.hybrid_fun, self.mixed_list),
+                             (self.hybrid_fun_mdarr, self.multid_array),
+                             (self.multivariate_funcs[1], x_vals[:2])]:
+                    x1 = x2 = x
+                    # the second step of the momentum optimizers uses the accumulation
+                    for _ in range(2):
+                        expected = f(x2)
+                        x1 = opt1.step(f, x1)
+                        x2, cost = opt2.step_and_cost(f, x2)
+                        self.assertAlmostEqual(cost, expected, delta=self.tol)
+                        self.assertAllAlmostEqual(list(_flatten(x2)), list(_flatten(x1)), delta=self.tol)
+
+    def test_step_and_cost_usergrad(self):
+        """Tests that step_and_cost evaluates the objective function when the
+        gradient is user-provided"""
+        self.logTestName()
+
+        for gradf, f, name in zip(self.grad_uni_fns, self.univariate_funcs, self.fnames):
+            with self.subTest(i=name):
+                for x_start in x_vals:
+                    x_new, cost = self.sgd_opt.step_and_cost(f, x_start, grad_fn=gradf)
+                    self.assertAlmostEqual(x_new, x_start - gradf(x_start) * stepsize, delta=self.tol)
+                    self.assertAlmostEqual(cost, f(x_start), delta=self.tol)
+
     def test_update_stepsize(self):
         """Tests that the stepsize correctly updates"""
         self.logTestName()
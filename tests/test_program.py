@@ -0,0 +1,142 @@
+# Copyright 2018 Xanadu Quantum Technologies Inc.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the :mod:`pennylane` :class:`Program` class.
+"""
+# pylint: disable=protected-access
+import unittest
+import logging as log
+log.getLogger('defaults')
+
+from defaults import pennylane as qml, BaseTest
+
+from pennylane import numpy as np
+from pennylane.program import Program
+from pennylane.variable import Variable
+
+
+U = np.array([[0, 1], [1, 0]])
+
+
+def circuit(x, y, *, z=0.1, w=1):
+    """Test quantum function"""
+    qml.BasisState(np.array([1, 0]), wires=[0, 1])
+    qml.RX(x, wires=0)
+    qml.CNOT(wires=[0, 1])
+    qml.Rot(0.2, -2 * y[1], z, wires=1)
+    qml.QubitUnitary(U, wires=w)
+    qml.RX(y[0], wires=0)
+    return qml.expval.PauliZ(0), qml.expval.PauliX(1)
+
+
+class ProgramTest(BaseTest):
+    """Program tests."""
+    def setUp(self):
+        self.dev = qml.device('default.qubit', wires=2)
+        self.node = qml.QNode(circuit, self.dev)
+        self.node.construct((0.3, [0.4, -0.5]), z=0.6)
+        self.program = Program(self.node.queue)
+
+        Variable.free_param_values = np.array([0.3, 0.4, -0.5])
+        Variable.kwarg_values = {'z': np.array([0.6]), 'w': np.array([0])}
+
+    def test_compile(self):
+        """Test that the operations are lowered into op codes, wires and gather positions"""
+        self.logTestName()
+
+        p = self.program
+        self.assertEqual(len(p), 6)
+        self.assertEqual(p.names, ['BasisState', 'RX', 'CNOT', 'Rot', 'QubitUnitary'])
+        self.assertAllEqual(p.opcodes, [0, 1, 2, 3, 4, 1])
+        self.assertEqual(p.wires, [[0, 1], [0], [0, 1], [1], None, [0]])
+        self.assertTrue(p.free_wires)
+        self.assertEqual(p.gather, [[], [0], [], [1, 2], [], [0]])
+
+    def test_operations(self):
+        """Test that the operations resolve to the current parameter values"""
+        self.logTestName()
+
+        for _ in range(2):
+            res = list(self.program.operations())
+            expected = [(op.name, op.wires, op.parameters) for op in self.node.queue]
+            self.assertEqual(len(res), len(expected))
+            for (name, wires, par), (e_name, e_wires, e_par) in zip(res, expected):
+                self.assertEqual(name, e_name)
+                self.assertEqual(wires, e_wires)
+                self.assertEqual(len(par), len(e_par))
+                for a, b in zip(par, e_par):
+                    self.assertAllEqual(a, b)
+
+            Variable.free_param_values = np.array([1.3, -0.4, 0.5])
+            Variable.kwarg_values = {'z': np.array([-0.6]), 'w': np.array([1])}
+
+        self.assertAllAlmostEqual(res[3][2], [0.2, -1, -0.6], delta=self.tol)
+        self.assertEqual(res[4][1], [1])
+
+    def test_values(self):
+        """Test that the gather/scale map resolves all the Variables at once"""
+        self.logTestName()
+
+        p = self.program
+        self.assertEqual(p.slots, [(1, 0), (3, 1), (3, 2), (5, 0)])
+        self.assertAllEqual(p.index, [0, 2, 0, 1])
+        self.assertAllEqual(p.scale, [1, -2, 1, 1])
+        self.assertAllAlmostEqual(p.values(), [0.3, 1, 0.6, 0.4], delta=self.tol)
+
+        # one column per sample of a batch, arguments without a batch axis are broadcast
+        Variable.free_param_values = np.array([[0.3, 0.1], [0.4, 0.2], [-0.5, 0.7]])
+        expected = [[0.3, 0.1], [1, -1.4], [0.6, 0.6], [0.4, 0.2]]
+        self.assertAllAlmostEqual(p.values(), expected, delta=self.tol)
+        self.assertAllAlmostEqual(list(p.operations())[3][2][1], [1, -1.4], delta=self.tol)
+
+    def test_domain(self):
+        """Test that the resolved values are checked like the parameters of the operations"""
+        self.logTestName()
+
+        Variable.free_param_values = np.array([0.3, 0.4, -0.5j])
+        with self.assertRaisesRegex(TypeError, "RX: Real scalar parameter expected"):
+            list(self.program.operations())
+
+    def test_update(self):
+        """Test that an operation is recompiled after its parameters are replaced"""
+        self.logTestName()
+
+        op = self.node.queue[1]
+        op.params[0] = 0.7
+        self.assertEqual(list(self.program.operations())[1][2], [0.3])
+
+        self.program.update(1)
+        self.assertEqual(self.program.gather[1], [])
+        self.assertEqual(list(self.program.operations())[1][2], [0.7])
+
+    def test_execute_program(self):
+        """Test that devices execute programs like operation queues"""
+        self.logTestName()
+
+        res = self.dev.execute_program(self.program, self.node.ev)
+        self.assertAllAlmostEqual(res, self.dev.execute(self.node.queue, self.node.ev), delta=self.tol)
+
+        with self.assertRaisesRegex(qml.DeviceError, 'Expectation X not supported on device'):
+            self.dev.execute_program(self.program, [qml.expval.X(0, do_queue=False)])
+
+
+if __name__ == '__main__':
+    print('Testing PennyLane version ' + qml.version() + ', Program class.')
+    # run the tests in this file
+    suite = unittest.TestSuite()
+    for t in (ProgramTest,):
+        ttt = unittest.TestLoader().loadTestsFromTestCase(t)
+        suite.addTests(ttt)
+
+    unittest.TextTestRunner().run(suite)
@@ -123,10 +123,10 @@ class BasicTest(BaseTest):
         self.assertTrue(q.ops[0] not in successors)
         self.assertTrue(q.ops[1] in successors)
         self.assertTrue(q.ops[4] in successors)
-        # TODO once _op_successors has been upgraded to return only strict successors using a DAG
-        #successors = q._op_successors(2, only=None)
-        #self.assertTrue(q.ops[4] in successors)
-        #self.assertTrue(q.ops[5] not in successors)
+        # only the descendants in the circuit DAG
+        successors = q._op_successors(2, only=None)
+        self.assertTrue(q.ops[4] in successors)
+        self.assertTrue(q.ops[5] not in successors)
 
 
     def test_qnode_fail(self):
@@ -529,6 +529,242 @@ class BasicTest(BaseTest):
         c = classnode(0., x=np.pi)
         self.assertAllAlmostEqual(c, [1., -1.], delta=self.tol)
 
+    def test_evaluate_batch(self):
+        "Tests that batched evaluation agrees with evaluating each sample separately."
+        self.logTestName()
+
+        def circuit(w, x=None):
+            qml.RX(x[0], wires=[0])
+            qml.RY(x[1], wires=[1])
+            qml.Rot(w[0], w[1], 0.3, wires=[0])
+            qml.CNOT(wires=[0, 1])
+            return qml.expval.PauliZ(0), qml.expval.PauliX(1)
+
+        circuit = qml.QNode(circuit, self.dev2)
+
+        w = np.random.random([5, 2])
+        x = np.random.random([5, 2])
+        res = circuit.evaluate_batch((w,), x=x)
+        expected = [circuit(w[b], x=x[b]) for b in range(5)]
+        self.assertAllAlmostEqual(res, expected, delta=self.tol)
+
+        # expectations that do not depend on the batch are broadcast
+        def circuit2(w):
+            qml.RX(0.5, wires=[0])
+            return qml.expval.PauliZ(0)
+
+        circuit2 = qml.QNode(circuit2, self.dev1)
+        self.assertAllAlmostEqual(circuit2.evaluate_batch((w[:, 0],)), np.cos(0.5)*np.ones(5), delta=self.tol)
+
+    def test_evaluate_batch_unbatched_device(self):
+        "Tests that batched evaluation falls back to a loop on devices without the batched capability."
+        self.logTestName()
+
+        dev = qml.device('default.gaussian', wires=1)
+        self.assertFalse(dev.capabilities().get('batched', False))
+
+        def circuit(a):
+            qml.Displacement(a, 0., wires=0)
+            return qml.expval.X(0)
+
+        circuit = qml.QNode(circuit, dev)
+        a = np.array([0.1, -0.2, 0.3])
+        self.assertAllAlmostEqual(circuit.evaluate_batch((a,)), 2*a, delta=self.tol)
+
+    def test_constant_blocks(self):
+        "Tests that runs of operations without parameters are found when the circuit is constructed."
+        self.logTestName()
+
+        def circuit(x, *, y=0.5):
+            qml.Hadamard(wires=0)
+            qml.CNOT(wires=[0, 1])
+            qml.RX(x, wires=0)
+            qml.Rot(0.3, 1.8, 5.4, wires=1)
+            qml.RY(y, wires=1)
+            qml.CNOT(wires=[1, 0])
+            qml.PhaseShift(0.1, wires=0)
+            qml.CZ(wires=[0, 1])
+            qml.RZ(x, wires=1)
+            qml.PauliX(wires=0)
+            return qml.expval.PauliZ(0)
+
+        node = qml.QNode(circuit, self.dev2)
+        node.construct([0.2])
+        self.assertEqual(node.constant_blocks, [(0, 2), (5, 8)])
+
+    def test_light_cone(self):
+        "Tests that only the operations that can influence the expectation values are executed."
+        self.logTestName()
+
+        def circuit(x, y, z):
+            qml.RX(x, wires=[0])
+            qml.RY(y, wires=[1])
+            qml.RZ(z, wires=[2])
+            qml.CNOT(wires=[0, 1])
+            qml.Hadamard(wires=[2])
+            return qml.expval.PauliZ(0), qml.expval.PauliZ(1)
+
+        dev = qml.device('default.qubit', wires=3)
+        node = qml.QNode(circuit, dev)
+        node.construct([0.3, 0.4, 0.5])
+        self.assertEqual(node.dag, [set(), set(), set(), {0, 1}, {2}, {3}, {3}])
+        self.assertEqual(node._light_cone([0, 1]), [0, 1, 3])
+        self.assertEqual(node._light_cone([1]), [0, 1, 3])
+        self.assertEqual(node.ev_dependence, {0: [0, 1], 1: [0, 1], 2: []})
+
+        applied = []
+        apply = dev.apply
+        dev.apply = lambda *args: applied.append(args[0]) or apply(*args)
+        self.assertAllAlmostEqual(node(0.3, 0.4, 0.5), [np.cos(0.3), np.cos(0.3) * np.cos(0.4)], delta=self.tol)
+        self.assertEqual(applied, ['RX', 'RY', 'CNOT'])
+        self.assertAllAlmostEqual(node.jacobian([0.3, 0.4, 0.5])[:, 2], [0, 0], delta=self.tol)
+
+        # the wires are only known when the circuit is evaluated
+        def circuit(x, *, w=2):
+            qml.RX(x, wires=[0])
+            qml.RZ(x, wires=[w])
+            return qml.expval.PauliZ(0)
+
+        node = qml.QNode(circuit, dev)
+        node.construct([0.3])
+        self.assertEqual(node.dag, None)
+        self.assertEqual(node._light_cone([0]), [0, 1])
+
+    def test_light_cone_without_wires(self):
+        "Tests that state preparations without wires act on the whole register in the light cone."
+        self.logTestName()
+
+        preparations = [lambda: qml.BasisState(np.array([1, 1]), wires=[]),
+                        lambda: qml.QubitStateVector(np.array([0, 0, 0, 1]), wires=[])]
+        for prep in preparations:
+            def circuit(x):
+                prep()
+                qml.RX(x, wires=[0])
+                qml.RY(0.2, wires=[1])
+                return qml.expval.PauliZ(0), qml.expval.PauliZ(1)
+
+            node = qml.QNode(circuit, self.dev2)
+            node.construct([0.3])
+            self.assertEqual(node.dag, [set(), {0}, {0}, {1}, {2}])
+            self.assertEqual(node._light_cone([0]), [0, 1])
+            self.assertAllAlmostEqual(node(0.0), [-1, -np.cos(0.2)], delta=self.tol)
+            self.assertAllAlmostEqual(node.jacobian([0.3]), [[np.sin(0.3)], [0]], delta=self.tol)
+
+            node = qml.QNode(circuit, qml.device('default.autograd', wires=2))
+            self.assertAllAlmostEqual(node(0.0), [-1, -np.cos(0.2)], delta=self.tol)
+
+    def test_replace_device(self):
+        "Tests that the circuit is compiled and checked again after the device is replaced."
+        self.logTestName()
+
+        def circuit(x):
+            qml.RX(x, wires=[0])
+            qml.CNOT(wires=[0, 2])
+            return qml.expval.PauliZ(2)
+
+        node = qml.QNode(circuit, qml.device('default.qubit', wires=3))
+        self.assertAlmostEqual(node(0.3), np.cos(0.3), delta=self.tol)
+        program = node.program
+
+        dev = qml.device('default.qubit', wires=4)
+        node.device = dev
+        self.assertAlmostEqual(node(0.5), np.cos(0.5), delta=self.tol)
+        self.assertIsNot(node.program, program)
+        self.assertEqual(node.num_wires, 4)
+
+        node.device = qml.device('default.qubit', wires=2)
+        with self.assertRaisesRegex(QuantumFunctionError, 'applied to invalid wire'):
+            node(0.5)
+
+        node.device = qml.device('default.gaussian', wires=3)
+        with self.assertRaisesRegex(DeviceError, 'not supported on device'):
+            node(0.5)
+
+    def test_cache(self):
+        "Tests that outputs and Jacobians at previously seen points are not computed again."
+        self.logTestName()
+
+        def circuit(x, y, *, z=0.1):
+            qml.RX(x, wires=[0])
+            qml.CNOT(wires=[0, 1])
+            qml.RY(y, wires=[1])
+            qml.RZ(z, wires=[1])
+            return qml.expval.PauliZ(0), qml.expval.PauliZ(1)
+
+        dev = qml.device('default.qubit', wires=2)
+        node = qml.QNode(circuit, dev, cache_size=2)
+        runs = []
+        execute_program = dev.execute_program
+        dev.execute_program = lambda *args: runs.append(1) or execute_program(*args)
+
+        res = node(0.3, 0.4)
+        self.assertAllAlmostEqual(node(0.3, 0.4), res, delta=self.tol)
+        self.assertEqual(len(runs), 1)
+
+        # the returned arrays are copies
+        res[0] = 7
+        self.assertAllAlmostEqual(node(0.3, 0.4), [np.cos(0.3), np.cos(0.3) * np.cos(0.4)], delta=self.tol)
+
+        # keyword arguments are part of the key
+        node(0.3, 0.4, z=0.2)
+        self.assertEqual(len(runs), 2)
+
+        # the Jacobian reuses the cached output, and is cached itself
+        jac = node.jacobian([0.3, 0.4], method='F')
+        num = len(runs)
+        self.assertAllAlmostEqual(node.jacobian([0.3, 0.4], method='F'), jac, delta=self.tol)
+        self.assertEqual(len(runs), num)
+        node.jacobian([0.3, 0.4], method='F', h=1e-6)
+        self.assertGreater(len(runs), num)
+
+        # the least recently used entries are evicted
+        node.clear_cache()
+        num = len(runs)
+        for x in (0.3, 0.5, 0.3, 0.7, 0.3):
+            node(x, 0.4)
+        self.assertEqual(len(runs), num + 3)
+        node(0.5, 0.4)
+        self.assertEqual(len(runs), num + 4)
+
+        # a cached output does not execute the circuit, the device keeps the state of the last execution
+        node.clear_cache()
+        node(0.3, 0.4)
+        state = dev._state.copy()
+        node(0.5, 0.4)
+        node(0.3, 0.4)
+        self.assertFalse(np.allclose(dev._state, state))
+
+        # the cache is disabled by default, and no keys are built
+        other = qml.QNode(circuit, dev)
+        self.assertEqual(other.cache_size, 0)
+        keys = []
+        other._cache_key = lambda *args: keys.append(args)
+        other(0.3, 0.4)
+        other.jacobian([0.3, 0.4])
+        self.assertEqual(keys, [])
+        self.assertEqual(len(other._cache), 0)
+
+        # autograd reuses the cached Jacobian
+        cost = lambda x, y: np.sum(node(x, y))
+        grad = qml.grad(cost, argnum=[0, 1])
+        grad(0.3, 0.4)
+        num = len(runs)
+        grad(0.3, 0.4)
+        self.assertEqual(len(runs), num)
+
+        # replacing the device, or sampling, invalidates the cache
+        node.device = qml.device('default.qubit', wires=2)
+        node(0.3, 0.4)
+        self.assertEqual(len(runs), num)
+        self.assertEqual(len(node._cache), 1)
+        node.device.shots = 10
+        node(0.3, 0.4)
+        self.assertEqual(len(node._cache), 1)
+
+        node.clear_cache()
+        self.assertEqual(len(node._cache), 0)
+        del dev.execute_program
+
 
 class GradientTest(BaseTest):
     """Qnode gradient tests.
@@ -539,6 +775,103 @@ class GradientTest(BaseTest):
         self.dev3 = qml.device('default.qubit', wires=3)
         self.dev8 = qml.device('default.qubit', wires=8)
 
+    def test_structurally_zero(self):
+        "Tests that Jacobian entries that cannot be nonzero are never evaluated."
+        self.logTestName()
+
+        def circuit(w):
+            for i in range(8):
+                qml.RX(w[i], wires=[i])
+            for i in range(0, 8, 2):
+                qml.CNOT(wires=[i, i+1])
+            qml.RY(w[8], wires=[7])
+            return qml.expval.PauliZ(1), qml.expval.PauliZ(3), qml.expval.PauliZ(4)
+
+        node = qml.QNode(circuit, self.dev8)
+        w = np.linspace(0.1, 0.9, 9)
+        res = node(w)
+        self.assertAllAlmostEqual(res, [np.cos(w[0])*np.cos(w[1]), np.cos(w[2])*np.cos(w[3]), np.cos(w[4])], delta=self.tol)
+
+        expected = np.zeros([3, 9])
+        expected[0, :2] = -np.sin(w[:2]) * np.cos(w[1::-1])
+        expected[1, 2:4] = -np.sin(w[2:4]) * np.cos(w[3:1:-1])
+        expected[2, 4] = -np.sin(w[4])
+
+        for batch_memory in (256, 0):
+            dev = qml.device('default.qubit', wires=8, batch_memory=batch_memory)
+            node = qml.QNode(circuit, dev)
+            for method in ('A', 'F'):
+                applied = []
+                apply = dev.apply
+                dev.apply = lambda *args: applied.append(args[0]) or apply(*args)
+                jac = node.jacobian([w], method=method)
+                del dev.apply
+                self.assertAllAlmostEqual(jac, expected, delta=1e-6 if method == 'F' else self.tol)
+
+                # the unshifted circuit runs the 9 gates in the light cone of all the expectation values,
+                # each shifted circuit only the 3 gates in the light cone of the one it can change
+                shifted = 2 * 6 if method == 'A' else 6
+                # the unshifted circuit records checkpoints
+                unshifted = 9
+                if batch_memory:
+                    # the shifted circuits of each expectation value are executed as one batch,
+                    # which does not resume from checkpoints, so only the 'F' method runs the unshifted circuit
+                    shifted = 3
+                    unshifted = 0 if method == 'A' else 9
+                self.assertEqual(len(applied), unshifted + 3 * shifted)
+
+    def test_parallel(self):
+        "Tests that the shifted circuits of the Jacobian can be evaluated by a pool of workers."
+        self.logTestName()
+
+        def circuit(w, *, x=0.2):
+            for i in range(4):
+                qml.RX(w[i], wires=[i])
+                qml.RZ(x, wires=[i])
+                qml.RY(0.5 * w[i+4], wires=[i])
+            qml.CNOT(wires=[0, 1])
+            qml.CNOT(wires=[2, 3])
+            return qml.expval.PauliZ(1), qml.expval.PauliZ(3)
+
+        # the last parameter is unused
+        w = np.linspace(0.1, 0.9, 9)
+        for method in ('A', 'F'):
+            dev = qml.device('default.qubit', wires=4)
+            node = qml.QNode(circuit, dev)
+            expected = node.jacobian([w], method=method, x=0.5)
+            for parallel in ('threads', 'processes'):
+                for workers in (1, 3, None):
+                    jac = node.jacobian([w], method=method, parallel=parallel, workers=workers, x=0.5)
+                    self.assertAllAlmostEqual(jac, expected, delta=self.tol)
+            self.assertAllAlmostEqual(expected[:, 8], [0, 0], delta=self.tol)
+
+        with self.assertRaisesRegex(ValueError, "Unknown parallel execution mode 'gpu'"):
+            node.jacobian([w], parallel='gpu')
+        with self.assertRaisesRegex(ValueError, 'The number of workers must be positive'):
+            node.jacobian([w], method='A', parallel='threads', workers=0)
+
+    def test_parallel_threaded_device(self):
+        "Tests that worker processes can be forked from a device that has started its own worker threads."
+        self.logTestName()
+
+        def circuit(x, y):
+            qml.RX(x, wires=[0])
+            qml.CNOT(wires=[0, 1])
+            qml.RY(y, wires=[1])
+            qml.Hadamard(wires=[3])
+            return qml.expval.PauliZ(1)
+
+        dev = qml.device('default.qubit', wires=4, threads=2)
+        dev._parallel_min_wires = 0
+        node = qml.QNode(circuit, dev, cache_size=0)
+        node(0.1, 0.2)
+        # the gates are applied by the thread pool of the device
+        self.assertIsNotNone(dev._pool)
+
+        expected = node.jacobian([0.1, 0.2], method='A')
+        jac = node.jacobian([0.1, 0.2], method='A', parallel='processes', workers=2)
+        self.assertAllAlmostEqual(jac, expected, delta=self.tol)
+
 
     def test_multidim_array(self):
         "Tests that arguments which are multidimensional arrays are properly evaluated and differentiated in QNodes."
@@ -586,7 +919,7 @@ class GradientTest(BaseTest):
             qml.CubicPhase(0.2, wires=[0])
             qml.Squeezing(0.3, y, wires=[1])
             qml.Rotation(1.3, wires=[1])
-            #qml.Kerr(0.4, [0])  # nongaussian succeeding x but not y   TODO when QNode uses a DAG to describe the circuit, uncomment this line
+            qml.Kerr(0.4, wires=[0])  # nongaussian succeeding x but not y
             return qml.expval.X(0), qml.expval.X(1)
         check_methods(qf, {0:'F', 1:'A'})
 
@@ -717,6 +1050,39 @@ class GradientTest(BaseTest):
         array_autograd = grad3(np.array([a, b, c]))
         self.assertAllAlmostEqual(array_grad, array_autograd, delta=self.tol)
 
+    def test_value_and_grad(self):
+        "Tests that qml.value_and_grad evaluates the QNode only once for the value."
+        self.logTestName()
+
+        a, b, c = 0.5, 0.54, 0.3
+
+        def circuit(x, y, z):
+            qml.RX(x, wires=[0])
+            qml.CNOT(wires=[0, 1])
+            qml.RY(y, wires=[1])
+            qml.RZ(z, wires=[1])
+            return qml.expval.PauliZ(1)
+
+        dev = qml.device('default.qubit', wires=2)
+        node = qml.QNode(circuit, dev, cache_size=0)
+        cost = lambda x, y, z: 2 * node(x, y, z) + x
+        runs = []
+        execute_program = dev.execute_program
+        dev.execute_program = lambda *args: runs.append(1) or execute_program(*args)
+
+        value, grad = qml.value_and_grad(cost, argnum=[0, 1, 2])(a, b, c)
+        self.assertAlmostEqual(value, cost(a, b, c), delta=self.tol)
+        self.assertAllAlmostEqual(grad, qml.grad(cost, argnum=[0, 1, 2])(a, b, c), delta=self.tol)
+
+        # one forward run, and no others than the shifted runs of the Jacobian
+        runs.clear()
+        qml.grad(cost, argnum=[0, 1, 2])(a, b, c)
+        num = len(runs)
+        runs.clear()
+        qml.value_and_grad(cost, argnum=[0, 1, 2])(a, b, c)
+        self.assertEqual(len(runs), num)
+        del dev.execute_program
+
 
     @staticmethod
     def expected_jacobian(x, y, z):
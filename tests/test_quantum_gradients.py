@@ -281,6 +281,24 @@ class CVGradientTest(BaseTest):
         self.assertAllAlmostEqual(grad_A, grad_F, delta=self.tol)
         self.assertAllAlmostEqual(grad_A2, grad_F, delta=self.tol)
 
+    def test_cv_gradient_order2_light_cone(self):
+        "Tests that the order-2 analytic method only transforms the expectation values succeeding the gate."
+        self.logTestName()
+        par = [0.3, 0.7]
+
+        def circuit(x, y):
+            qml.Squeezing(x, 0, wires=[0])
+            qml.Displacement(y, 0, wires=[1])
+            return qml.expval.MeanPhoton(0), qml.expval.MeanPhoton(1)
+
+        q = qml.QNode(circuit, self.gaussian_dev)
+        grad_F = q.jacobian(par, method='F')
+        grad_A = q.jacobian(par, method='A')
+
+        # the squeezing does not influence the second mode
+        self.assertAlmostEqual(grad_A[1, 0], 0, delta=self.tol)
+        self.assertAllAlmostEqual(grad_A, grad_F, delta=self.tol)
+
     def test_CVOperation_with_heisenberg_and_no_params(self):
         """An integration test for CV gates that support analytic differentiation
         if succeeding the gate to be differentiated, but cannot be differentiated
@@ -16,6 +16,7 @@ Unit tests for the :mod:`pennylane` utility classes :class:`ParRef`, :class:`Com
 """
 import logging as log
 from string import ascii_lowercase
+import threading
 
 import numpy as np
 import numpy.random as nr
@@ -107,3 +108,23 @@ def test_keyword_variable():
 
     # fixed values remain constant
     assert [(par_fixed[k] == par_fixed[k]) for k in range(n)]
+
+
+def test_variable_values_per_thread():
+    """variable: Tests that each thread has its own parameter values."""
+    Variable.free_param_values = np.array([1.0, 2.0])
+    Variable.kwarg_values = {"kw1": 3.0}
+    seen = []
+
+    def worker():
+        seen.append((Variable.free_param_values, Variable.kwarg_values))
+        Variable.free_param_values = np.array([4.0, 5.0])
+        seen.append(Variable(1).val)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen == [(None, None), 5.0]
+    assert Variable(1).val == 2.0
+    assert Variable(name="kw1").val == 3.0